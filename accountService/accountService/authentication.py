@@ -1,15 +1,69 @@
 from __future__ import annotations
 
+import hashlib
+import time
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.request import Request
 from rest_framework_simplejwt.backends import TokenBackend
 from rest_framework_simplejwt.exceptions import TokenBackendError
 
+from . import metrics
+from .caching import LRUCache
+
+_token_backend: Optional[TokenBackend] = None
+_token_cache: Optional[LRUCache] = None
+
+
+def get_token_backend() -> TokenBackend:
+    """Process-wide TokenBackend; building one per request is wasted work."""
+    global _token_backend
+    if _token_backend is None:
+        signing_key = settings.SIMPLE_JWT.get("SIGNING_KEY", settings.SECRET_KEY)
+        algorithm = settings.SIMPLE_JWT.get("ALGORITHM", "HS256")
+        _token_backend = TokenBackend(algorithm=algorithm, signing_key=signing_key)
+    return _token_backend
+
+
+def get_token_cache() -> LRUCache:
+    """Bounded LRU of verified payloads keyed by the token's SHA-256."""
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = LRUCache(
+            maxsize=getattr(settings, "ACCOUNT_TOKEN_CACHE_SIZE", 10000),
+            ttl=getattr(settings, "ACCOUNT_TOKEN_CACHE_TTL", 300),
+        )
+    return _token_cache
+
+
+def token_cache_stats() -> Dict[str, int]:
+    return get_token_cache().stats()
+
+
+def _token_cache_metrics():
+    stats = token_cache_stats()
+    for key in ("hits", "misses", "evictions"):
+        yield f"account_token_cache_{key}_total", "counter", f"Verified-token cache {key}.", [((), stats[key])]
+    yield "account_token_cache_size", "gauge", "Verified tokens currently cached.", [((), stats["size"])]
+
+
+metrics.registry.register_collector(_token_cache_metrics)
+
+
+@receiver(setting_changed)
+def _reset_token_state(setting, **kwargs) -> None:
+    global _token_backend, _token_cache
+    if setting in {"SIMPLE_JWT", "SECRET_KEY"}:
+        _token_backend = None
+    if setting in {"SIMPLE_JWT", "SECRET_KEY", "ACCOUNT_TOKEN_CACHE_SIZE", "ACCOUNT_TOKEN_CACHE_TTL"}:
+        _token_cache = None
+
 
 @dataclass
 class ExternalJWTUser:
@@ -43,14 +97,12 @@ class ExternalJWTAuthentication(BaseAuthentication):
 
     keyword = "bearer"
 
-    def __init__(self) -> None:
-        signing_key = settings.SIMPLE_JWT.get("SIGNING_KEY", settings.SECRET_KEY)
-        algorithm = settings.SIMPLE_JWT.get("ALGORITHM", "HS256")
-        self.token_backend = TokenBackend(algorithm=algorithm, signing_key=signing_key)
+    @property
+    def token_backend(self) -> TokenBackend:
+        return get_token_backend()
 
     def authenticate(self, request: Request) -> Optional[Tuple[ExternalJWTUser, dict]]:
         auth_header = request.headers.get("Authorization")
-        print("53-auth_header: ", auth_header)
         if not auth_header:
             return None
 
@@ -63,7 +115,6 @@ class ExternalJWTAuthentication(BaseAuthentication):
             return None
 
         payload = self._decode_token(token)
-        print("payload: ",payload)
         raw_user_id = payload.get("user_id")
         if raw_user_id is None:
             raise AuthenticationFailed("Token payload missing user_id")
@@ -79,11 +130,33 @@ class ExternalJWTAuthentication(BaseAuthentication):
             username=payload.get("username"),
             role=payload.get("role")
         )
-        print("user: ", user)
         return (user, payload)
 
     def _decode_token(self, token: str) -> dict:
+        """
+        Verify ``token`` and return its payload. Verified payloads are cached
+        until the cache TTL or the token's own ``exp``, whichever is sooner,
+        so repeat tokens skip the HMAC check and JSON parse.
+        """
+        with metrics.timed("auth"):
+            return self._verify(token)
+
+    def _verify(self, token: str) -> dict:
+        cache = get_token_cache()
+        key = hashlib.sha256(token.encode()).digest()
+        payload = cache.get(key)
+        if payload is not None:
+            return payload
+
         try:
-            return self.token_backend.decode(token, verify=True)
+            payload = self.token_backend.decode(token, verify=True)
         except TokenBackendError as exc:
             raise AuthenticationFailed("Invalid or expired token") from exc
+
+        ttl = cache.ttl
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            remaining = exp - time.time()
+            ttl = remaining if ttl is None else min(ttl, remaining)
+        cache.set(key, payload, ttl=ttl)
+        return payload
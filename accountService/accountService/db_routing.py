@@ -0,0 +1,186 @@
+"""
+Send the ORM reads of safe-method requests to a read-only database alias.
+
+``ReadRoutingMiddleware`` records the current request in a context variable
+and ``ReadRouter`` routes reads made during GET/HEAD/OPTIONS requests to
+``settings.ACCOUNT_READ_DATABASE``: a ``query_only`` connection to the
+primary file, or a replica that may lag behind it. Reads inside write
+requests stay on ``default`` with the writes, so a view always sees its own
+changes.
+
+Read-your-writes: after a caller's write request succeeds, their reads are
+pinned to ``default`` for ``ACCOUNT_READ_PIN_SECONDS``, long enough for the
+replica to catch up. Pins are kept in the Django cache named by
+``ACCOUNT_READ_PIN_CACHE``, which must be shared by every worker: a system
+check warns when it is a per-process ``LocMemCache``.
+"""
+from __future__ import annotations
+
+import contextvars
+import sqlite3
+from typing import Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+_current_request: contextvars.ContextVar = contextvars.ContextVar("account_routing_request", default=None)
+
+
+def read_database() -> Optional[str]:
+    return getattr(settings, "ACCOUNT_READ_DATABASE", None)
+
+
+def _pin_seconds() -> float:
+    return getattr(settings, "ACCOUNT_READ_PIN_SECONDS", 0)
+
+
+def _pin_cache():
+    return caches[getattr(settings, "ACCOUNT_READ_PIN_CACHE", "default")]
+
+
+@checks.register(checks.Tags.caches)
+def check_pin_cache(app_configs=None, **kwargs):
+    if read_database() is None or _pin_seconds() <= 0:
+        return []
+    alias = getattr(settings, "ACCOUNT_READ_PIN_CACHE", "default")
+    backend = settings.CACHES.get(alias, {}).get("BACKEND", "")
+    if not backend.endswith(".LocMemCache"):
+        return []
+    return [checks.Warning(
+        f"ACCOUNT_READ_PIN_CACHE {alias!r} is a per-process LocMemCache.",
+        hint="Each worker would keep its own read-your-writes pins; use a shared cache (file, database or Redis).",
+        id="accountService.W001",
+    )]
+
+
+def _caller(request) -> Optional[str]:
+    # DRF (and async_api_view) copy the JWT user and payload onto the
+    # HttpRequest once authenticated. Until then ``request.user`` is the
+    # session-backed lazy user, which must not be evaluated from a router.
+    if getattr(request, "auth", None) is None:
+        return None
+    user_id = getattr(request.user, "id", None)
+    return f"account-read-pin:{user_id}" if user_id is not None else None
+
+
+def pin_to_primary(request) -> None:
+    """Send this caller's reads to ``default`` for the pin window."""
+    key = _caller(request)
+    if key is not None and _pin_seconds() > 0:
+        _pin_cache().set(key, True, _pin_seconds())
+
+
+def is_pinned(request) -> bool:
+    key = _caller(request)
+    return key is not None and _pin_seconds() > 0 and bool(_pin_cache().get(key))
+
+
+def reads_pinned() -> bool:
+    """
+    Whether the current request is a read pinned to ``default`` by the
+    caller's recent write. Caches filled by replica reads must not answer
+    it, or the caller could still see their old data.
+    """
+    request = _current_request.get()
+    if request is None or read_database() is None:
+        return False
+    return ReadRouter().db_for_read(None) == DEFAULT_DB_ALIAS
+
+
+class ReadRouter:
+    def db_for_read(self, model, **hints) -> Optional[str]:
+        request = _current_request.get()
+        alias = read_database()
+        if request is None or alias is None or request.method not in SAFE_METHODS:
+            return None
+        pinned = getattr(request, "_account_read_pinned", None)
+        if pinned is None:
+            pinned = is_pinned(request)
+            if _caller(request) is not None:
+                # Only settle the decision once the caller is authenticated.
+                request._account_read_pinned = pinned
+        return DEFAULT_DB_ALIAS if pinned else alias
+
+    def db_for_write(self, model, **hints) -> str:
+        # Never inherit the read alias from an instance loaded through it.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> Optional[bool]:
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints) -> Optional[bool]:
+        if db == read_database():
+            return False
+        return None
+
+
+def _wrote(request, response) -> bool:
+    return request.method not in SAFE_METHODS and 200 <= response.status_code < 400
+
+
+class ReadRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        token = _current_request.set(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_request.reset(token)
+        if _wrote(request, response):
+            self._after_write(request)
+        return response
+
+    async def __acall__(self, request):
+        token = _current_request.set(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_request.reset(token)
+        if _wrote(request, response):
+            await sync_to_async(self._after_write)(request)
+        return response
+
+    @staticmethod
+    def _after_write(request) -> None:
+        pin_to_primary(request)
+        if getattr(settings, "ACCOUNT_READ_AUTO_SYNC", False):
+            sync_replica()
+
+
+def sync_replica(source: str = DEFAULT_DB_ALIAS, target: Optional[str] = None) -> None:
+    """
+    Copy the SQLite ``source`` database over the ``target`` replica file
+    with the online backup API. A stand-in for real replication when the
+    replica is a second local file.
+    """
+    target = target or read_database()
+    if target is None:
+        raise ValueError("No replica alias configured (ACCOUNT_READ_DATABASE).")
+    primary = connections[source]
+    if primary.vendor != "sqlite" or connections[target].vendor != "sqlite":
+        raise ValueError("sync_replica only copies SQLite databases.")
+    replica_name = str(connections[target].settings_dict["NAME"])
+    if replica_name == str(primary.settings_dict["NAME"]):
+        return
+    primary.ensure_connection()
+    # The replica's own connections are query_only; write through a fresh one.
+    destination = sqlite3.connect(replica_name, timeout=30)
+    try:
+        primary.connection.backup(destination)
+    finally:
+        destination.close()
@@ -0,0 +1,264 @@
+"""
+In-process request metrics exposed in the Prometheus text format.
+
+Every thread records into its own shard, so the hot path never takes a
+lock; shards are only summed when ``/api/metrics/`` is scraped. Counts are
+per worker process, as is usual for a pull-based scrape of each worker.
+"""
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
+from django.http import HttpResponse
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+Sample = Tuple[Labels, float]
+Collector = Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]
+
+_current_phases: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar(
+    "account_metrics_phases", default=None
+)
+
+
+class _Shard:
+    __slots__ = ("counters", "histograms")
+
+    def __init__(self) -> None:
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        # (name, labels) -> [bucket_0, ..., bucket_n, +Inf, sum]
+        self.histograms: Dict[Tuple[str, Labels], List[float]] = {}
+
+
+class Registry:
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._shards_lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._collectors: List[Collector] = []
+
+    def describe(self, name: str, kind: str, help_text: str) -> None:
+        self._help[name] = (kind, help_text)
+
+    def register_collector(self, collector: Collector) -> None:
+        """Add a callable that yields ``(name, kind, help, samples)`` at scrape time."""
+        self._collectors.append(collector)
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def inc(self, name: str, labels: Labels, amount: float = 1) -> None:
+        counters = self._shard().counters
+        key = (name, labels)
+        counters[key] = counters.get(key, 0) + amount
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        histograms = self._shard().histograms
+        key = (name, labels)
+        series = histograms.get(key)
+        if series is None:
+            series = histograms[key] = [0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def reset(self) -> None:
+        with self._shards_lock:
+            for shard in self._shards:
+                shard.counters.clear()
+                shard.histograms.clear()
+
+    def render(self) -> str:
+        counters: Dict[Tuple[str, Labels], float] = {}
+        histograms: Dict[Tuple[str, Labels], List[float]] = {}
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            for key, value in list(shard.counters.items()):
+                counters[key] = counters.get(key, 0) + value
+            for key, series in list(shard.histograms.items()):
+                total = histograms.setdefault(key, [0] * len(series))
+                for i, value in enumerate(series):
+                    total[i] += value
+
+        lines: List[str] = []
+        for name in sorted({name for name, _ in counters}):
+            self._header(lines, name, "counter")
+            for (series_name, labels), value in sorted(counters.items()):
+                if series_name == name:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        for name in sorted({name for name, _ in histograms}):
+            self._header(lines, name, "histogram")
+            for (series_name, labels), series in sorted(histograms.items()):
+                if series_name != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(series[-1])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+
+        for collector in self._collectors:
+            for name, kind, help_text, samples in collector():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+    def _header(self, lines: List[str], name: str, default_kind: str) -> None:
+        kind, help_text = self._help.get(name, (default_kind, name))
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+registry = Registry()
+registry.describe("account_http_requests_total", "counter", "HTTP requests handled, by route, method and status.")
+registry.describe("account_http_request_duration_seconds", "histogram", "End-to-end request latency by route.")
+registry.describe(
+    "account_request_phase_seconds", "histogram", "Time spent per request in auth decoding, ORM queries and serialization."
+)
+registry.describe("account_db_queries_total", "counter", "ORM queries executed, by route.")
+
+
+def record_phase(phase: str, seconds: float) -> None:
+    """Add ``seconds`` to ``phase`` for the request currently being handled."""
+    phases = _current_phases.get()
+    if phases is not None:
+        phases[phase] = phases.get(phase, 0.0) + seconds
+
+
+@contextmanager
+def timed(phase: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(phase, time.perf_counter() - start)
+
+
+def _time_query(execute, sql, params, many, context):
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        phases = _current_phases.get()
+        if phases is not None:
+            phases["db"] = phases.get("db", 0.0) + (time.perf_counter() - start)
+            phases["_queries"] = phases.get("_queries", 0) + 1
+
+
+class MetricsMiddleware:
+    """
+    Record request count, status and latency per URL route, plus the time
+    each request spent in auth decoding, ORM queries and serialization.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # Stay async under ASGI so native async views are not pushed
+        # through a thread by this middleware.
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        phases: Dict[str, float] = {}
+        token = _current_phases.set(phases)
+        start = time.perf_counter()
+        try:
+            with self._timed_queries():
+                response = self.get_response(request)
+        finally:
+            _current_phases.reset(token)
+        self._record(request, response, phases, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        phases: Dict[str, float] = {}
+        token = _current_phases.set(phases)
+        start = time.perf_counter()
+        try:
+            with self._timed_queries():
+                response = await self.get_response(request)
+        finally:
+            _current_phases.reset(token)
+        self._record(request, response, phases, time.perf_counter() - start)
+        return response
+
+    @staticmethod
+    def _timed_queries() -> ExitStack:
+        stack = ExitStack()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(_time_query))
+        return stack
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after the view returns; time the render
+        # as part of the serialization phase.
+        phases = _current_phases.get()
+        if phases is not None:
+            start = time.perf_counter()
+
+            def _rendered(response):
+                phases["serialize"] = phases.get("serialize", 0.0) + (time.perf_counter() - start)
+
+            response.add_post_render_callback(_rendered)
+        return response
+
+    @staticmethod
+    def _record(request, response, phases, elapsed):
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match is not None else "unmatched"
+        method = request.method
+        registry.inc(
+            "account_http_requests_total",
+            (("route", route), ("method", method), ("status", str(response.status_code))),
+        )
+        registry.observe("account_http_request_duration_seconds", (("route", route), ("method", method)), elapsed)
+        queries = phases.pop("_queries", 0)
+        if queries:
+            registry.inc("account_db_queries_total", (("route", route),), queries)
+        for phase, seconds in phases.items():
+            registry.observe("account_request_phase_seconds", (("route", route), ("phase", phase)), seconds)
+
+
+def metrics_view(request):
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
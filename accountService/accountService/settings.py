@@ -29,6 +29,11 @@ SIMPLE_JWT = {
     "SIGNING_KEY": 'Umass-CSCI520-FinalProject-Group9',
 }
 
+# Verified JWT payloads kept per process by ExternalJWTAuthentication.
+# An entry never outlives the token's own `exp`; set the size to 0 to disable.
+ACCOUNT_TOKEN_CACHE_SIZE = 10000
+ACCOUNT_TOKEN_CACHE_TTL = 300  # seconds
+
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
@@ -62,6 +67,59 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Keyset pagination for the account list endpoints (api/pagination.py).
+# Clients may ask for a smaller page with ?page_size=, never a larger one
+# than ACCOUNT_MAX_PAGE_SIZE.
+ACCOUNT_PAGE_SIZE = 100
+ACCOUNT_MAX_PAGE_SIZE = 1000
+
+# Rows fetched per database round trip (and flushed per write) by the
+# streaming /api/account/export/ endpoint.
+ACCOUNT_EXPORT_CHUNK_SIZE = 2000
+
+# Largest array accepted by the /api/account/batch/ endpoints.
+ACCOUNT_BATCH_MAX_ITEMS = 1000
+# Largest "emails" list accepted by /api/account/bulk/(de)activate/; each
+# email is one bound parameter of the UPDATE (SQLite allows 32766).
+ACCOUNT_BULK_MAX_EMAILS = 10000
+
+# /api/account/search/: default and maximum number of results, and how many
+# index matches (the oldest accounts first) are ranked per query and shard.
+# Bounds the cost of a query that matches most of the table.
+ACCOUNT_SEARCH_LIMIT = 20
+ACCOUNT_SEARCH_MAX_LIMIT = 100
+ACCOUNT_SEARCH_CANDIDATES = 1000
+
+# Seconds /api/account/stats/ answers from a per-process cache before
+# re-running its aggregate (a full scan of the matching accounts); 0 disables.
+ACCOUNT_STATS_CACHE_TTL = 10
+
+# Backpressure for the native async views (/api/async/...): at most this many
+# requests run at once per event loop; others wait up to the queue timeout
+# and are then answered 503 with Retry-After.
+ACCOUNT_ASYNC_MAX_CONCURRENCY = 100
+ACCOUNT_ASYNC_QUEUE_TIMEOUT = 1.0  # seconds
+
+# Read-through cache in front of getAccount. The local tier is a per-process
+# LRU of serialized accounts; each entry is under ~4 KB even with a full
+# 1500-character fullname, so ACCOUNT_CACHE_SIZE bounds it at roughly
+# SIZE x 4 KB. Writes in other workers reach it only through the TTL.
+ACCOUNT_CACHE_SIZE = 5000
+ACCOUNT_CACHE_TTL = 30  # seconds
+# Optional shared tier: the alias of a Django cache in CACHES (e.g. Redis),
+# or None to use only the local tier.
+ACCOUNT_CACHE_BACKEND = None
+ACCOUNT_CACHE_BACKEND_TTL = 300  # seconds
+
+# Email-hash sharding (base/sharding.py): the database aliases that hold the
+# Account table, or empty to keep it on default. The order is part of the
+# placement; see settings_sharded. List and count endpoints query the shards
+# in parallel on ACCOUNT_SHARD_WORKERS threads (default: one per shard).
+ACCOUNT_SHARDS = []
+ACCOUNT_SHARD_WORKERS = None
+
+DATABASE_ROUTERS = ['base.sharding.ShardRouter']
+
 # SIMPLE_JWT = {
 #     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=530),
 #     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
@@ -69,6 +127,7 @@ REST_FRAMEWORK = {
 # }
 
 MIDDLEWARE = [
+    'accountService.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -0,0 +1,51 @@
+"""
+API-only profile: ``DJANGO_SETTINGS_MODULE=accountService.settings_api``.
+
+The production profile without the parts of a Django site this service
+never uses. Callers authenticate with a bearer JWT
+(``ExternalJWTAuthentication``) and every response is JSON, so:
+
+- No admin, sessions, messages or staticfiles apps, and no admin URLs
+  (``urls_api``). ``auth`` and ``contenttypes`` stay only because
+  simplejwt's TokenBackend imports the auth models.
+- No session, CSRF, auth, messages or clickjacking middleware. DRF
+  authenticates every view itself, and none of them is cookie-based.
+- No templates, password validators or translation machinery. DRF renders
+  and parses JSON only; there is no browsable API.
+
+See ``benchmarks/bench_startup.py`` and ``benchmarks/bench_middleware.py``
+for the boot time and per-request cost against the other profiles.
+"""
+from .settings_production import *  # noqa: F401,F403
+from .settings_production import MIDDLEWARE, REST_FRAMEWORK
+
+INSTALLED_APPS = [
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'rest_framework',
+    'base',
+    'accountService',
+]
+
+_SITE_MIDDLEWARE = {
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+}
+MIDDLEWARE = [name for name in MIDDLEWARE if name not in _SITE_MIDDLEWARE]
+
+ROOT_URLCONF = 'accountService.urls_api'
+
+TEMPLATES = []
+AUTH_PASSWORD_VALIDATORS = []
+USE_I18N = False
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer'],
+    'DEFAULT_PARSER_CLASSES': ['rest_framework.parsers.JSONParser'],
+    # An unauthenticated request.user is None instead of auth's AnonymousUser.
+    'UNAUTHENTICATED_USER': None,
+}
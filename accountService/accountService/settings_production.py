@@ -0,0 +1,70 @@
+"""
+Production profile: ``DJANGO_SETTINGS_MODULE=accountService.settings_production``.
+
+Everything from ``settings`` applies; this module only tunes SQLite for
+concurrent traffic.
+
+- WAL journal, so readers never block the writer and the writer never
+  blocks readers.
+- ``synchronous=NORMAL`` (durable at every WAL checkpoint, not every
+  commit), a 256 MB memory map and a 64 MB page cache per connection.
+- A busy timeout and ``BEGIN IMMEDIATE`` transactions. A writer waits
+  for the lock up front instead of failing with "database is locked"
+  when it upgrades from a read.
+- Persistent connections (``CONN_MAX_AGE``), so the pragmas run once per
+  worker thread and not once per request.
+- A ``reader`` alias on the same file opened with ``query_only``.
+  ``ReadRoutingMiddleware`` and ``ReadRouter`` send the ORM reads of
+  GET/HEAD requests to it. Set ``ACCOUNT_READ_DATABASE = None`` to keep
+  every query on ``default``.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import DATABASES, MIDDLEWARE
+
+DEBUG = False
+
+SQLITE_BUSY_TIMEOUT = 5  # seconds
+
+_SQLITE_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL;"
+    "PRAGMA mmap_size=268435456;"
+    "PRAGMA cache_size=-65536;"
+    "PRAGMA temp_store=MEMORY;"
+    f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT * 1000};"
+)
+
+DATABASES = {
+    'default': {
+        **DATABASES['default'],
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': SQLITE_BUSY_TIMEOUT,
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': 'PRAGMA journal_mode=WAL;' + _SQLITE_PRAGMAS,
+        },
+    },
+    'reader': {
+        **DATABASES['default'],
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': SQLITE_BUSY_TIMEOUT,
+            'init_command': _SQLITE_PRAGMAS + 'PRAGMA query_only=ON;',
+        },
+        # Same file as default: tests and migrations go through default.
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+
+# Alias that serves ORM reads of safe-method requests, or None.
+ACCOUNT_READ_DATABASE = 'reader'
+# After a caller's write, keep their reads on default for this long. The
+# reader shares the primary file and never lags, so no pin is needed here;
+# see settings_replica for a lagging replica.
+ACCOUNT_READ_PIN_SECONDS = 0
+ACCOUNT_READ_PIN_CACHE = 'default'
+
+DATABASE_ROUTERS = ['base.sharding.ShardRouter', 'accountService.db_routing.ReadRouter']
+
+MIDDLEWARE = [*MIDDLEWARE, 'accountService.db_routing.ReadRoutingMiddleware']
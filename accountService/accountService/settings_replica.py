@@ -0,0 +1,38 @@
+"""
+Replica profile: ``DJANGO_SETTINGS_MODULE=accountService.settings_replica``.
+
+The production profile with GET reads served by a separate replica
+database. Locally the replica is a second SQLite file,
+``db.replica.sqlite3``, refreshed from the primary by
+``python manage.py sync_replica``. Set ``ACCOUNT_READ_AUTO_SYNC = True`` to
+refresh it after every successful write request. Use that only in
+development, since each sync copies the whole file. A caller's reads stay
+on the primary for ``ACCOUNT_READ_PIN_SECONDS`` after each of their writes,
+so they read their own writes while the replica lags. The pins live in a
+file-based cache that every worker on the host shares. With workers on
+several hosts, point ``ACCOUNT_READ_PIN_CACHE`` at a cache they all reach
+(e.g. Redis).
+"""
+from .settings_production import *  # noqa: F401,F403
+from .settings_production import BASE_DIR, DATABASES
+
+DATABASES = {
+    'default': DATABASES['default'],
+    'replica': {
+        **DATABASES['reader'],
+        'NAME': BASE_DIR / 'db.replica.sqlite3',
+    },
+}
+
+ACCOUNT_READ_DATABASE = 'replica'
+ACCOUNT_READ_PIN_SECONDS = 5
+ACCOUNT_READ_AUTO_SYNC = False
+
+CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'read-pins': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / '.read-pins',
+    },
+}
+ACCOUNT_READ_PIN_CACHE = 'read-pins'
@@ -0,0 +1,27 @@
+"""
+Sharded profile: ``DJANGO_SETTINGS_MODULE=accountService.settings_sharded``.
+
+The production profile with the Account table spread over four databases
+by a hash of the email (see ``base/sharding.py``). Locally each shard is
+its own SQLite file, ``db.shard<N>.sqlite3``, tuned like ``default``;
+``default`` keeps Django's own tables. Migrate every alias once::
+
+    python manage.py migrate
+    for n in 0 1 2 3; do python manage.py migrate --database=shard$n; done
+
+The order of ``ACCOUNT_SHARDS`` decides placement: append-only changes
+still move accounts, so rebalance with export_accounts / import_accounts.
+Batch endpoints and the change feed answer 501 on this profile.
+"""
+from .settings_production import *  # noqa: F401,F403
+from .settings_production import BASE_DIR, DATABASES
+
+ACCOUNT_SHARDS = [f'shard{n}' for n in range(4)]
+
+DATABASES = {
+    'default': DATABASES['default'],
+    **{alias: {**DATABASES['default'], 'NAME': BASE_DIR / f'db.{alias}.sqlite3'} for alias in ACCOUNT_SHARDS},
+}
+
+# Shards are separate files; there is no reader alias on this profile.
+ACCOUNT_READ_DATABASE = None
@@ -0,0 +1,6 @@
+"""URLconf of the API-only profile (``settings_api``): no admin site."""
+from django.urls import include, path
+
+urlpatterns = [
+    path('api/', include('api.urls')),
+]
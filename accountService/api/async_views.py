@@ -0,0 +1,276 @@
+"""
+Native async versions of the account endpoints for the ASGI deployment.
+
+DRF's ``@api_view`` is sync-only, so under ASGI every request to
+``api/views.py`` is pushed through a worker thread. These views are plain
+Django coroutines instead: JWT authentication and permission checks run on
+the event loop, and the ORM is used through its async API (``aget``,
+``acount``, ``async for``). Responses match the sync endpoints.
+"""
+import asyncio
+import json
+import weakref
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import Q
+from django.http import JsonResponse
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException
+
+from accountService import metrics
+from accountService.authentication import ExternalJWTAuthentication
+from base.account_cache import aget_account
+from base.counters import acount_accounts
+from base.models import Account, normalize_role
+from base.sharding import shard_by, shard_querysets, sharding_enabled
+from base.updates import delete_account, set_active, update_account
+
+from .conditional import account_validators, alist_validators, if_match_filter, not_modified, set_validators
+from .filters import INVALID_DATE_MESSAGE, is_active_lookup
+from .pagination import KeysetPagination
+from .permissions import IsAdmin, IsStudent, owner_filter, token_role
+from .serializers import AccountBatchSerializer, AccountRowEncoder
+
+_encoder = AccountRowEncoder()
+_authentication = ExternalJWTAuthentication()
+_semaphores = weakref.WeakKeyDictionary()
+# Single-statement writes plus cache invalidation, which may be blocking I/O.
+_aset_active = sync_to_async(set_active)
+_aupdate_account = sync_to_async(update_account)
+_adelete_account = sync_to_async(delete_account)
+
+
+def _json(data, status=200, headers=None):
+    return JsonResponse(data, status=status, safe=False, headers=headers, json_dumps_params={'ensure_ascii': False, 'separators': (',', ':')})
+
+
+def _semaphore():
+    # asyncio primitives belong to one event loop; keep one per loop.
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(getattr(settings, 'ACCOUNT_ASYNC_MAX_CONCURRENCY', 100))
+    return semaphore
+
+
+def async_api_view(methods, permission_classes=()):
+    """
+    Async counterpart of ``@api_view`` + ``@permission_classes``.
+
+    Requests wait up to ``ACCOUNT_ASYNC_QUEUE_TIMEOUT`` seconds for one of
+    ``ACCOUNT_ASYNC_MAX_CONCURRENCY`` slots and are shed with a 503 and
+    ``Retry-After`` when none frees up, so a burst queues briefly instead of
+    piling onto the database.
+    """
+    def decorator(view):
+        @csrf_exempt
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                return _json({'detail': f'Method "{request.method}" not allowed.'}, status=405)
+
+            semaphore = _semaphore()
+            try:
+                await asyncio.wait_for(semaphore.acquire(), getattr(settings, 'ACCOUNT_ASYNC_QUEUE_TIMEOUT', 1.0))
+            except asyncio.TimeoutError:
+                return _json({'detail': 'Service busy, retry shortly.'}, status=503, headers={'Retry-After': '1'})
+            try:
+                try:
+                    result = _authentication.authenticate(request)
+                except APIException as exc:
+                    return _json({'detail': str(exc.detail)}, status=403)
+                if result is None:
+                    return _json({'detail': 'Authentication credentials were not provided.'}, status=403)
+                request.user, request.auth = result
+
+                for permission in permission_classes:
+                    if not permission().has_permission(request, wrapper):
+                        return _json({'detail': 'You do not have permission to perform this action.'}, status=403)
+
+                if request.method in ('POST', 'PUT', 'PATCH', 'DELETE'):
+                    try:
+                        request.data = json.loads(request.body or b'{}')
+                    except ValueError:
+                        return _json({'detail': 'JSON parse error.'}, status=400)
+                    if not isinstance(request.data, dict):
+                        request.data = {}
+
+                try:
+                    return await view(request, *args, **kwargs)
+                except APIException as exc:
+                    return _json({'detail': str(exc.detail)}, status=exc.status_code)
+            finally:
+                semaphore.release()
+
+        return wrapper
+    return decorator
+
+
+async def _paginated(request, queryset, ordering=('created_at', 'accountID')):
+    etag, last_modified = await alist_validators(request, queryset)
+    response = not_modified(request, etag, last_modified)
+    if response is not None:
+        return response
+    paginator = KeysetPagination(ordering)
+    queryset = _encoder.queryset(queryset)
+    if sharding_enabled():
+        page = await paginator.apaginate_querysets(shard_querysets(queryset), request)
+    else:
+        page = await paginator.apaginate_queryset(queryset, request)
+    with metrics.timed('serialize'):
+        data = _encoder.encode_many(page)
+    link = paginator.get_link_header()
+    return set_validators(_json(data, headers={'Link': link} if link else None), etag, last_modified)
+
+
+def _body_email(request):
+    return request.data.get('email')
+
+
+@async_api_view(['GET'], [IsStudent])
+@shard_by(lambda request, email: email)
+async def getAccount(request, email):
+    data = await aget_account(email, _load_account)
+    if data is None:
+        return _json({'error': 'Account not found'}, status=404)
+    etag, last_modified = account_validators(request, data)
+    return not_modified(request, etag, last_modified) or set_validators(_json(data), etag, last_modified)
+
+
+async def _load_account(email):
+    try:
+        return _encoder.encode(await _encoder.queryset(Account.objects.all()).aget(email=email))
+    except Account.DoesNotExist:
+        return None
+
+
+@async_api_view(['GET'], [IsAdmin])
+async def getAllAccounts(request):
+    return await _paginated(request, Account.objects.all())
+
+
+@async_api_view(['GET'], [IsAdmin])
+async def getActiveAccounts(request):
+    return await _paginated(request, Account.objects.filter(**is_active_lookup(True)))
+
+
+@async_api_view(['GET'], [IsAdmin])
+async def getInactiveAccounts(request):
+    return await _paginated(request, Account.objects.filter(**is_active_lookup(False)))
+
+
+@async_api_view(['GET'], [IsAdmin])
+async def getAccountsByRole(request, role):
+    return await _paginated(request, Account.objects.filter(role=role))
+
+
+@async_api_view(['GET'], [IsAdmin])
+async def getAccountsCreatedAfter(request, date_str):
+    date = parse_datetime(date_str)
+    if not date:
+        return _json({'error': INVALID_DATE_MESSAGE}, status=400)
+    return await _paginated(request, Account.objects.filter(created_at__gt=date))
+
+
+@async_api_view(['GET'], [IsAdmin])
+async def getAccountsUpdatedBefore(request, date_str):
+    date = parse_datetime(date_str)
+    if not date:
+        return _json({'error': INVALID_DATE_MESSAGE}, status=400)
+    return await _paginated(request, Account.objects.filter(updated_at__lt=date), ordering=('updated_at', 'accountID'))
+
+
+@async_api_view(['GET'], [IsAdmin])
+async def countAccounts(request):
+    return _json({'count': await acount_accounts()})
+
+
+@async_api_view(['GET'], [IsAdmin])
+async def countAccountsByRole(request, role):
+    return _json({'role': normalize_role(role), 'count': await acount_accounts(role=role)})
+
+
+@async_api_view(['POST'], [IsStudent])
+@shard_by(lambda request: getattr(request.user, 'email', None))
+async def createAccount(request):
+    # The unique-email check is left to the database constraint: the
+    # serializer's UniqueValidator would issue a sync query on the loop.
+    role = token_role(request)
+    if role is None:
+        return _json({'role': ['Unknown role in token.']}, status=400)
+    serializer = AccountBatchSerializer(data=request.data)
+    if not serializer.is_valid():
+        return _json(serializer.errors, status=400)
+    data = dict(
+        serializer.validated_data,
+        creator_id=request.user.id,
+        role=role,
+        email=getattr(request.user, 'email', None),
+    )
+    try:
+        account = await Account.objects.acreate(**data)
+    except IntegrityError:
+        return _json({'email': ['account with this email already exists.']}, status=400)
+    return _json(_encoder.encode_instance(account), status=201)
+
+
+@async_api_view(['PUT'], [IsStudent])
+@shard_by(_body_email)
+async def updateAccount(request):
+    email = request.data.get('email')
+    serializer = AccountBatchSerializer(data=request.data, partial=True)
+    if not serializer.is_valid():
+        return _json(serializer.errors, status=400)
+    values = {field: value for field, value in serializer.validated_data.items() if field != 'email'}
+    row = await _aupdate_account(email, values, _encoder.fields, _write_condition(request))
+    if row is None:
+        return await _write_failed(request, email)
+    data = _encoder.encode(row)
+    return set_validators(_json(data), *account_validators(request, data))
+
+
+@async_api_view(['DELETE'], [IsStudent])
+@shard_by(_body_email)
+async def deleteAccount(request):
+    email = request.data.get('email')
+    if not await _adelete_account(email, _write_condition(request)):
+        return await _write_failed(request, email)
+    return _json({'message': 'Account deleted successfully'})
+
+
+def _write_condition(request):
+    condition = Q(**owner_filter(request))
+    match = if_match_filter(request)
+    return condition & match if match is not None else condition
+
+
+async def _write_failed(request, email):
+    creators = [creator async for creator in Account.objects.filter(email=email).values_list('creator_id', flat=True)]
+    if not creators:
+        return _json({'error': 'Account not found'}, status=404)
+    if owner_filter(request).get('creator_id', creators[0]) != creators[0]:
+        return _json({'delete': 'Not allow'}, status=404)
+    return _json({'error': 'Account has changed; fetch it again and retry.'}, status=412)
+
+
+async def _set_active(request, is_active):
+    row = await _aset_active(request.data.get('email'), is_active, _encoder.fields)
+    if row is None:
+        return _json({'error': 'Account not found'}, status=404)
+    return _json(_encoder.encode(row))
+
+
+@async_api_view(['PUT'], [IsAdmin])
+@shard_by(_body_email)
+async def activateAccount(request):
+    return await _set_active(request, True)
+
+
+@async_api_view(['PUT'], [IsAdmin])
+@shard_by(_body_email)
+async def deactivateAccount(request):
+    return await _set_active(request, False)
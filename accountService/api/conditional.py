@@ -0,0 +1,114 @@
+"""
+ETag / Last-Modified validators for the account read endpoints.
+
+A single account is identified by ``(accountID, updated_at)``, spelled out
+in its ETag so that ``If-Match`` on a write can be turned into a WHERE
+clause without reading the row first (``if_match_filter``). A list is
+identified by its query string plus a table-wide fingerprint: the newest
+``updated_at`` (read from the end of ``account_updated_idx``) and the row
+count (summed from the AccountCounter rows). Both are cheap regardless of
+table size, and every insert, update or delete changes one of them, so a
+matching ``If-None-Match`` / ``If-Modified-Since`` is answered with a
+bodyless 304 before any page is fetched or serialized. The price of a
+table-wide fingerprint is that a write anywhere changes every list's ETag.
+"""
+import hashlib
+from datetime import datetime, timedelta, timezone
+
+from django.db.models import Max, Q
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date, parse_etags, quote_etag
+
+from base.counters import acount_accounts, count_accounts
+from base.sharding import afan_out, fan_out
+
+
+def _etag(*parts):
+    digest = hashlib.sha1("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return quote_etag(digest[:32])
+
+
+def _media_type(request):
+    # The browsable API and JSON are different representations.
+    return getattr(request, "accepted_media_type", "application/json")
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def account_validators(request, data):
+    """(etag, last_modified) for one serialized account."""
+    last_modified = parse_datetime(data["updated_at"]) if data.get("updated_at") else None
+    # "<accountID>.<updated_at in microseconds>.<representation>"
+    version = (last_modified - _EPOCH) // _MICROSECOND if last_modified else 0
+    media = hashlib.sha1(_media_type(request).encode("utf-8")).hexdigest()[:8]
+    return quote_etag(f"{data['accountID']}.{version}.{media}"), last_modified
+
+
+def if_match_filter(request):
+    """
+    Q limiting a write to the account versions named by ``If-Match``, or
+    None when the header is absent or ``*``. Tags that are not account
+    ETags, and weak ones, match nothing.
+    """
+    header = request.META.get("HTTP_IF_MATCH")
+    if header is None:
+        return None
+    etags = parse_etags(header)
+    if etags == ["*"]:
+        return None
+    condition = Q(pk__in=[])
+    for etag in etags:
+        try:
+            account_id, version, _ = etag.strip('"').split(".")
+            condition |= Q(pk=int(account_id), updated_at=_EPOCH + int(version) * _MICROSECOND)
+        except (ValueError, OverflowError):
+            continue
+    return condition
+
+
+def _list_validators(request, latest, total):
+    # Last-Modified is left off lists: deleting a row does not move
+    # Max(updated_at), so If-Modified-Since alone would miss deletions.
+    return _etag(request.get_full_path(), latest, total, _media_type(request)), None
+
+
+def _combine(fingerprints):
+    # Across shards: the newest updated_at anywhere and the summed counts.
+    latest = max((latest for latest, _ in fingerprints if latest is not None), default=None)
+    return latest, sum(total for _, total in fingerprints)
+
+
+def list_validators(request, queryset):
+    """(etag, last_modified) for a page of ``queryset``, without fetching it."""
+    def fingerprint(alias):
+        using = alias or queryset.db
+        latest = queryset.model.objects.using(using).aggregate(latest=Max("updated_at"))["latest"]
+        return latest, count_accounts(using=using)
+
+    return _list_validators(request, *_combine(fan_out(fingerprint)))
+
+
+async def alist_validators(request, queryset):
+    async def fingerprint(alias):
+        using = alias or queryset.db
+        latest = (await queryset.model.objects.using(using).aaggregate(latest=Max("updated_at")))["latest"]
+        return latest, await acount_accounts(using=using)
+
+    return _list_validators(request, *_combine(await afan_out(fingerprint)))
+
+
+def not_modified(request, etag, last_modified):
+    """The 304 (or 412) response when the request's validators match, else None."""
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    return set_validators(response, etag, last_modified) if response is not None else None
+
+
+def set_validators(response, etag, last_modified):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
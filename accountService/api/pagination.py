@@ -0,0 +1,182 @@
+import asyncio
+import base64
+import binascii
+import heapq
+import itertools
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def _query_params(request):
+    # DRF Request or a plain HttpRequest (the async views).
+    return getattr(request, "query_params", request.GET)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on a unique ordering such as
+    ``(created_at, accountID)``.
+
+    Each page is fetched with ``WHERE key > last_key ORDER BY key LIMIT n``,
+    so a page costs the same no matter how deep into the table it is.
+    The response body stays a plain list; the opaque next/prev cursors are
+    returned in an RFC 8288 ``Link`` header.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self, ordering=("created_at", "accountID")):
+        self.ordering = tuple(ordering)
+        self.page_size = getattr(settings, "ACCOUNT_PAGE_SIZE", 100)
+        self.max_page_size = getattr(settings, "ACCOUNT_MAX_PAGE_SIZE", 1000)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self._prepare(queryset, request)
+        return self._finish(list(queryset[: self.page_size + 1]))
+
+    async def apaginate_queryset(self, queryset, request):
+        """Async variant of ``paginate_queryset`` for native async views."""
+        queryset = self._prepare(queryset, request)
+        return self._finish([row async for row in queryset[: self.page_size + 1]])
+
+    def paginate_querysets(self, querysets, request, map=map):
+        """
+        One page over several querysets of the same model, e.g. the same
+        filter on each shard. Every queryset contributes at most a page
+        after the cursor; the pieces are merged on the ordering key.
+        ``map(fetch, querysets)`` may run the fetches in parallel.
+        """
+        querysets = [self._prepare(queryset, request) for queryset in querysets]
+        pages = map(lambda queryset: list(queryset[: self.page_size + 1]), querysets)
+        return self._finish(self._merge(pages))
+
+    async def apaginate_querysets(self, querysets, request):
+        querysets = [self._prepare(queryset, request) for queryset in querysets]
+
+        async def fetch(queryset):
+            return [row async for row in queryset[: self.page_size + 1]]
+
+        return self._finish(self._merge(await asyncio.gather(*map(fetch, querysets))))
+
+    def _merge(self, pages):
+        key = lambda row: tuple(getattr(row, name) for name in self.ordering)  # noqa: E731
+        merged = heapq.merge(*pages, key=key, reverse=self.reverse)
+        return list(itertools.islice(merged, self.page_size + 1))
+
+    def _prepare(self, queryset, request):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.position, self.reverse = self.decode_cursor(request, queryset.model)
+
+        prefix = "-" if self.reverse else ""
+        queryset = queryset.order_by(*(prefix + name for name in self.ordering))
+        if self.position is not None:
+            queryset = queryset.filter(self._after(self.position))
+        return queryset
+
+    def _finish(self, rows):
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+
+        if self.reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = self.position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.position is not None
+
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        link = self.get_link_header()
+        return Response(data, headers={"Link": link} if link else None)
+
+    def get_link_header(self):
+        links = []
+        next_url = self.get_next_link()
+        if next_url:
+            links.append(f'<{next_url}>; rel="next"')
+        previous_url = self.get_previous_link()
+        if previous_url:
+            links.append(f'<{previous_url}>; rel="prev"')
+        return ", ".join(links)
+
+    def get_page_size(self, request):
+        raw = _query_params(request).get(self.page_size_query_param)
+        if raw is None:
+            return min(self.page_size, self.max_page_size)
+        try:
+            size = int(raw)
+        except ValueError:
+            return min(self.page_size, self.max_page_size)
+        if size <= 0:
+            return min(self.page_size, self.max_page_size)
+        return min(size, self.max_page_size)
+
+    def get_next_link(self):
+        if not (self.has_next and self.page):
+            return None
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not (self.has_previous and self.page):
+            return None
+        return self._link(self.page[0], reverse=True)
+
+    def decode_cursor(self, request, model):
+        token = _query_params(request).get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            data = json.loads(raw)
+            values = data["p"]
+            reverse = bool(data.get("r"))
+            if len(values) != len(self.ordering):
+                raise ValueError
+            position = tuple(
+                model._meta.get_field(name).to_python(value)
+                for name, value in zip(self.ordering, values)
+            )
+        except (TypeError, ValueError, KeyError, binascii.Error, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        if any(value is None for value in position):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, row, reverse):
+        values = []
+        for name in self.ordering:
+            value = getattr(row, name)
+            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        data = {"p": values}
+        if reverse:
+            data["r"] = 1
+        raw = json.dumps(data, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def _link(self, row, reverse):
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.page_size_query_param, self.page_size)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(row, reverse))
+
+    def _after(self, position, index=0):
+        # (a, b) > (x, y)  ==  a >= x AND (a > x OR b > y); the leading
+        # range bound keeps the predicate usable by a composite index.
+        name, value = self.ordering[index], position[index]
+        strict = "lt" if self.reverse else "gt"
+        if index == len(self.ordering) - 1:
+            return Q(**{f"{name}__{strict}": value})
+        inclusive = "lte" if self.reverse else "gte"
+        return Q(**{f"{name}__{inclusive}": value}) & (
+            Q(**{f"{name}__{strict}": value}) | self._after(position, index + 1)
+        )
@@ -1,18 +1,24 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
+from base.models import Role, normalize_role
+
+
+def token_role(request):
+    """The caller's JWT role in its canonical spelling, or None if it is not a ``Role``."""
+    role = normalize_role(getattr(request.user, "role", None))
+    return role if role in Role.values else None
+
 class IsAdmin(BasePermission):
     def has_permission(self, request, view):
-        return getattr(request.user, "role", "").upper() == "ADMIN"
+        return token_role(request) == Role.ADMIN
 
 class IsStudent(BasePermission):
     def has_permission(self, request, view):
-        role = getattr(request.user, "role", "").upper()
-        return role in {"STUDENT", "ADMIN", "STAFF"}
+        return token_role(request) in {Role.STUDENT, Role.ADMIN, Role.STAFF}
 
 class IsStaff(BasePermission):
     def has_permission(self, request, view):
-        role = getattr(request.user, "role", "").upper()
-        return role in {"STAFF", "ADMIN"}
+        return token_role(request) in {Role.STAFF, Role.ADMIN}
 
 class IsOwnerOrAdmin(BasePermission):
     """
@@ -27,6 +33,16 @@ class IsOwnerOrAdmin(BasePermission):
 
         # Write permissions: only owner or admin
         is_owner = (obj.creator_id == request.user.id)
-        is_admin = getattr(request.user, "role", "").upper() == "ADMIN"
+        is_admin = token_role(request) == Role.ADMIN
         return is_owner or is_admin
         
+
+
+def owner_filter(request):
+    """
+    Lookups for the accounts ``request.user`` may write, per IsOwnerOrAdmin,
+    so the check runs in the UPDATE / DELETE's WHERE clause.
+    """
+    if token_role(request) == Role.ADMIN:
+        return {}
+    return {"creator_id": request.user.id}
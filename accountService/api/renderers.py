@@ -0,0 +1,53 @@
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+
+def _dumps(data):
+    # Same compact, non-ASCII-escaping output as DRF's JSONRenderer.
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Newline-delimited JSON: one object per line. Lists render one line per
+    item; anything else (e.g. an error dict) renders as a single line.
+    """
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        items = data if isinstance(data, list) else [data]
+        return ''.join(_dumps(item) + '\n' for item in items).encode(self.charset)
+
+
+def iter_ndjson(rows, flush_every=1000):
+    """Yield NDJSON-encoded ``rows`` as bytes, ``flush_every`` rows at a time."""
+    buffer = []
+    for row in rows:
+        buffer.append(_dumps(row))
+        if len(buffer) >= flush_every:
+            yield ('\n'.join(buffer) + '\n').encode('utf-8')
+            buffer = []
+    if buffer:
+        yield ('\n'.join(buffer) + '\n').encode('utf-8')
+
+
+def iter_json_array(rows, flush_every=1000):
+    """Yield ``rows`` as the chunks of a single JSON array."""
+    yield b'['
+    first = True
+    buffer = []
+    for row in rows:
+        buffer.append(_dumps(row))
+        if len(buffer) >= flush_every:
+            yield (('' if first else ',') + ','.join(buffer)).encode('utf-8')
+            first = False
+            buffer = []
+    if buffer:
+        yield (('' if first else ',') + ','.join(buffer)).encode('utf-8')
+    yield b']'
@@ -1,9 +1,116 @@
+from django.conf import settings
+from django.utils import timezone
 from rest_framework import serializers
-from base.models import Account
+from rest_framework.settings import ISO_8601, api_settings
+from base.models import Account, normalize_role
+
+
+class RoleChoiceField(serializers.ChoiceField):
+    """Accepts a role in any case; validates and returns its canonical spelling."""
+
+    def to_internal_value(self, data):
+        return super().to_internal_value(normalize_role(data))
+
 
 class AccountSerializer(serializers.ModelSerializer):
+    serializer_choice_field = RoleChoiceField
+
     class Meta:
         model = Account
         fields = '__all__'
         # read_only_fields = ["creator_id", "created_at"]
-        
\ No newline at end of file
+
+
+class AccountBatchSerializer(AccountSerializer):
+    """
+    Per-item validation for the batch endpoints. Email uniqueness is checked
+    once for the whole batch instead of one SELECT per item.
+    """
+
+    class Meta(AccountSerializer.Meta):
+        extra_kwargs = {'email': {'validators': []}}
+
+
+def _iso_datetime(value, current):
+    # Mirrors serializers.DateTimeField.to_representation for ISO 8601 output.
+    if not value:
+        return None
+    if value.utcoffset() is not None:
+        value = value.astimezone(current)
+    else:
+        value = timezone.make_aware(value, current)
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+class AccountRowEncoder:
+    """
+    Read-only fast path for AccountSerializer output.
+
+    Rows come from ``.values_list(..., named=True)`` so no model instances
+    are built, and each field is converted by a converter chosen once up
+    front. The resulting dicts are identical to ``AccountSerializer.data``.
+    """
+
+    def __init__(self, fields=None):
+        serializer_fields = AccountSerializer().fields
+        self.fields = tuple(fields or serializer_fields.keys())
+        converters = (
+            (index, self._converter_for(serializer_fields[name]))
+            for index, name in enumerate(self.fields)
+        )
+        self._converters = tuple((index, convert) for index, convert in converters if convert is not None)
+
+    @staticmethod
+    def _converter_for(field):
+        if isinstance(field, serializers.DateTimeField):
+            output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+            if (
+                settings.USE_TZ
+                and not hasattr(field, 'timezone')
+                and output_format is not None
+                and output_format.lower() == ISO_8601
+            ):
+                return _iso_datetime
+        elif isinstance(field, (serializers.IntegerField, serializers.CharField, serializers.BooleanField, serializers.ChoiceField)):
+            # The database adapter already returns int / str / bool, and
+            # choice columns hold the canonical choice value.
+            return None
+        return lambda value, current: field.to_representation(value)
+
+    def queryset(self, queryset, extra=()):
+        """
+        ``queryset`` as rows of ``self.fields``, followed by any ``extra``
+        columns the caller needs (e.g. a pagination key); ``encode`` leaves
+        those out of the output.
+        """
+        extra = tuple(name for name in extra if name not in self.fields)
+        return queryset.values_list(*self.fields, *extra, named=True)
+
+    def encode(self, row, current=None):
+        # zip() stops at self.fields, dropping trailing extra columns.
+        if not self._converters:
+            return dict(zip(self.fields, row))
+        if current is None:
+            current = timezone.get_current_timezone()
+        values = list(row)
+        for index, convert in self._converters:
+            value = values[index]
+            if value is not None:
+                values[index] = convert(value, current)
+        return dict(zip(self.fields, values))
+
+    def encode_instance(self, account):
+        return self.encode(tuple(getattr(account, name) for name in self.fields))
+
+    def encode_many(self, rows):
+        encode = self.encode
+        current = timezone.get_current_timezone()
+        return [encode(row, current) for row in rows]
+
+    def iter_encode(self, rows):
+        current = timezone.get_current_timezone()
+        for row in rows:
+            yield self.encode(row, current)
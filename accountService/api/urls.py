@@ -1,15 +1,26 @@
 from django.urls import path
 
-from . import views
+from accountService.metrics import metrics_view
+from . import async_views, views
 
 urlpatterns = [
     path('account/', views.getAllAccounts),
     path('account/get/<str:email>/', views.getAccount),
+    path('account/list/', views.listAccounts),
+    path('account/export/', views.exportAccounts),
+    path('account/changes/', views.getAccountChanges),
+    path('account/search/', views.searchAccounts),
+    path('account/stats/', views.accountStats),
     path('account/create/', views.createAccount),
     path('account/update/', views.updateAccount),
     path('account/delete/', views.deleteAccount),
     path('account/activate/', views.activateAccount),
     path('account/deactivate/', views.deactivateAccount),
+    path('account/bulk/activate/', views.bulkActivateAccounts),
+    path('account/bulk/deactivate/', views.bulkDeactivateAccounts),
+    path('account/batch/create/', views.batchCreateAccounts),
+    path('account/batch/update/', views.batchUpdateAccounts),
+    path('account/batch/delete/', views.batchDeleteAccounts),
     # path('account/delete_all/', views.deleteAllAccounts),
     path('account/count/', views.countAccounts),
     path('account/count_by_role/<str:role>/', views.countAccountsByRole),
@@ -24,5 +35,24 @@ urlpatterns = [
     path('account/inactive/', views.getInactiveAccounts),
     path('health/', views.healthCheck),
     path('welcome/', views.welcome),
+    path('metrics/', metrics_view),
     path('', views.apiOverview),
 ]
+
+# Native async variants of the account endpoints, for ASGI deployments.
+urlpatterns += [
+    path('async/account/', async_views.getAllAccounts),
+    path('async/account/get/<str:email>/', async_views.getAccount),
+    path('async/account/create/', async_views.createAccount),
+    path('async/account/update/', async_views.updateAccount),
+    path('async/account/delete/', async_views.deleteAccount),
+    path('async/account/activate/', async_views.activateAccount),
+    path('async/account/deactivate/', async_views.deactivateAccount),
+    path('async/account/count/', async_views.countAccounts),
+    path('async/account/count_by_role/<str:role>/', async_views.countAccountsByRole),
+    path('async/account/created_after/<str:date_str>/', async_views.getAccountsCreatedAfter),
+    path('async/account/role/<str:role>/', async_views.getAccountsByRole),
+    path('async/account/updated_before/<str:date_str>/', async_views.getAccountsUpdatedBefore),
+    path('async/account/active/', async_views.getActiveAccounts),
+    path('async/account/inactive/', async_views.getInactiveAccounts),
+]
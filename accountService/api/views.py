@@ -1,44 +1,227 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from accountService import metrics
+from django.http import StreamingHttpResponse
 from rest_framework.response import Response
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework import permissions, status
-from .serializers import AccountSerializer
-from .permissions import IsAdmin, IsStudent, IsStaff, IsOwnerOrAdmin
-from rest_framework.exceptions import PermissionDenied
-from base.models import Account 
+from rest_framework.renderers import JSONRenderer
+from .serializers import AccountBatchSerializer, AccountRowEncoder, AccountSerializer, _iso_datetime
+from .pagination import KeysetPagination
+from .conditional import account_validators, if_match_filter, list_validators, not_modified, set_validators
+from .filters import AccountFilter, apply_account_filters, is_active_lookup
+from .renderers import NDJSONRenderer, iter_json_array, iter_ndjson
+from .permissions import IsAdmin, IsStudent, IsStaff, owner_filter, token_role
+from base.models import Account, normalize_role
+from base.changes import changes_enabled, changes_since
+from base.counters import count_accounts
+from base.search import MIN_TERM_LENGTH, search_accounts, search_terms
+from base.stats import BUCKETS, account_stats
+from base.account_cache import get_account, invalidate_accounts, invalidate_all
+from base.sharding import fan_out, parallel_map, shard_by, shard_querysets, sharding_enabled
+from base.updates import bulk_set_active, delete_account, delete_returning, set_active, update_account, write_transaction
 from django.utils.dateparse import parse_datetime
+from functools import lru_cache
+from itertools import chain
 
 print("request.user")
+
+_encoder = AccountRowEncoder()
+
+def _paginated_response(request, queryset, ordering=("created_at", "accountID"), encoder=_encoder):
+    etag, last_modified = list_validators(request, queryset)
+    response = not_modified(request, etag, last_modified)
+    if response is not None:
+        return response
+    paginator = KeysetPagination(ordering)
+    queryset = encoder.queryset(queryset, extra=ordering)
+    if sharding_enabled():
+        page = paginator.paginate_querysets(shard_querysets(queryset), request, parallel_map)
+    else:
+        page = paginator.paginate_queryset(queryset, request)
+    with metrics.timed("serialize"):
+        data = encoder.encode_many(page)
+    return set_validators(paginator.get_paginated_response(data), etag, last_modified)
+
+def _body_email(request):
+    return request.data.get('email')
+
 @api_view(['GET'])
 @permission_classes([IsStudent])
+@shard_by(lambda request, email: email)
 def getAccount(request, email):
-    
+    data = get_account(email, _load_account)
+    if data is None:
+        return Response({'error': 'Account not found'}, status=404)
+    etag, last_modified = account_validators(request, data)
+    return not_modified(request, etag, last_modified) or set_validators(Response(data), etag, last_modified)
+
+def _load_account(email):
     try:
-        account = Account.objects.get(email=email)
+        return _encoder.encode(_encoder.queryset(Account.objects.all()).get(email=email))
     except Account.DoesNotExist:
-        return Response({'error': 'Account not found'}, status=404)
+        return None
+
+@lru_cache(maxsize=64)
+def _projection(fields):
+    return AccountRowEncoder(fields)
 
-    serializer = AccountSerializer(account)
-    return Response(serializer.data)
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def listAccounts(request):
+    """
+    One list endpoint for every filter combination: ``role``, ``active``,
+    ``created_after`` / ``created_before``, ``updated_after`` /
+    ``updated_before`` and ``email`` (comma-separated), all in one WHERE
+    clause. ``?fields=email,role`` selects and returns only those columns.
+    """
+    filterset = AccountFilter(request.query_params, queryset=Account.objects.all())
+    if not filterset.is_valid():
+        return Response(filterset.errors, status=400)
+    fields = _encoder.fields
+    if request.query_params.get('fields'):
+        fields = tuple(dict.fromkeys(name.strip() for name in request.query_params['fields'].split(',') if name.strip()))
+        unknown = [name for name in fields if name not in _encoder.fields]
+        if unknown or not fields:
+            return Response({'error': f"fields must be a comma-separated subset of {', '.join(_encoder.fields)}."}, status=400)
+    return _paginated_response(request, filterset.qs, encoder=_projection(fields))
 
 @api_view(['GET'])
 @permission_classes([IsAdmin])
 def getAllAccounts(request):
     accounts = Account.objects.all()
-    serializer = AccountSerializer(accounts, many=True)
-    account = serializer.data
-    return Response(account)
+    return _paginated_response(request, accounts)
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+@renderer_classes([NDJSONRenderer, JSONRenderer])
+def exportAccounts(request):
+    """
+    Stream every matching account as NDJSON (default) or, with
+    ``?format=json``, as one JSON array. Rows are read with a chunked
+    iterator and encoded as they go, so memory stays flat.
+    """
+    try:
+        accounts = apply_account_filters(Account.objects.all(), request.query_params)
+    except ValueError as exc:
+        return Response({'error': str(exc)}, status=400)
+
+    chunk_size = getattr(settings, 'ACCOUNT_EXPORT_CHUNK_SIZE', 2000)
+    querysets = shard_querysets(accounts) or [accounts]
+    rows = _encoder.iter_encode(chain.from_iterable(
+        # One shard after another; each in accountID order.
+        _encoder.queryset(queryset.order_by('accountID')).iterator(chunk_size=chunk_size)
+        for queryset in querysets
+    ))
+    renderer = request.accepted_renderer
+    if renderer.format == 'ndjson':
+        content = iter_ndjson(rows, flush_every=chunk_size)
+    else:
+        content = iter_json_array(rows, flush_every=chunk_size)
+    return StreamingHttpResponse(content, content_type=f'{renderer.media_type}; charset=utf-8')
+
+_STATS_FILTERS = ('role', 'active', 'created_after', 'created_before', 'updated_after', 'updated_before')
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def accountStats(request):
+    """
+    Dashboard counts in one grouped query: totals, active/inactive per role
+    and a histogram of created_at in ``?bucket=day|week|month`` (UTC,
+    default month). Takes the list endpoints' filters. Served from a cache
+    for up to ACCOUNT_STATS_CACHE_TTL seconds.
+    """
+    bucket = request.query_params.get('bucket') or 'month'
+    if bucket not in BUCKETS:
+        return Response({'error': f"bucket must be one of {', '.join(BUCKETS)}."}, status=400)
+    params = {key: request.query_params[key] for key in _STATS_FILTERS if request.query_params.get(key)}
+    try:
+        accounts = apply_account_filters(Account.objects.all(), params)
+    except ValueError as exc:
+        return Response({'error': str(exc)}, status=400)
+    return Response(account_stats(accounts, bucket, key=tuple(sorted(params.items()))))
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def searchAccounts(request):
+    """
+    Type-ahead search: accounts whose fullname or email contain every word
+    of ``?q=`` (words of three or more characters), best match first.
+    ``?limit=`` defaults to ACCOUNT_SEARCH_LIMIT and is capped by
+    ACCOUNT_SEARCH_MAX_LIMIT.
+    """
+    query = request.query_params.get('q', '')
+    if not search_terms(query):
+        return Response({'error': f'q needs a word of at least {MIN_TERM_LENGTH} characters.'}, status=400)
+    try:
+        limit = int(request.query_params.get('limit') or getattr(settings, 'ACCOUNT_SEARCH_LIMIT', 20))
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        return Response({'error': 'limit must be a positive integer.'}, status=400)
+    limit = min(limit, getattr(settings, 'ACCOUNT_SEARCH_MAX_LIMIT', 100))
+    rows = search_accounts(query, limit, _encoder.queryset)
+    with metrics.timed("serialize"):
+        data = _encoder.encode_many(rows)
+    return Response(data)
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def getAccountChanges(request):
+    """
+    Incremental feed for mirrors of the account table: upserts and delete
+    tombstones with a change sequence above ``?since=``, oldest first. Each
+    account appears at most once, at its latest change. Pass the returned
+    ``cursor`` as ``since`` to continue; an empty page keeps the cursor.
+    """
+    if not changes_enabled():
+        return Response({'error': 'The change feed requires the SQLite change triggers.'}, status=501)
+    if sharding_enabled():
+        return Response({'error': 'The change feed is not available on a sharded deployment.'}, status=501)
+    try:
+        since = int(request.query_params.get('since') or 0)
+    except ValueError:
+        since = -1
+    if since < 0:
+        return Response({'error': 'since must be a cursor returned by this endpoint.'}, status=400)
+
+    limit = KeysetPagination().get_page_size(request)
+    changes, rows, has_more = changes_since(since, limit, _encoder.queryset)
+    current = timezone.get_current_timezone()
+    results = []
+    with metrics.timed("serialize"):
+        for change in changes:
+            if change.deleted:
+                results.append({
+                    'seq': change.seq,
+                    'op': 'delete',
+                    'accountID': change.account_id,
+                    'email': change.email,
+                    'deleted_at': _iso_datetime(change.changed_at, current),
+                })
+            elif change.account_id in rows:
+                results.append({'seq': change.seq, 'op': 'upsert', 'account': _encoder.encode(rows[change.account_id], current)})
+    cursor = changes[-1].seq if changes else since
+    return Response({'results': results, 'cursor': cursor, 'has_more': has_more})
 
 @api_view(['POST'])
 @permission_classes([IsStudent])
+@shard_by(lambda request: getattr(request.user, 'email', None))
 def createAccount(request):
     print("34request.data", request.data)
     print("35request.user", request.user)
     
+    # The role comes from the token and must be one RoleField stores.
+    role = token_role(request)
+    if role is None:
+        return Response({'role': ['Unknown role in token.']}, status=status.HTTP_400_BAD_REQUEST)
     serializer = AccountSerializer(data=request.data)
     if serializer.is_valid():
         serializer.save(
             creator_id=request.user.id,
-            role=getattr(request.user, "role", None),
+            role=role,
             email=getattr(request.user, "email", None),
         )  # fields derived from JWT
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -46,52 +229,223 @@ def createAccount(request):
 
 @api_view(['PUT'])
 @permission_classes([IsStudent])
+@shard_by(_body_email)
 def updateAccount(request):
     email = request.data.get('email')
-    try:
-        account = Account.objects.get(email=email)
-        perm = IsOwnerOrAdmin()
-        if not perm.has_object_permission(request, view=updateAccount, obj=account):
-            raise PermissionDenied("You are not allowed to access this event.")
-    except PermissionDenied :
-        return Response({"delete": "Not allow"}, status=status.HTTP_404_NOT_FOUND)
-    except Account.DoesNotExist:
-        return Response({'error': 'Account not found'}, status=404)
-
-    serializer = AccountSerializer(account, data=request.data, partial=True)
-    if serializer.is_valid():
-        serializer.save()
-        return Response(serializer.data)
-    return Response(serializer.errors, status=400)
+    # The email identifies the account; uniqueness is not in question.
+    serializer = AccountBatchSerializer(data=request.data, partial=True)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=400)
+    values = {field: value for field, value in serializer.validated_data.items() if field != 'email'}
+    row = update_account(email, values, _encoder.fields, _write_condition(request))
+    if row is None:
+        return _write_failed(request, email)
+    data = _encoder.encode(row)
+    return set_validators(Response(data), *account_validators(request, data))
 
 @api_view(['DELETE'])
 @permission_classes([IsStudent])
+@shard_by(_body_email)
 def deleteAccount(request):
     email = request.data.get('email')
-    try:
-        account = Account.objects.get(email=email)
-        perm = IsOwnerOrAdmin()
-        if not perm.has_object_permission(request, view=updateAccount, obj=account):
-            raise PermissionDenied("You are not allowed to access this event.")
-    except PermissionDenied :
-        return Response({"delete": "Not allow"}, status=status.HTTP_404_NOT_FOUND)
-    except Account.DoesNotExist:
-        return Response({'error': 'Account not found'}, status=404)
-
-    account.delete()
+    if not delete_account(email, _write_condition(request)):
+        return _write_failed(request, email)
     return Response({'message': 'Account deleted successfully'})
 
+def _write_condition(request):
+    # Ownership and If-Match go into the statement's WHERE clause.
+    condition = Q(**owner_filter(request))
+    match = if_match_filter(request)
+    return condition & match if match is not None else condition
+
+def _write_failed(request, email):
+    """The response for a write that matched no row; only failures pay for this SELECT."""
+    creators = list(Account.objects.filter(email=email).values_list('creator_id', flat=True))
+    if not creators:
+        return Response({'error': 'Account not found'}, status=404)
+    if owner_filter(request).get('creator_id', creators[0]) != creators[0]:
+        return Response({"delete": "Not allow"}, status=status.HTTP_404_NOT_FOUND)
+    return Response({'error': 'Account has changed; fetch it again and retry.'}, status=status.HTTP_412_PRECONDITION_FAILED)
+
 @api_view(['DELETE'])
 @permission_classes([IsAdmin])
 def deleteAllAccounts(request):
-    count, _ = Account.objects.all().delete()
+    count = sum(fan_out(lambda alias: Account.objects.using(alias).all().delete()[0]))
+    invalidate_all()
     return Response({'message': f'{count} Accounts were deleted successfully!'})
 
+def _batch_items(request):
+    """Return (items, error_response) for a batch request body."""
+    items = request.data
+    if not isinstance(items, list) or not items:
+        return None, Response({'error': 'Expected a non-empty JSON array.'}, status=400)
+    limit = getattr(settings, 'ACCOUNT_BATCH_MAX_ITEMS', 1000)
+    if len(items) > limit:
+        return None, Response({'error': f'A batch may contain at most {limit} items.'}, status=400)
+    if sharding_enabled():
+        # A batch would span shards and lose its single transaction.
+        return None, Response({'error': 'Batch endpoints are not available on a sharded deployment.'}, status=501)
+    return items, None
+
+_EMAIL_TAKEN = 'account with this email already exists.'
+
+def _item_email(item):
+    if isinstance(item, dict):
+        item = item.get('email')
+    return item if isinstance(item, str) and item else None
+
+@api_view(['POST'])
+@permission_classes([IsAdmin])
+def batchCreateAccounts(request):
+    """
+    Create up to ACCOUNT_BATCH_MAX_ITEMS accounts. Items are validated in one
+    pass, existing emails are found with a single query and all valid rows
+    are written with one bulk_create.
+    """
+    items, error = _batch_items(request)
+    if error:
+        return error
+
+    results = [None] * len(items)
+    pending = {}
+    for index, item in enumerate(items):
+        serializer = AccountBatchSerializer(data=item)
+        if not serializer.is_valid():
+            results[index] = {'index': index, 'status': 400, 'errors': serializer.errors}
+            continue
+        email = serializer.validated_data['email']
+        if email in pending:
+            results[index] = {'index': index, 'status': 400, 'errors': {'email': ['Duplicate email in batch.']}}
+            continue
+        pending[email] = (index, serializer.validated_data)
+
+    existing = set(Account.objects.filter(email__in=list(pending)).values_list('email', flat=True))
+    accounts = []
+    for email, (index, data) in pending.items():
+        if email in existing:
+            results[index] = {'index': index, 'status': 400, 'errors': {'email': [_EMAIL_TAKEN]}}
+            continue
+        data['creator_id'] = request.user.id
+        accounts.append((index, Account(**data)))
+
+    try:
+        with write_transaction():
+            Account.objects.bulk_create([account for _, account in accounts])
+    except IntegrityError:
+        # An email was created concurrently since the check above: insert
+        # one by one so only the conflicting items fail.
+        created = []
+        with write_transaction():
+            for index, account in accounts:
+                try:
+                    with transaction.atomic():
+                        account.save(force_insert=True)
+                except IntegrityError:
+                    results[index] = {'index': index, 'status': 400, 'errors': {'email': [_EMAIL_TAKEN]}}
+                    continue
+                created.append((index, account))
+        accounts = created
+    invalidate_accounts(account.email for _, account in accounts)
+    for index, account in accounts:
+        results[index] = {'index': index, 'status': 201, 'account': _encoder.encode_instance(account)}
+
+    return Response({'created': len(accounts), 'failed': len(items) - len(accounts), 'results': results})
+
+@api_view(['PUT'])
+@permission_classes([IsStudent])
+def batchUpdateAccounts(request):
+    """
+    Partially update many accounts, each item keyed by ``email``. Each item
+    is one conditional UPDATE (``update_account``) of only the fields it
+    sent, with owner-or-admin in the WHERE clause, all in one transaction.
+    Concurrent changes to other columns survive.
+    """
+    items, error = _batch_items(request)
+    if error:
+        return error
+
+    results = [None] * len(items)
+    writes, seen = [], set()
+    for index, item in enumerate(items):
+        email = _item_email(item)
+        if email is None or not isinstance(item, dict):
+            results[index] = {'index': index, 'status': 400, 'errors': {'email': ['This field is required.']}}
+            continue
+        if email in seen:
+            results[index] = {'index': index, 'status': 400, 'errors': {'email': ['Duplicate email in batch.']}}
+            continue
+        seen.add(email)
+        serializer = AccountBatchSerializer(data=item, partial=True)
+        if not serializer.is_valid():
+            results[index] = {'index': index, 'status': 400, 'errors': serializer.errors}
+            continue
+        values = {field: value for field, value in serializer.validated_data.items() if field != 'email'}
+        writes.append((index, email, values))
+
+    condition = Q(**owner_filter(request))
+    failed = {}
+    with write_transaction():
+        for index, email, values in writes:
+            row = update_account(email, values, _encoder.fields, condition)
+            if row is None:
+                failed[email] = index
+            else:
+                results[index] = {'index': index, 'status': 200, 'account': _encoder.encode(row)}
+    # Only failures pay for this SELECT: the account is missing or not the caller's.
+    found = set(Account.objects.filter(email__in=list(failed)).values_list('email', flat=True)) if failed else set()
+    for email, index in failed.items():
+        if email in found:
+            results[index] = {'index': index, 'status': 404, 'error': 'Not allow'}
+        else:
+            results[index] = {'index': index, 'status': 404, 'error': 'Account not found'}
+
+    updated = sum(1 for result in results if result['status'] == 200)
+    return Response({'updated': updated, 'failed': len(items) - updated, 'results': results})
+
+@api_view(['DELETE'])
+@permission_classes([IsStudent])
+def batchDeleteAccounts(request):
+    """
+    Delete many accounts by email (a list of emails or ``{"email": ...}``
+    objects) with one DELETE ... RETURNING whose WHERE clause holds the
+    ownership check, skipping those the caller may not delete.
+    """
+    items, error = _batch_items(request)
+    if error:
+        return error
+
+    emails = [_item_email(item) for item in items]
+    requested = list({email for email in emails if email})
+    owners = owner_filter(request)
+    # The results and invalidations come from the rows the DELETE returns,
+    # not from an earlier read that a concurrent create could outdate.
+    with write_transaction():
+        rows = delete_returning(Account.objects.filter(email__in=requested, **owners), ['email'])
+        deleted_emails = {email for email, in rows}
+        invalidate_accounts(deleted_emails)
+        # Of the rest, those that exist belong to someone else.
+        found = set(Account.objects.filter(email__in=set(requested) - deleted_emails).values_list('email', flat=True))
+
+    results, seen = [], set()
+    for index, email in enumerate(emails):
+        if email is None:
+            results.append({'index': index, 'status': 400, 'errors': {'email': ['This field is required.']}})
+        elif email in seen:
+            results.append({'index': index, 'email': email, 'status': 400, 'errors': {'email': ['Duplicate email in batch.']}})
+        elif email in found:
+            results.append({'index': index, 'email': email, 'status': 404, 'error': 'Not allow'})
+        elif email not in deleted_emails:
+            results.append({'index': index, 'email': email, 'status': 404, 'error': 'Account not found'})
+        else:
+            results.append({'index': index, 'email': email, 'status': 200})
+        seen.add(email)
+    deleted = sum(1 for result in results if result['status'] == 200)
+    return Response({'deleted': deleted, 'failed': len(items) - deleted, 'results': results})
+
 @api_view(['GET'])
 @permission_classes([IsAdmin])
 def countAccounts(request):
-    count = Account.objects.count()
-    return Response({'count': count})
+    return Response({'count': count_accounts()})
 
 @api_view(['GET'])
 def healthCheck(request):
@@ -119,57 +473,83 @@ def apiOverview(request):
 @api_view(['GET'])
 @permission_classes([IsAdmin])
 def getActiveAccounts(request):
-    active_accounts = Account.objects.filter(is_active=True)
-    serializer = AccountSerializer(active_accounts, many=True)
-    return Response(serializer.data)
+    active_accounts = Account.objects.filter(**is_active_lookup(True))
+    return _paginated_response(request, active_accounts)
 
 @api_view(['GET'])
 @permission_classes([IsAdmin])
 def getInactiveAccounts(request):
-    inactive_accounts = Account.objects.filter(is_active=False)
-    serializer = AccountSerializer(inactive_accounts, many=True)
-    return Response(serializer.data)
+    inactive_accounts = Account.objects.filter(**is_active_lookup(False))
+    return _paginated_response(request, inactive_accounts)
 
 @api_view(['PUT'])
 @permission_classes([IsAdmin])
+@shard_by(_body_email)
 def activateAccount(request):
-    email = request.data.get('email')
-    try:
-        account = Account.objects.get(email=email)
-    except Account.DoesNotExist:
-        return Response({'error': 'Account not found'}, status=404)
-
-    account.is_active = True
-    account.save()
-    serializer = AccountSerializer(account)
-    return Response(serializer.data)
+    return _set_active(request, True)
 
 @api_view(['PUT'])
 @permission_classes([IsAdmin])
+@shard_by(_body_email)
 def deactivateAccount(request):
-    email = request.data.get('email')
-    try:
-        account = Account.objects.get(email=email)
-    except Account.DoesNotExist:
+    return _set_active(request, False)
+
+def _set_active(request, is_active):
+    # One UPDATE ... RETURNING: no read-modify-write window, no full-row save.
+    row = set_active(request.data.get('email'), is_active, _encoder.fields)
+    if row is None:
         return Response({'error': 'Account not found'}, status=404)
+    return Response(_encoder.encode(row))
+
+def _bulk_set_active(request, is_active):
+    """
+    Set the status of every account matching the body's filters in one
+    UPDATE: ``role``, ``created_after`` / ``created_before`` and
+    ``emails``. At least one filter is required.
+    """
+    body = request.data if isinstance(request.data, dict) else {}
+    emails = body.get('emails')
+    if emails is not None and (not isinstance(emails, list) or not all(isinstance(e, str) for e in emails)):
+        return Response({'error': 'emails must be a list of strings.'}, status=400)
+    limit = getattr(settings, 'ACCOUNT_BULK_MAX_EMAILS', 10000)
+    if emails is not None and len(emails) > limit:
+        return Response({'error': f'emails may contain at most {limit} entries.'}, status=400)
+    filters = {key: body[key] for key in ('role', 'created_after', 'created_before') if body.get(key)}
+    if not all(isinstance(value, str) for value in filters.values()):
+        return Response({'error': 'role, created_after and created_before must be strings.'}, status=400)
+    if not filters and not emails:
+        return Response({'error': 'Give at least one of role, created_after, created_before or emails.'}, status=400)
+    try:
+        accounts = apply_account_filters(Account.objects.all(), filters)
+    except ValueError as exc:
+        return Response({'error': str(exc)}, status=400)
+    if emails:
+        accounts = accounts.filter(email__in=emails)
+
+    # Per shard when sharded; each shard's UPDATE is atomic on its own.
+    changed = sum(fan_out(lambda alias: bulk_set_active(accounts.using(alias), is_active)))
+    return Response({'updated': changed})
+
+@api_view(['PUT'])
+@permission_classes([IsAdmin])
+def bulkActivateAccounts(request):
+    return _bulk_set_active(request, True)
 
-    account.is_active = False
-    account.save()
-    serializer = AccountSerializer(account)
-    return Response(serializer.data)
+@api_view(['PUT'])
+@permission_classes([IsAdmin])
+def bulkDeactivateAccounts(request):
+    return _bulk_set_active(request, False)
 
 @api_view(['GET'])
 @permission_classes([IsAdmin])
 def getAccountsByRole(request, role):
     accounts = Account.objects.filter(role=role)
-    serializer = AccountSerializer(accounts, many=True)
-    return Response(serializer.data)
+    return _paginated_response(request, accounts)
 
 @api_view(['GET'])
 @permission_classes([IsAdmin])
 def countAccountsByRole(request, role):
-    count = Account.objects.filter(role=role).count()
-    return Response({'role': role, 'count': count})
+    return Response({'role': normalize_role(role), 'count': count_accounts(role=role)})
 
 @api_view(['GET'])
 @permission_classes([IsAdmin])
@@ -179,8 +559,7 @@ def getAccountsCreatedAfter(request, date_str):
         return Response({'error': 'Invalid date format. Use ISO 8601 format.'}, status=400)
 
     accounts = Account.objects.filter(created_at__gt=date)
-    serializer = AccountSerializer(accounts, many=True)
-    return Response(serializer.data)
+    return _paginated_response(request, accounts)
 
 @api_view(['GET'])
 @permission_classes([IsAdmin])
@@ -191,8 +570,7 @@ def getAccountsUpdatedBefore(request, date_str):
         return Response({'error': 'Invalid date format. Use ISO 8601 format.'}, status=400)
 
     accounts = Account.objects.filter(updated_at__lt=date)
-    serializer = AccountSerializer(accounts, many=True)
-    return Response(serializer.data)
+    return _paginated_response(request, accounts, ordering=("updated_at", "accountID"))
 
 # @api_view(['GET'])
 # @permission_classes([IsAdmin])
@@ -0,0 +1,237 @@
+"""
+Read-through cache for single-account lookups by email.
+
+Two tiers: a per-process LRU (``ACCOUNT_CACHE_SIZE`` entries, each expiring
+after ``ACCOUNT_CACHE_TTL`` seconds) and, when ``ACCOUNT_CACHE_BACKEND``
+names a Django cache alias, a shared tier that every worker reads through.
+Only found accounts are cached, as the serialized dict the view returns.
+
+Writes invalidate by email: instance saves through the ``post_save``
+receiver below, deletes and bulk writes by calling ``invalidate_accounts``
+or ``invalidate_all`` directly. Invalidation runs immediately and again when
+the surrounding transaction commits. Shared entries are tagged with the
+email's version (and the global generation) read before the row was
+loaded, and every invalidation gives the email a new version, so a read
+in any worker that raced the write cannot leave the pre-commit row behind.
+Another worker's local tier only learns of a write through its TTL, which
+is why that TTL is kept short.
+
+Entries may be filled from a lagging replica (``ACCOUNT_READ_DATABASE``),
+so a caller whose reads are pinned to the primary after a write skips both
+tiers: their lookup loads from the primary and replaces the entry.
+"""
+import hashlib
+import secrets
+import threading
+from typing import Callable, Dict, Iterable, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from accountService import metrics
+from accountService.caching import LRUCache
+from accountService.db_routing import read_database, reads_pinned
+
+from .models import Account
+
+_GENERATION_KEY = "account-cache:generation"
+
+_local: Optional[LRUCache] = None
+_lock = threading.Lock()
+# Bumped by every invalidation. A read that started under an older value
+# does not store its result, since a write may have happened in between.
+_generation = 0
+_shared_hits = 0
+
+
+def get_local_cache() -> LRUCache:
+    global _local
+    if _local is None:
+        _local = LRUCache(
+            maxsize=getattr(settings, "ACCOUNT_CACHE_SIZE", 5000),
+            ttl=getattr(settings, "ACCOUNT_CACHE_TTL", 30),
+        )
+    return _local
+
+
+def _shared():
+    alias = getattr(settings, "ACCOUNT_CACHE_BACKEND", None)
+    return caches[alias] if alias else None
+
+
+def _shared_key(email: str) -> str:
+    # Emails are arbitrary user input; hash them into a backend-safe key.
+    return "account-cache:" + hashlib.sha1(email.encode("utf-8")).hexdigest()
+
+
+def _version_key(email: str) -> str:
+    return "account-cache-version:" + hashlib.sha1(email.encode("utf-8")).hexdigest()
+
+
+def _shared_ttl() -> int:
+    return getattr(settings, "ACCOUNT_CACHE_BACKEND_TTL", 300)
+
+
+def _shared_keys(email):
+    return [_GENERATION_KEY, _version_key(email), _shared_key(email)]
+
+
+def _shared_lookup(found, email):
+    """``(tag, value)`` from a get_many of ``_shared_keys``; value is None unless a current entry was found."""
+    tag = (found.get(_GENERATION_KEY, 0), found.get(_version_key(email)))
+    entry = found.get(_shared_key(email))
+    if entry is not None and entry[0] == tag:
+        return tag, entry[1]
+    return tag, None
+
+
+def get_account(email: str, load: Callable[[str], Optional[dict]]) -> Optional[dict]:
+    """
+    Return the cached account for ``email``, calling ``load(email)`` on a
+    miss. ``load`` returns the serialized account, or None if there is none.
+    """
+    global _shared_hits
+    pinned = reads_pinned()
+    value = None if pinned else get_local_cache().get(email)
+    if value is not None:
+        return value
+
+    generation = _generation
+    shared = _shared()
+    tag = None
+    if shared is not None:
+        tag, cached = _shared_lookup(shared.get_many(_shared_keys(email)), email)
+        if cached is not None and not pinned:
+            _shared_hits += 1
+            _store_local(email, cached, generation)
+            return cached
+
+    value = load(email)
+    if value is not None and _store_local(email, value, generation) and shared is not None:
+        # Tagged with the version read before load(): if the email was
+        # invalidated meanwhile, readers will not match this entry.
+        shared.set(_shared_key(email), (tag, value), _shared_ttl())
+    return value
+
+
+async def aget_account(email: str, load) -> Optional[dict]:
+    """Async variant of ``get_account``; ``load`` is a coroutine function."""
+    global _shared_hits
+    # Pins live in a cache that may do blocking I/O; only look when routing.
+    pinned = read_database() is not None and await sync_to_async(reads_pinned)()
+    value = None if pinned else get_local_cache().get(email)
+    if value is not None:
+        return value
+
+    generation = _generation
+    shared = _shared()
+    tag = None
+    if shared is not None:
+        tag, cached = _shared_lookup(await shared.aget_many(_shared_keys(email)), email)
+        if cached is not None and not pinned:
+            _shared_hits += 1
+            _store_local(email, cached, generation)
+            return cached
+
+    value = await load(email)
+    if value is not None and _store_local(email, value, generation) and shared is not None:
+        await shared.aset(_shared_key(email), (tag, value), _shared_ttl())
+    return value
+
+
+def _store_local(email, value, generation) -> bool:
+    with _lock:
+        if generation != _generation:
+            return False
+        get_local_cache().set(email, value)
+    return True
+
+
+def _drop(emails) -> None:
+    global _generation
+    local = get_local_cache()
+    with _lock:
+        _generation += 1
+        for email in emails:
+            local.delete(email)
+    shared = _shared()
+    if shared is not None:
+        # A new version per email makes every entry stored under an older
+        # one stale, including one a racing reader is about to write. The
+        # versions outlive such entries (at most one TTL) with room to spare.
+        shared.set_many({_version_key(email): secrets.token_hex(8) for email in emails}, 2 * _shared_ttl())
+        shared.delete_many([_shared_key(email) for email in emails])
+
+
+def _drop_all() -> None:
+    global _generation
+    with _lock:
+        _generation += 1
+        get_local_cache().clear()
+    shared = _shared()
+    if shared is not None:
+        # Entries tagged with an older generation are ignored on read.
+        try:
+            shared.incr(_GENERATION_KEY)
+        except ValueError:
+            shared.set(_GENERATION_KEY, 1, None)
+
+
+def _on_commit(func, using) -> None:
+    if connections[using].in_atomic_block:
+        transaction.on_commit(func, using=using)
+
+
+def invalidate_accounts(emails: Iterable[Optional[str]], using: str = DEFAULT_DB_ALIAS) -> None:
+    """Forget the cached entries for ``emails`` now and after the current commit."""
+    emails = [email for email in set(emails) if email]
+    if emails:
+        _drop(emails)
+        _on_commit(lambda: _drop(emails), using)
+
+
+def invalidate_all(using: str = DEFAULT_DB_ALIAS) -> None:
+    """Forget every cached account, e.g. after a bulk delete or import."""
+    _drop_all()
+    _on_commit(_drop_all, using)
+
+
+def account_cache_stats() -> Dict[str, int]:
+    stats = get_local_cache().stats()
+    stats["shared_hits"] = _shared_hits
+    return stats
+
+
+def _account_cache_metrics():
+    stats = account_cache_stats()
+    yield "account_cache_hits_total", "counter", "getAccount cache hits, by tier.", [
+        ((("tier", "local"),), stats["hits"]),
+        ((("tier", "shared"),), stats["shared_hits"]),
+    ]
+    yield "account_cache_misses_total", "counter", "getAccount lookups that missed the local tier.", [((), stats["misses"])]
+    yield "account_cache_evictions_total", "counter", "Accounts evicted from the local tier by the size bound.", [
+        ((), stats["evictions"])
+    ]
+    yield "account_cache_size", "gauge", "Accounts currently held in the local tier.", [((), stats["size"])]
+
+
+metrics.registry.register_collector(_account_cache_metrics)
+
+
+# No post_delete receiver: any listener disables Django's fast-delete path and
+# makes QuerySet.delete() load every row, so deletes invalidate explicitly.
+@receiver(post_save, sender=Account, dispatch_uid="account_cache_post_save")
+def _invalidate_instance(sender, instance, using, **kwargs) -> None:
+    invalidate_accounts([instance.email], using=using)
+
+
+@receiver(setting_changed)
+def _reset_cache(setting, **kwargs) -> None:
+    global _local
+    if setting in {"ACCOUNT_CACHE_SIZE", "ACCOUNT_CACHE_TTL", "ACCOUNT_CACHE_BACKEND", "ACCOUNT_CACHE_BACKEND_TTL"}:
+        _local = None
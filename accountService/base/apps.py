@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class BaseConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'base'
+
+    def ready(self):
+        # Connects the Account post_save receiver that invalidates the cache
+        # (deletes invalidate explicitly; see account_cache).
+        from . import account_cache  # noqa: F401
+        # Connects the post_migrate receiver that spaces out shard accountIDs.
+        from . import sharding  # noqa: F401
+        # Registers the system check on the read-your-writes pin cache.
+        from accountService import db_routing  # noqa: F401
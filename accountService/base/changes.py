@@ -0,0 +1,28 @@
+from django.db import DEFAULT_DB_ALIAS, connections, router, transaction
+
+from .models import Account, AccountChange
+
+
+def changes_enabled(using=DEFAULT_DB_ALIAS):
+    """The change-feed triggers are only installed on SQLite."""
+    return connections[using].vendor == "sqlite"
+
+
+def changes_since(since, limit, encode_queryset, using=None):
+    """
+    Up to ``limit`` changes with ``seq > since``, oldest first, as
+    ``(changes, rows, has_more)``. ``rows`` maps accountID to the current
+    row, read through ``encode_queryset``, for every change that is not a
+    tombstone. Both reads share one transaction so they see one snapshot.
+    """
+    using = using or router.db_for_read(AccountChange)
+    with transaction.atomic(using=using):
+        changes = list(AccountChange.objects.using(using).filter(seq__gt=since).order_by("seq")[: limit + 1])
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        live = [change.account_id for change in changes if not change.deleted]
+        rows = {}
+        if live:
+            queryset = encode_queryset(Account.objects.using(using).filter(accountID__in=live))
+            rows = {row.accountID: row for row in queryset}
+    return changes, rows, has_more
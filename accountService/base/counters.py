@@ -0,0 +1,80 @@
+from asgiref.sync import sync_to_async
+from django.db import DEFAULT_DB_ALIAS, connections, router, transaction
+from django.db.models import Count, Sum
+
+from .models import Account, AccountCounter
+from .sharding import afan_out, fan_out, sharding_enabled
+
+
+def counters_enabled(using=DEFAULT_DB_ALIAS):
+    """The counter triggers are only installed on SQLite."""
+    return connections[using].vendor == "sqlite"
+
+
+def _count_queryset(role, is_active, using):
+    model = AccountCounter if counters_enabled(using) else Account
+    queryset = model.objects.using(using)
+    if role is not None:
+        queryset = queryset.filter(role=role)
+    if is_active is not None:
+        queryset = queryset.filter(is_active=is_active)
+    return queryset
+
+
+def count_accounts(role=None, is_active=None, using=None):
+    """
+    Number of accounts, optionally narrowed to a role and/or status. Reads
+    the (at most two) matching AccountCounter rows instead of COUNT(*).
+    Without ``using`` the shards are counted in parallel and summed, or,
+    unsharded, the database the routers pick for reads (the reader during
+    GET requests) is used.
+    """
+    if using is None and sharding_enabled():
+        return sum(fan_out(lambda alias: count_accounts(role, is_active, using=alias)))
+    using = using or router.db_for_read(AccountCounter)
+    queryset = _count_queryset(role, is_active, using)
+    if queryset.model is Account:
+        return queryset.count()
+    return queryset.aggregate(total=Sum("count"))["total"] or 0
+
+
+async def acount_accounts(role=None, is_active=None, using=None):
+    """Async variant of ``count_accounts``."""
+    if using is None and sharding_enabled():
+        return sum(await afan_out(lambda alias: acount_accounts(role, is_active, using=alias)))
+    # One thread hop, as acount()/aaggregate() would take, so the router
+    # (which may read the pin cache) runs outside the event loop too.
+    return await sync_to_async(count_accounts)(role, is_active, using=using)
+
+
+def counter_drift(using=DEFAULT_DB_ALIAS):
+    """
+    Compare stored counters with a fresh GROUP BY over Account.
+    Returns ``{(role, is_active): (stored, actual)}`` for mismatches only.
+    """
+    actual = {
+        (row["role"], row["is_active"]): row["n"]
+        for row in Account.objects.using(using).values("role", "is_active").annotate(n=Count("pk")).order_by()
+    }
+    stored = {
+        (row.role, row.is_active): row.count
+        for row in AccountCounter.objects.using(using).all()
+    }
+    drift = {}
+    for key in actual.keys() | stored.keys():
+        expected, current = actual.get(key, 0), stored.get(key, 0)
+        if expected != current:
+            drift[key] = (current, expected)
+    return drift
+
+
+def rebuild_counters(using=DEFAULT_DB_ALIAS):
+    """Recompute every counter from Account in one transaction; returns the drift fixed."""
+    with transaction.atomic(using=using):
+        drift = counter_drift(using)
+        AccountCounter.objects.using(using).all().delete()
+        AccountCounter.objects.using(using).bulk_create(
+            AccountCounter(role=row["role"], is_active=row["is_active"], count=row["n"])
+            for row in Account.objects.using(using).values("role", "is_active").annotate(n=Count("pk")).order_by()
+        )
+    return drift
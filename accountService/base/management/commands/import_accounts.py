@@ -0,0 +1,215 @@
+import csv
+import gzip
+import io
+import json
+import os
+import time
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from base.account_cache import invalidate_accounts
+from base.models import Account, Role, normalize_role
+from base.sharding import group_by_shard
+
+UPDATE_FIELDS = ["fullname", "role", "is_active", "creator_id", "updated_at"]
+OWNERLESS_UPDATE_FIELDS = [field for field in UPDATE_FIELDS if field != "creator_id"]
+TRUE_VALUES = {"1", "true", "t", "yes", "y"}
+FALSE_VALUES = {"0", "false", "f", "no", "n"}
+MAX_REPORTED_ERRORS = 20
+
+
+def _parse_row(raw):
+    """Validate one input record and return the Account field values."""
+    if not isinstance(raw, dict):
+        raise ValueError("record is not an object")
+
+    email = (raw.get("email") or "").strip()
+    try:
+        validate_email(email)
+    except ValidationError:
+        raise ValueError(f"invalid email '{email}'")
+
+    fullname = (raw.get("fullname") or "").strip()
+    if not fullname or len(fullname) > Account._meta.get_field("fullname").max_length:
+        raise ValueError("fullname is missing or too long")
+
+    role = normalize_role(raw.get("role") or "") or Account._meta.get_field("role").default
+    if role not in Role.values:
+        raise ValueError(f"unknown role '{role}'")
+
+    is_active = raw.get("is_active", True)
+    if isinstance(is_active, str):
+        lowered = is_active.strip().lower()
+        if lowered in TRUE_VALUES or lowered == "":
+            is_active = True
+        elif lowered in FALSE_VALUES:
+            is_active = False
+        else:
+            raise ValueError(f"invalid is_active '{is_active}'")
+    elif not isinstance(is_active, bool):
+        raise ValueError(f"invalid is_active '{is_active}'")
+
+    values = {"email": email, "fullname": fullname, "role": role, "is_active": is_active}
+    # A missing or blank creator_id leaves an existing account's owner alone
+    # (new accounts get none); only a given one is written.
+    creator_id = raw.get("creator_id")
+    if creator_id not in (None, ""):
+        try:
+            values["creator_id"] = int(creator_id)
+        except (TypeError, ValueError):
+            raise ValueError(f"invalid creator_id '{creator_id}'")
+    return values
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream accounts from a CSV or NDJSON file (optionally gzipped) into the Account table, "
+        "upserting on email one chunk per transaction. Progress is checkpointed so an interrupted "
+        "import can be resumed with --resume."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Input file (.csv, .ndjson/.jsonl, optionally .gz).")
+        parser.add_argument("--format", choices=["csv", "ndjson"], help="Input format; inferred from the extension by default.")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Rows validated and committed per transaction.")
+        parser.add_argument("--checkpoint", help="Checkpoint file (default: <path>.checkpoint).")
+        parser.add_argument("--resume", action="store_true", help="Skip the rows recorded in the checkpoint.")
+        parser.add_argument("--database", help="Database alias to write to (default: each row's shard, else default).")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not os.path.exists(path):
+            raise CommandError(f"No such file: {path}")
+        if options["chunk_size"] <= 0:
+            raise CommandError("--chunk-size must be positive.")
+
+        fmt = options["format"] or self._infer_format(path)
+        checkpoint_path = options["checkpoint"] or f"{path}.checkpoint"
+        skip = self._load_checkpoint(checkpoint_path, path) if options["resume"] else 0
+        if skip:
+            self.stdout.write(f"Resuming after {skip} rows.")
+
+        using = options["database"]
+        chunk_size = options["chunk_size"]
+        started = time.perf_counter()
+        consumed = skip
+        written = invalid = 0
+
+        with self._open(path) as handle:
+            records = self._records(handle, fmt)
+            for _ in range(skip):
+                if next(records, None) is None:
+                    break
+
+            chunk = []
+            for line_number, raw in records:
+                chunk.append((line_number, raw))
+                if len(chunk) >= chunk_size:
+                    written_now, invalid_now = self._write_chunk(chunk, using, invalid)
+                    written, invalid, consumed = written + written_now, invalid + invalid_now, consumed + len(chunk)
+                    self._save_checkpoint(checkpoint_path, path, consumed)
+                    self._progress(consumed - skip, written, invalid, started)
+                    chunk = []
+            if chunk:
+                written_now, invalid_now = self._write_chunk(chunk, using, invalid)
+                written, invalid, consumed = written + written_now, invalid + invalid_now, consumed + len(chunk)
+                self._save_checkpoint(checkpoint_path, path, consumed)
+                self._progress(consumed - skip, written, invalid, started)
+
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        self.stdout.write(self.style.SUCCESS(f"Imported {written} accounts ({invalid} invalid rows skipped)."))
+
+    def _write_chunk(self, chunk, using, invalid_so_far):
+        accounts = {}
+        invalid = 0
+        for line_number, raw in chunk:
+            try:
+                values = _parse_row(raw)
+            except ValueError as exc:
+                invalid += 1
+                if invalid_so_far + invalid <= MAX_REPORTED_ERRORS:
+                    self.stderr.write(f"line {line_number}: {exc}")
+                continue
+            # Last occurrence of an email within a chunk wins.
+            accounts[values["email"]] = (Account(**values), "creator_id" in values)
+
+        groups = {using: list(accounts)} if using else group_by_shard(accounts)
+        for alias, emails in groups.items():
+            alias = alias or DEFAULT_DB_ALIAS
+            # Rows without a creator_id are upserted separately so the owner
+            # of an existing account is not overwritten with None.
+            batches = {}
+            for email in emails:
+                account, has_creator = accounts[email]
+                batches.setdefault(has_creator, []).append(account)
+            # One transaction per shard: a chunk is not atomic across shards.
+            with transaction.atomic(using=alias):
+                for has_creator, batch in batches.items():
+                    Account.objects.using(alias).bulk_create(
+                        batch,
+                        update_conflicts=True,
+                        unique_fields=["email"],
+                        update_fields=UPDATE_FIELDS if has_creator else OWNERLESS_UPDATE_FIELDS,
+                    )
+                invalidate_accounts(emails, using=alias)
+        return len(accounts), invalid
+
+    def _progress(self, rows, written, invalid, started):
+        elapsed = time.perf_counter() - started
+        rate = rows / elapsed if elapsed else 0
+        self.stdout.write(f"{rows} rows read, {written} written, {invalid} invalid ({rate:,.0f} rows/s)")
+
+    @staticmethod
+    def _infer_format(path):
+        name = path[:-3] if path.endswith(".gz") else path
+        if name.endswith(".csv"):
+            return "csv"
+        if name.endswith((".ndjson", ".jsonl", ".json")):
+            return "ndjson"
+        raise CommandError("Cannot infer the input format; pass --format.")
+
+    @staticmethod
+    def _open(path):
+        if path.endswith(".gz"):
+            return io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8", newline="")
+        return open(path, encoding="utf-8", newline="")
+
+    @staticmethod
+    def _records(handle, fmt):
+        """Yield (line_number, record) pairs without loading the file."""
+        if fmt == "csv":
+            reader = csv.DictReader(handle)
+            for record in reader:
+                yield reader.line_num, record
+            return
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError:
+                yield line_number, None
+
+    @staticmethod
+    def _identity(path):
+        stat = os.stat(path)
+        return {"path": os.path.abspath(path), "size": stat.st_size}
+
+    def _load_checkpoint(self, checkpoint_path, path):
+        if not os.path.exists(checkpoint_path):
+            return 0
+        with open(checkpoint_path, encoding="utf-8") as handle:
+            checkpoint = json.load(handle)
+        if checkpoint.get("source") != self._identity(path):
+            raise CommandError(f"Checkpoint {checkpoint_path} was written for a different input file.")
+        return int(checkpoint.get("rows", 0))
+
+    def _save_checkpoint(self, checkpoint_path, path, rows):
+        tmp_path = f"{checkpoint_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump({"source": self._identity(path), "rows": rows}, handle)
+        os.replace(tmp_path, checkpoint_path)
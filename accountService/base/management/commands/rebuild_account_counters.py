@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from base.counters import counter_drift, counters_enabled, rebuild_counters
+from base.triggers import missing_triggers
+
+
+class Command(BaseCommand):
+    help = "Rebuild the AccountCounter table from Account, or only report drift with --check."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true", help="Report drift without changing anything; exit 1 if any.")
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS, help="Database alias to use.")
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        if not counters_enabled(using):
+            raise CommandError(f"Account counters are not maintained on database '{using}'.")
+
+        # Without the triggers the counters (and the change feed and search
+        # index) stop following writes, however often they are rebuilt.
+        missing = missing_triggers(using)
+        for name in missing:
+            self.stderr.write(f"missing trigger: {name}")
+
+        drift = counter_drift(using) if options["check"] else rebuild_counters(using)
+        for (role, is_active), (stored, actual) in sorted(drift.items()):
+            self.stdout.write(f"role={role} is_active={is_active}: stored={stored} actual={actual}")
+
+        if options["check"]:
+            if missing:
+                raise CommandError(f"{len(missing)} trigger(s) on base_account are missing (see base/triggers.py).")
+            if drift:
+                raise CommandError(f"{len(drift)} counter(s) drifted.")
+            self.stdout.write(self.style.SUCCESS("Account counters match."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Account counters rebuilt ({len(drift)} corrected)."))
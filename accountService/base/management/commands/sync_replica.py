@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from accountService.db_routing import read_database, sync_replica
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database over the local replica file (ACCOUNT_READ_DATABASE) "
+        "with the online backup API. Run after migrate to create the replica, or with --every "
+        "to keep refreshing it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS, help="Primary alias to copy from.")
+        parser.add_argument("--replica", help="Replica alias to copy to (default: ACCOUNT_READ_DATABASE).")
+        parser.add_argument("--every", type=float, help="Repeat every N seconds until interrupted.")
+
+    def handle(self, *args, **options):
+        replica = options["replica"] or read_database()
+        if replica is None:
+            raise CommandError("No replica configured; set ACCOUNT_READ_DATABASE or pass --replica.")
+
+        while True:
+            started = time.perf_counter()
+            try:
+                sync_replica(options["database"], replica)
+            except ValueError as exc:
+                raise CommandError(str(exc))
+            elapsed = time.perf_counter() - started
+            self.stdout.write(self.style.SUCCESS(f"Replica '{replica}' synced from '{options['database']}' in {elapsed:.2f}s."))
+            if not options["every"]:
+                return
+            time.sleep(options["every"])
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-18 05:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0008_alter_account_role'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(fields=['role', 'is_active'], name='account_role_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(fields=['role', 'created_at', 'accountID'], name='account_role_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(fields=['is_active', 'created_at', 'accountID'], name='account_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(fields=['created_at', 'accountID'], name='account_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(fields=['updated_at', 'accountID'], name='account_updated_idx'),
+        ),
+    ]
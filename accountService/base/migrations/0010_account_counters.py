@@ -0,0 +1,74 @@
+# Generated by Django 5.2.7 on 2026-10-18 05:57
+
+from django.db import migrations, models
+
+# Keep base_accountcounter exact in the same statement/transaction as every
+# write to base_account, including bulk_create/update() and queryset deletes.
+SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER account_counter_insert AFTER INSERT ON base_account
+    BEGIN
+        INSERT INTO base_accountcounter (role, is_active, "count") VALUES (NEW.role, NEW.is_active, 1)
+        ON CONFLICT (role, is_active) DO UPDATE SET "count" = "count" + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER account_counter_delete AFTER DELETE ON base_account
+    BEGIN
+        UPDATE base_accountcounter SET "count" = "count" - 1
+        WHERE role = OLD.role AND is_active = OLD.is_active;
+    END
+    """,
+    """
+    CREATE TRIGGER account_counter_update AFTER UPDATE OF role, is_active ON base_account
+    WHEN OLD.role IS NOT NEW.role OR OLD.is_active IS NOT NEW.is_active
+    BEGIN
+        UPDATE base_accountcounter SET "count" = "count" - 1
+        WHERE role = OLD.role AND is_active = OLD.is_active;
+        INSERT INTO base_accountcounter (role, is_active, "count") VALUES (NEW.role, NEW.is_active, 1)
+        ON CONFLICT (role, is_active) DO UPDATE SET "count" = "count" + 1;
+    END
+    """,
+]
+SQLITE_TRIGGER_NAMES = ["account_counter_insert", "account_counter_delete", "account_counter_update"]
+
+
+def install_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in SQLITE_TRIGGERS:
+        schema_editor.execute(statement)
+    schema_editor.execute(
+        'INSERT INTO base_accountcounter (role, is_active, "count") '
+        "SELECT role, is_active, COUNT(*) FROM base_account GROUP BY role, is_active"
+    )
+
+
+def drop_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for name in SQLITE_TRIGGER_NAMES:
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0009_account_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(max_length=50)),
+                ('is_active', models.BooleanField()),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('role', 'is_active'), name='account_counter_key')],
+            },
+        ),
+        migrations.RunPython(install_triggers, drop_triggers),
+    ]
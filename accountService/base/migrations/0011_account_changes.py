@@ -0,0 +1,75 @@
+# Generated by Django 5.2.7 on 2026-10-18 06:10
+
+from django.db import migrations, models
+
+# One row per account in base_accountchange, replaced (and so renumbered) by
+# every write to base_account in the writing transaction; deletes leave a
+# tombstone. The previous row is deleted explicitly: an outer upsert
+# (INSERT ... ON CONFLICT DO UPDATE) would override INSERT OR REPLACE here.
+SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER account_change_insert AFTER INSERT ON base_account
+    BEGIN
+        DELETE FROM base_accountchange WHERE account_id = NEW.accountID;
+        INSERT INTO base_accountchange (account_id, email, deleted, changed_at)
+        VALUES (NEW.accountID, NEW.email, 0, NEW.updated_at);
+    END
+    """,
+    """
+    CREATE TRIGGER account_change_update AFTER UPDATE ON base_account
+    BEGIN
+        DELETE FROM base_accountchange WHERE account_id = NEW.accountID;
+        INSERT INTO base_accountchange (account_id, email, deleted, changed_at)
+        VALUES (NEW.accountID, NEW.email, 0, NEW.updated_at);
+    END
+    """,
+    """
+    CREATE TRIGGER account_change_delete AFTER DELETE ON base_account
+    BEGIN
+        DELETE FROM base_accountchange WHERE account_id = OLD.accountID;
+        INSERT INTO base_accountchange (account_id, email, deleted, changed_at)
+        VALUES (OLD.accountID, OLD.email, 1, strftime('%Y-%m-%d %H:%M:%f', 'now'));
+    END
+    """,
+]
+SQLITE_TRIGGER_NAMES = ["account_change_insert", "account_change_update", "account_change_delete"]
+
+
+def install_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in SQLITE_TRIGGERS:
+        schema_editor.execute(statement)
+    # Existing accounts enter the feed in (updated_at, accountID) order.
+    schema_editor.execute(
+        "INSERT INTO base_accountchange (account_id, email, deleted, changed_at) "
+        'SELECT "accountID", email, 0, updated_at FROM base_account ORDER BY updated_at, "accountID"'
+    )
+
+
+def drop_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for name in SQLITE_TRIGGER_NAMES:
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0010_account_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountChange',
+            fields=[
+                ('seq', models.AutoField(primary_key=True, serialize=False)),
+                ('account_id', models.IntegerField(unique=True)),
+                ('email', models.EmailField(max_length=254)),
+                ('deleted', models.BooleanField(default=False)),
+                ('changed_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.RunPython(install_triggers, drop_triggers),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.2.7 on 2026-10-18 06:30
+
+from django.db import migrations
+
+# base_account_search is an external-content FTS5 index over base_account
+# (rowid = accountID) with the trigram tokenizer, so any substring of three
+# or more characters of fullname or email can be matched from the index.
+# Only the index lives here; the text is read back from base_account.
+SQLITE_TABLE = """
+    CREATE VIRTUAL TABLE base_account_search USING fts5(
+        fullname, email, content='base_account', content_rowid='accountID', tokenize='trigram'
+    )
+"""
+SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER account_search_insert AFTER INSERT ON base_account
+    BEGIN
+        INSERT INTO base_account_search (rowid, fullname, email) VALUES (NEW."accountID", NEW.fullname, NEW.email);
+    END
+    """,
+    """
+    CREATE TRIGGER account_search_delete AFTER DELETE ON base_account
+    BEGIN
+        INSERT INTO base_account_search (base_account_search, rowid, fullname, email)
+        VALUES ('delete', OLD."accountID", OLD.fullname, OLD.email);
+    END
+    """,
+    """
+    CREATE TRIGGER account_search_update AFTER UPDATE OF fullname, email ON base_account
+    WHEN OLD.fullname IS NOT NEW.fullname OR OLD.email IS NOT NEW.email
+    BEGIN
+        INSERT INTO base_account_search (base_account_search, rowid, fullname, email)
+        VALUES ('delete', OLD."accountID", OLD.fullname, OLD.email);
+        INSERT INTO base_account_search (rowid, fullname, email) VALUES (NEW."accountID", NEW.fullname, NEW.email);
+    END
+    """,
+]
+SQLITE_TRIGGER_NAMES = ["account_search_insert", "account_search_delete", "account_search_update"]
+
+# PostgreSQL: trigram GIN indexes matching the UPPER(...) LIKE that
+# Django emits for icontains.
+POSTGRESQL_STATEMENTS = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX account_fullname_trgm_idx ON base_account USING gin (UPPER(fullname::text) gin_trgm_ops)",
+    "CREATE INDEX account_email_trgm_idx ON base_account USING gin (UPPER(email::text) gin_trgm_ops)",
+]
+
+
+def install_search(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        for statement in POSTGRESQL_STATEMENTS:
+            schema_editor.execute(statement)
+    if vendor != "sqlite":
+        return
+    schema_editor.execute(SQLITE_TABLE)
+    for statement in SQLITE_TRIGGERS:
+        schema_editor.execute(statement)
+    # Index the accounts that already exist.
+    schema_editor.execute("INSERT INTO base_account_search (base_account_search) VALUES ('rebuild')")
+
+
+def drop_search(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS account_fullname_trgm_idx")
+        schema_editor.execute("DROP INDEX IF EXISTS account_email_trgm_idx")
+    if vendor != "sqlite":
+        return
+    for name in SQLITE_TRIGGER_NAMES:
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {name}")
+    schema_editor.execute("DROP TABLE IF EXISTS base_account_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0011_account_changes'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search, drop_search),
+    ]
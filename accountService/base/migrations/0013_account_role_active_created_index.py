@@ -0,0 +1,22 @@
+# Generated by Django 5.2.7 on 2026-10-18 06:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0012_account_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(fields=['role', 'is_active', 'created_at', 'accountID'], name='account_role_act_created_idx'),
+        ),
+        # Its (role, is_active) prefix serves every query the old index did.
+        migrations.RemoveIndex(
+            model_name='account',
+            name='account_role_active_idx',
+        ),
+    ]
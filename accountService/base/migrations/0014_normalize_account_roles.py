@@ -0,0 +1,50 @@
+# Generated by Django 5.2.7 on 2026-10-18 06:54
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Trim, Upper
+from django.utils import timezone
+
+ROLE_CHOICES = [('STUDENT', 'Student'), ('STAFF', 'Staff'), ('ADMIN', 'Admin')]
+
+
+def normalize_roles(apps, schema_editor):
+    # Rows written before RoleField (e.g. the "admin" / "student" fixtures)
+    # get the canonical spelling; updated_at moves so cached ETags and the
+    # change feed pick the rewrite up.
+    Account = apps.get_model('base', 'Account')
+    AccountCounter = apps.get_model('base', 'AccountCounter')
+    alias = schema_editor.connection.alias
+    canonical = Upper(Trim('role'))
+    Account.objects.using(alias).exclude(role=canonical).update(role=canonical, updated_at=timezone.now())
+
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    # The counter triggers moved the counts onto the canonical keys; rebuild
+    # so the emptied lower-case rows go too.
+    AccountCounter.objects.using(alias).all().delete()
+    AccountCounter.objects.using(alias).bulk_create(
+        AccountCounter(role=row['role'], is_active=row['is_active'], count=row['n'])
+        for row in Account.objects.using(alias).values('role', 'is_active').annotate(n=Count('pk')).order_by()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0013_account_role_active_created_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='account',
+            name='role',
+            field=models.CharField(choices=ROLE_CHOICES, default='STUDENT', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='accountcounter',
+            name='role',
+            field=models.CharField(choices=ROLE_CHOICES, max_length=50),
+        ),
+        migrations.RunPython(normalize_roles, migrations.RunPython.noop),
+    ]
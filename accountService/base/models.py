@@ -1,18 +1,110 @@
 from django.db import models
 
-# Create your models here.
+
+class Role(models.TextChoices):
+    STUDENT = "STUDENT"
+    STAFF = "STAFF"
+    ADMIN = "ADMIN"
+
+
+def normalize_role(value):
+    """The canonical (trimmed, upper-case) spelling of a role name."""
+    return value.strip().upper() if isinstance(value, str) else value
+
+
+class RoleField(models.CharField):
+    """
+    A ``Role``, always stored in its canonical spelling.
+
+    Values are normalized when saved (bulk writes and ``update()``
+    included) and when used in a lookup, so ``filter(role="student")`` is
+    an exact, index-backed match on ``STUDENT`` rather than an ``iexact``
+    scan.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("max_length", 50)
+        kwargs.setdefault("choices", Role.choices)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        # Migrations record a plain CharField: on SQLite, altering the field
+        # class rebuilds base_account, which drops the triggers installed by
+        # migrations 0010-0012.
+        name, path, args, kwargs = super().deconstruct()
+        return name, "django.db.models.CharField", args, kwargs
+
+    def get_prep_value(self, value):
+        return super().get_prep_value(normalize_role(value))
+
+    def pre_save(self, model_instance, add):
+        value = normalize_role(getattr(model_instance, self.attname))
+        setattr(model_instance, self.attname, value)
+        return value
+
+
 class Account(models.Model):
     accountID = models.AutoField(primary_key=True)
     creator_id = models.IntegerField(null=True, blank=True) # user ID comes from token
     email = models.EmailField(unique=True)
     # password = models.CharField(max_length=128)
     fullname = models.CharField(max_length=1500)
-    role = models.CharField(max_length=50, default="STUDENT")
+    role = RoleField(default=Role.STUDENT)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)   
 
+    class Meta:
+        # Each index backs a filter + keyset ordering used by api/views.py.
+        indexes = [
+            models.Index(fields=["role", "is_active", "created_at", "accountID"], name="account_role_act_created_idx"),
+            models.Index(fields=["role", "created_at", "accountID"], name="account_role_created_idx"),
+            models.Index(fields=["is_active", "created_at", "accountID"], name="account_active_created_idx"),
+            models.Index(fields=["created_at", "accountID"], name="account_created_idx"),
+            models.Index(fields=["updated_at", "accountID"], name="account_updated_idx"),
+        ]
+
     def __repr__(self):
         return  f"Account(email={self.email}, fullname={self.fullname}, role={self.role}, is_active={self.is_active})"
-    
-    
+
+
+class AccountCounter(models.Model):
+    """
+    Number of accounts per (role, is_active).
+
+    On SQLite the rows are maintained by triggers on ``base_account`` (see
+    migration 0010), so every insert, delete and role / status change,
+    bulk or not, adjusts them inside the writing transaction.
+    """
+    role = RoleField()
+    is_active = models.BooleanField()
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["role", "is_active"], name="account_counter_key"),
+        ]
+
+    def __repr__(self):
+        return f"AccountCounter(role={self.role}, is_active={self.is_active}, count={self.count})"
+
+
+class AccountChange(models.Model):
+    """
+    The latest change to each account, numbered in commit order.
+
+    On SQLite the rows are written by triggers on ``base_account`` (see
+    migration 0011): every insert, update or delete replaces the account's
+    row with a fresh ``seq``, and a delete leaves a tombstone
+    (``deleted=True``). ``seq`` is AUTOINCREMENT and SQLite has a single
+    writer, so a reader that has seen ``seq = n`` will never later find a
+    committed change numbered ``n`` or below.
+    """
+    seq = models.AutoField(primary_key=True)
+    account_id = models.IntegerField(unique=True)
+    email = models.EmailField()
+    deleted = models.BooleanField(default=False)
+    changed_at = models.DateTimeField()
+
+    def __repr__(self):
+        return f"AccountChange(seq={self.seq}, account_id={self.account_id}, deleted={self.deleted})"
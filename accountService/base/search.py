@@ -0,0 +1,103 @@
+"""
+Ranked substring search over account fullname and email.
+
+On SQLite the lookup goes through the trigram FTS5 index kept in sync by
+triggers (migration 0012); prefix matches rank first, then shorter
+names and emails. On PostgreSQL it uses
+the pg_trgm GIN indexes and ranks by trigram word similarity. Any other
+backend falls back to an unranked ``icontains`` scan.
+
+Trigrams cannot match anything shorter than three characters, so shorter
+words in a query are ignored and a query made only of them has no terms.
+"""
+from django.conf import settings
+from django.db import connections, router
+from django.db.models import Q
+
+from .models import Account
+from .sharding import fan_out
+
+MIN_TERM_LENGTH = 3
+
+
+def search_terms(query):
+    """The words of ``query`` long enough to search for."""
+    return [word for word in str(query).split() if len(word) >= MIN_TERM_LENGTH]
+
+
+def _match_expression(terms):
+    # Each word is a quoted FTS5 string; juxtaposed strings must all match.
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+def _search_sqlite(terms, limit, using):
+    candidates = max(getattr(settings, "ACCOUNT_SEARCH_CANDIDATES", 1000), limit)
+    # The index yields matches in accountID order and stops after
+    # ``candidates`` of them; only those are ranked. bm25 is not used: it
+    # reads statistics over every match, which made a query matching most
+    # of the table (say "example") cost seconds at 1M accounts. Instead,
+    # accounts whose name or email starts with the first word come first,
+    # then shorter (closer) matches.
+    sql = (
+        'SELECT a."accountID", '
+        "(instr(lower(a.fullname), %s) = 1 OR instr(lower(a.email), %s) = 1) AS prefix, "
+        "length(a.fullname) + length(a.email) AS size "
+        "FROM (SELECT rowid FROM base_account_search WHERE base_account_search MATCH %s LIMIT %s) AS hit "
+        'JOIN base_account AS a ON a."accountID" = hit.rowid '
+        'ORDER BY prefix DESC, size, a."accountID" LIMIT %s'
+    )
+    first = terms[0].lower()
+    with connections[using].cursor() as cursor:
+        cursor.execute(sql, [first, first, _match_expression(terms), candidates, limit])
+        return [((-prefix, size, account_id), account_id) for account_id, prefix, size in cursor.fetchall()]
+
+
+def _search_postgresql(terms, limit, using):
+    from django.contrib.postgres.search import TrigramWordSimilarity
+    from django.db.models.functions import Greatest
+
+    query = " ".join(terms)
+    queryset = Account.objects.using(using)
+    for term in terms:
+        queryset = queryset.filter(Q(fullname__icontains=term) | Q(email__icontains=term))
+    queryset = queryset.annotate(
+        score=Greatest(TrigramWordSimilarity(query, "fullname"), TrigramWordSimilarity(query, "email"))
+    ).order_by("-score", "accountID")
+    return [((-score, account_id), account_id) for account_id, score in queryset.values_list("accountID", "score")[:limit]]
+
+
+def _search_fallback(terms, limit, using):
+    queryset = Account.objects.using(using)
+    for term in terms:
+        queryset = queryset.filter(Q(fullname__icontains=term) | Q(email__icontains=term))
+    return [((account_id,), account_id) for account_id in queryset.order_by("accountID").values_list("accountID", flat=True)[:limit]]
+
+
+_SEARCHES = {"sqlite": _search_sqlite, "postgresql": _search_postgresql}
+
+
+def search_accounts(query, limit, encode_queryset, using=None):
+    """
+    Up to ``limit`` accounts matching every term of ``query``, best first,
+    as rows read through ``encode_queryset``. Without ``using`` every shard
+    is searched and the results merged by score (scores are tuples that
+    sort best first).
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+
+    def search(alias):
+        alias = using or alias or router.db_for_read(Account)
+        backend = _SEARCHES.get(connections[alias].vendor, _search_fallback)
+        hits = backend(terms, limit, alias)
+        rows = {
+            row.accountID: row
+            for row in encode_queryset(Account.objects.using(alias).filter(accountID__in=[pk for _, pk in hits]))
+        }
+        # An account deleted between the two reads is simply left out.
+        return [(score, rows[pk]) for score, pk in hits if pk in rows]
+
+    hits = search(using) if using else [hit for hits in fan_out(search) for hit in hits]
+    hits.sort(key=lambda hit: hit[0])
+    return [row for _, row in hits[:limit]]
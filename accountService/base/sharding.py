@@ -0,0 +1,207 @@
+"""
+Spread the Account table over ``settings.ACCOUNT_SHARDS`` database aliases.
+
+Each account lives on exactly one shard, chosen by a stable hash of its
+email (``shard_for_email``). The placement depends only on the email and
+the length of the list, so adding a shard moves accounts: export, change
+the list, import.
+
+Single-key code runs inside ``use_shard(alias)`` (or a view decorated with
+``shard_by``). ``ShardRouter`` then sends every ORM query on the ``base``
+models (Account, its counters and change feed) to that alias, including
+the serializer's unique-email check. Code that spans shards calls
+``fan_out`` and merges the per-shard results itself; the queries run in
+parallel on a small thread pool.
+
+Every shard is a complete database with the base migrations, triggers and
+counters (``migrate --database=<alias>`` once per shard). After migrating,
+shard ``i`` hands out accountIDs from ``i * SHARD_ID_SPAN`` so IDs stay
+unique across shards.
+
+With ``ACCOUNT_SHARDS`` empty (the default) none of this applies:
+``use_shard`` and the router are no-ops and ``fan_out`` calls once with
+``None``, which lets the usual routing pick the database.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Optional
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import close_old_connections, connections
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+
+SHARDED_APPS = frozenset({"base"})
+# Width of each shard's accountID range: shard i starts at i * 2**40.
+SHARD_ID_SPAN = 1 << 40
+
+_current_shard: contextvars.ContextVar = contextvars.ContextVar("account_shard", default=None)
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def shard_aliases() -> List[str]:
+    return list(getattr(settings, "ACCOUNT_SHARDS", None) or ())
+
+
+def sharding_enabled() -> bool:
+    return bool(getattr(settings, "ACCOUNT_SHARDS", None))
+
+
+def shard_for_email(email) -> Optional[str]:
+    """The alias that owns ``email``, or None when sharding is off."""
+    aliases = shard_aliases()
+    if not aliases:
+        return None
+    digest = hashlib.blake2b(str(email).encode("utf-8"), digest_size=8).digest()
+    return aliases[int.from_bytes(digest, "big") % len(aliases)]
+
+
+def group_by_shard(emails: Iterable[str]) -> Dict[str, List[str]]:
+    groups: Dict[str, List[str]] = {}
+    for email in emails:
+        groups.setdefault(shard_for_email(email), []).append(email)
+    return groups
+
+
+def current_shard() -> Optional[str]:
+    return _current_shard.get()
+
+
+@contextmanager
+def use_shard(alias: Optional[str]):
+    """Route the base models to ``alias`` for the duration of the block."""
+    token = _current_shard.set(alias)
+    try:
+        yield alias
+    finally:
+        _current_shard.reset(token)
+
+
+def shard_by(get_email: Callable) -> Callable:
+    """
+    View decorator: run the view on the shard that owns
+    ``get_email(request, *args, **kwargs)``. Works on sync and async views.
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                with use_shard(shard_for_email(get_email(request, *args, **kwargs))):
+                    return await view(request, *args, **kwargs)
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            with use_shard(shard_for_email(get_email(request, *args, **kwargs))):
+                return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def shard_querysets(queryset) -> list:
+    """``queryset`` pinned to each shard in turn."""
+    return [queryset.using(alias) for alias in shard_aliases()]
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = getattr(settings, "ACCOUNT_SHARD_WORKERS", None) or max(len(shard_aliases()), 1)
+            _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="account-shard")
+        return _pool
+
+
+def _call(func, item):
+    try:
+        return func(item)
+    finally:
+        # Pool threads never see request_finished; apply CONN_MAX_AGE here.
+        close_old_connections()
+
+
+def parallel_map(func: Callable, items: Iterable) -> list:
+    """``[func(item) for item in items]``, run on the shard pool when there is more than one."""
+    items = list(items)
+    if len(items) <= 1:
+        return [func(item) for item in items]
+    # Each call gets its own copy of the caller's context (metrics, request).
+    futures = [_executor().submit(contextvars.copy_context().run, _call, func, item) for item in items]
+    return [future.result() for future in futures]
+
+
+def fan_out(func: Callable) -> list:
+    """``func(alias)`` for every shard in parallel, or ``[func(None)]`` when unsharded."""
+    return parallel_map(func, shard_aliases() or [None])
+
+
+async def afan_out(func: Callable) -> list:
+    """Async ``fan_out``: awaits ``func(alias)`` for every shard concurrently."""
+    return list(await asyncio.gather(*(func(alias) for alias in shard_aliases() or [None])))
+
+
+class ShardRouter:
+    """Send the base models to the shard selected by ``use_shard``."""
+
+    def _shard(self, model) -> Optional[str]:
+        if model._meta.app_label in SHARDED_APPS:
+            return _current_shard.get()
+        return None
+
+    def db_for_read(self, model, **hints) -> Optional[str]:
+        return self._shard(model)
+
+    def db_for_write(self, model, **hints) -> Optional[str]:
+        alias = self._shard(model)
+        instance = hints.get("instance")
+        if alias is None and instance is not None and instance._state.db is None and sharding_enabled():
+            # A new account saved outside use_shard still lands on its shard.
+            email = getattr(instance, "email", None)
+            if email:
+                return shard_for_email(email)
+        return alias
+
+
+def reserve_id_range(using: str) -> None:
+    """Start the accountID sequence of shard ``using`` at its range."""
+    aliases = shard_aliases()
+    if using not in aliases or connections[using].vendor != "sqlite":
+        return
+    from .models import Account
+
+    floor = aliases.index(using) * SHARD_ID_SPAN
+    table = Account._meta.db_table
+    with connections[using].cursor() as cursor:
+        cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = %s", [table])
+        row = cursor.fetchone()
+        if row is None:
+            cursor.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (%s, %s)", [table, floor])
+        elif row[0] < floor:
+            cursor.execute("UPDATE sqlite_sequence SET seq = %s WHERE name = %s", [floor, table])
+
+
+@receiver(post_migrate, dispatch_uid="account_shard_id_range")
+def _reserve_after_migrate(sender, using, **kwargs) -> None:
+    if sender.label in SHARDED_APPS:
+        reserve_id_range(using)
+
+
+@receiver(setting_changed)
+def _reset_pool(setting, **kwargs) -> None:
+    global _pool
+    if setting in {"ACCOUNT_SHARDS", "ACCOUNT_SHARD_WORKERS"}:
+        with _pool_lock:
+            pool, _pool = _pool, None
+        if pool is not None:
+            # Its threads hold connections to the old aliases.
+            pool.shutdown(wait=True)
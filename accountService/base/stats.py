@@ -0,0 +1,112 @@
+"""
+Account statistics for dashboards: counts by role and status plus a
+histogram of ``created_at``, from one grouped aggregate query.
+
+The query groups by ``(role, is_active, bucket)``, where the bucket is the
+start of the UTC day, ISO week (Monday) or month the account was created
+in. Both facets are folded out of that one result set. It still reads every
+matching row (about 2 s for 1M accounts on SQLite), so results are kept
+for ``ACCOUNT_STATS_CACHE_TTL`` seconds in a small per-process cache, keyed
+by the caller. Writes do not invalidate it; the TTL bounds how stale a
+dashboard can be.
+"""
+import datetime
+import threading
+from typing import Optional
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connections
+from django.db.models import CharField, Count, DateField, F, Func
+from django.db.models.functions import Trunc
+from django.dispatch import receiver
+
+from accountService.caching import LRUCache
+
+from .sharding import fan_out
+
+BUCKETS = ("day", "week", "month")
+
+# SQLite stores datetimes as UTC text; slicing it avoids calling Django's
+# Python trunc function per row, which is about five times slower.
+_SQLITE_BUCKETS = {
+    "day": "substr(%(expressions)s, 1, 10)",
+    "week": "date(%(expressions)s, '-6 days', 'weekday 1')",
+    "month": "substr(%(expressions)s, 1, 7) || '-01'",
+}
+
+_cache: Optional[LRUCache] = None
+_lock = threading.Lock()
+
+
+def _bucket(kind, connection):
+    if connection.vendor == "sqlite":
+        return Func(F("created_at"), template=_SQLITE_BUCKETS[kind], output_field=CharField())
+    return Trunc("created_at", kind, output_field=DateField(), tzinfo=datetime.timezone.utc)
+
+
+def _grouped(queryset, bucket, alias):
+    if alias is not None:
+        queryset = queryset.using(alias)
+    rows = (
+        queryset.order_by()
+        .values_list("role", "is_active", _bucket(bucket, connections[queryset.db]))
+        .annotate(count=Count("pk"))
+    )
+    return [(role, is_active, str(start), count) for role, is_active, start, count in rows]
+
+
+def compute_stats(queryset, bucket):
+    """The stats of the accounts in ``queryset``, summed over every shard."""
+    by_role, histogram = {}, {}
+    total = active = 0
+    for rows in fan_out(lambda alias: _grouped(queryset, bucket, alias)):
+        for role, is_active, start, count in rows:
+            counts = by_role.setdefault(role, {"active": 0, "inactive": 0})
+            counts["active" if is_active else "inactive"] += count
+            histogram[start] = histogram.get(start, 0) + count
+            total += count
+            active += count if is_active else 0
+    return {
+        "total": total,
+        "active": active,
+        "inactive": total - active,
+        "by_role": dict(sorted(by_role.items())),
+        "bucket": bucket,
+        "created": [{"start": start, "count": histogram[start]} for start in sorted(histogram)],
+    }
+
+
+def _get_cache() -> Optional[LRUCache]:
+    global _cache
+    ttl = getattr(settings, "ACCOUNT_STATS_CACHE_TTL", 10)
+    if not ttl:
+        return None
+    with _lock:
+        if _cache is None:
+            _cache = LRUCache(maxsize=128, ttl=ttl)
+        return _cache
+
+
+def account_stats(queryset, bucket, key=None):
+    """
+    ``compute_stats``, read through the short-lived cache when ``key`` (a
+    hashable description of ``queryset``) is given.
+    """
+    cache = _get_cache() if key is not None else None
+    if cache is None:
+        return compute_stats(queryset, bucket)
+    key = (bucket, key)
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_stats(queryset, bucket)
+        cache.set(key, stats)
+    return stats
+
+
+@receiver(setting_changed)
+def _reset_cache(setting, **kwargs) -> None:
+    global _cache
+    if setting in {"ACCOUNT_STATS_CACHE_TTL", "ACCOUNT_SHARDS"}:
+        with _lock:
+            _cache = None
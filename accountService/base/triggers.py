@@ -0,0 +1,28 @@
+"""
+The SQLite triggers on ``base_account`` that keep the derived tables in
+step with it: the counters (migration 0010), the change feed (0011) and
+the search index (0012).
+
+Any migration that makes Django rebuild ``base_account`` on SQLite (most
+``AlterField`` / ``RemoveField`` operations) drops them silently, after
+which counts, the feed and search quietly go stale. ``missing_triggers``
+is how the tests and ``rebuild_account_counters --check`` notice.
+"""
+from django.db import DEFAULT_DB_ALIAS, connections
+
+ACCOUNT_TRIGGERS = {
+    "counters": ("account_counter_insert", "account_counter_delete", "account_counter_update"),
+    "changes": ("account_change_insert", "account_change_update", "account_change_delete"),
+    "search": ("account_search_insert", "account_search_delete", "account_search_update"),
+}
+
+
+def missing_triggers(using=DEFAULT_DB_ALIAS):
+    """Names of the account triggers absent from ``using`` (always none off SQLite)."""
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'base_account'")
+        installed = {name for (name,) in cursor.fetchall()}
+    return sorted(name for names in ACCOUNT_TRIGGERS.values() for name in names if name not in installed)
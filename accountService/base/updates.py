@@ -0,0 +1,172 @@
+from contextlib import contextmanager
+
+from django.core.exceptions import EmptyResultSet
+from django.db import connections, router, transaction
+from django.db.models import sql
+from django.utils import timezone
+
+from .account_cache import invalidate_accounts, invalidate_all
+from .models import Account
+
+
+def supports_update_returning(connection):
+    """UPDATE ... RETURNING: PostgreSQL, and SQLite from 3.35."""
+    if connection.vendor == "postgresql":
+        return True
+    return connection.vendor == "sqlite" and connection.Database.sqlite_version_info >= (3, 35)
+
+
+@contextmanager
+def write_transaction(using=None):
+    """
+    ``transaction.atomic`` for a block that writes. On SQLite the outermost
+    block starts with ``BEGIN IMMEDIATE``, whatever the connection's
+    ``transaction_mode``: the write lock is taken up front, waiting out the
+    busy timeout. A deferred transaction that first holds a read lock would
+    instead get "database is locked" at once whenever another connection
+    is committing, because SQLite refuses the lock upgrade to avoid a
+    deadlock.
+    """
+    using = using or router.db_for_write(Account)
+    connection = connections[using]
+    if connection.vendor != "sqlite" or connection.in_atomic_block:
+        with transaction.atomic(using=using):
+            yield
+        return
+    connection.ensure_connection()  # transaction_mode is set on connect
+    mode = connection.transaction_mode
+    connection.transaction_mode = "IMMEDIATE"
+    try:
+        with transaction.atomic(using=using):
+            # BEGIN has been issued; later transactions use the usual mode.
+            connection.transaction_mode = mode
+            yield
+    finally:
+        connection.transaction_mode = mode
+
+
+def _converters(model, fields, connection):
+    converters = []
+    for name in fields:
+        column = model._meta.get_field(name).get_col(model._meta.db_table)
+        converters.append((column, connection.ops.get_db_converters(column) + column.get_db_converters(connection)))
+    return converters
+
+
+def update_returning(queryset, fields, **values):
+    """
+    ``queryset.update(**values)`` as a single UPDATE that also returns the
+    updated rows, as tuples of ``fields``. Falls back to lock, update and
+    re-select in one transaction where the backend has no RETURNING.
+    """
+    model = queryset.model
+    using = queryset._db or router.db_for_write(model)
+    connection = connections[using]
+    if not supports_update_returning(connection):
+        with transaction.atomic(using=using):
+            pks = list(queryset.using(using).select_for_update().values_list("pk", flat=True))
+            if not pks:
+                return []
+            model._base_manager.using(using).filter(pk__in=pks).update(**values)
+            return list(model._base_manager.using(using).filter(pk__in=pks).values_list(*fields))
+
+    query = queryset.query.chain(sql.UpdateQuery)
+    query.add_update_values(values)
+    query.annotations = {}
+    compiler = query.get_compiler(using)
+    compiler.pre_sql_setup()
+    return _execute_returning(compiler, model, fields, using)
+
+
+def delete_returning(queryset, fields):
+    """
+    ``queryset.delete()`` as a single DELETE that also returns the deleted
+    rows, as tuples of ``fields``. Like ``QuerySet._raw_delete`` it sends no
+    signals and does not cascade; Account has neither. Falls back to lock,
+    re-select and delete in one transaction where the backend has no
+    RETURNING.
+    """
+    model = queryset.model
+    using = queryset._db or router.db_for_write(model)
+    connection = connections[using]
+    if not supports_update_returning(connection):
+        with transaction.atomic(using=using):
+            rows = list(queryset.using(using).select_for_update().values_list("pk", *fields))
+            model._base_manager.using(using).filter(pk__in=[row[0] for row in rows]).delete()
+            return [row[1:] for row in rows]
+
+    query = queryset.query.clone()
+    query.__class__ = sql.DeleteQuery
+    return _execute_returning(query.get_compiler(using), model, fields, using)
+
+
+def _execute_returning(compiler, model, fields, using):
+    connection = connections[using]
+    try:
+        statement, params = compiler.as_sql()
+    except EmptyResultSet:
+        return []
+    returning = ", ".join(connection.ops.quote_name(model._meta.get_field(name).column) for name in fields)
+    converters = _converters(model, fields, connection)
+    with transaction.mark_for_rollback_on_error(using), connection.cursor() as cursor:
+        cursor.execute(f"{statement} RETURNING {returning}", params)
+        rows = cursor.fetchall()
+    for index, row in enumerate(rows):
+        row = list(row)
+        for position, (column, functions) in enumerate(converters):
+            for convert in functions:
+                row[position] = convert(row[position], column, connection)
+        rows[index] = tuple(row)
+    return rows
+
+
+def update_account(email, values, fields, condition=None):
+    """
+    Write ``values`` and a fresh ``updated_at`` to the account with ``email``
+    in a single UPDATE whose WHERE also holds ``condition`` (ownership,
+    If-Match). Only the given columns are written, so concurrent edits to
+    other fields survive. Returns the updated row as a tuple of ``fields``,
+    or None when no account matched.
+    """
+    queryset = Account.objects.filter(email=email)
+    if condition is not None:
+        queryset = queryset.filter(condition)
+    rows = update_returning(queryset, fields, **values, updated_at=timezone.now())
+    if not rows:
+        return None
+    # update() skips post_save, which normally invalidates the cache.
+    invalidate_accounts([email], using=queryset._db or router.db_for_write(Account))
+    return rows[0]
+
+
+def delete_account(email, condition=None):
+    """Delete the account with ``email`` if it matches ``condition``, in one DELETE. Returns whether it did."""
+    queryset = Account.objects.filter(email=email)
+    if condition is not None:
+        queryset = queryset.filter(condition)
+    deleted, _ = queryset.delete()
+    if deleted:
+        invalidate_accounts([email], using=queryset._db or router.db_for_write(Account))
+    return bool(deleted)
+
+
+def set_active(email, is_active, fields):
+    """
+    Set one account's status with a single ``UPDATE ... WHERE email = %s``
+    that touches only ``is_active`` and ``updated_at``. Returns the updated
+    row as a tuple of ``fields``, or None when no account has ``email``.
+    """
+    return update_account(email, {"is_active": is_active}, fields)
+
+
+def bulk_set_active(queryset, is_active):
+    """
+    Set the status of every account in ``queryset`` with one UPDATE. Rows
+    already in that state are excluded by the WHERE clause and left
+    untouched. Returns the number of accounts changed.
+    """
+    queryset = queryset.filter(is_active__in=[not is_active])
+    changed = queryset.update(is_active=is_active, updated_at=timezone.now())
+    if changed:
+        invalidate_all(using=queryset._db or router.db_for_write(Account))
+    return changed
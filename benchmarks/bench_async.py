@@ -0,0 +1,108 @@
+"""
+WSGI vs ASGI throughput for the account read endpoints.
+
+Drives the Django handlers in-process (no network, no server) at several
+concurrency levels:
+
+- ``wsgi``        sync DRF views through the WSGI handler, one thread per client
+- ``asgi-sync``   the same DRF views through the ASGI handler (thread hop per request)
+- ``asgi-async``  the native async views under /api/async/
+
+Usage: python benchmarks/bench_async.py [--accounts 10000] [--concurrency 1 50 500]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import seed_accounts, setup_django
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 50, 500])
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per mode and level.")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+
+    settings.ACCOUNT_ASYNC_MAX_CONCURRENCY = max(args.concurrency)
+    settings.ACCOUNT_ASYNC_QUEUE_TIMEOUT = 60
+    seed_accounts(args.accounts)
+
+    from django.test import AsyncClient, Client
+    from rest_framework_simplejwt.backends import TokenBackend
+
+    backend = TokenBackend(algorithm=settings.SIMPLE_JWT["ALGORITHM"], signing_key=settings.SIMPLE_JWT["SIGNING_KEY"])
+    token = backend.encode({"user_id": 1, "email": "bench@example.com", "username": "bench", "role": "ADMIN"})
+    rng = random.Random(42)
+    emails = [f"user{rng.randrange(args.accounts)}@example.com" for _ in range(args.requests)]
+
+    def urls(prefix):
+        return [f"{prefix}/account/get/{email}/" for email in emails]
+
+    def run_wsgi(concurrency):
+        latencies = []
+
+        def worker(chunk):
+            client = Client(HTTP_AUTHORIZATION=f"bearer {token}")
+            for url in chunk:
+                start = time.perf_counter()
+                response = client.get(url)
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.status_code
+
+        targets = urls("/api")
+        chunks = [targets[i::concurrency] for i in range(concurrency)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            list(pool.map(worker, chunks))
+        return time.perf_counter() - started, latencies
+
+    def run_asgi(prefix, concurrency):
+        async def go():
+            latencies = []
+            queue = list(urls(prefix))
+            client = AsyncClient()
+            headers = {"Authorization": f"bearer {token}"}
+
+            async def worker():
+                while queue:
+                    url = queue.pop()
+                    start = time.perf_counter()
+                    response = await client.get(url, headers=headers)
+                    latencies.append(time.perf_counter() - start)
+                    assert response.status_code == 200, response.status_code
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            return time.perf_counter() - started, latencies
+
+        return asyncio.run(go())
+
+    modes = {
+        "wsgi": run_wsgi,
+        "asgi-sync": lambda c: run_asgi("/api", c),
+        "asgi-async": lambda c: run_asgi("/api/async", c),
+    }
+    print(f"{'mode':<11} {'clients':>7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for concurrency in args.concurrency:
+        for name, run in modes.items():
+            elapsed, latencies = run(concurrency)
+            print(
+                f"{name:<11} {concurrency:>7} {len(latencies) / elapsed:>9,.0f}"
+                f" {statistics.median(latencies) * 1000:>8.1f} {percentile(latencies, 99) * 1000:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+"""
+Throughput, latency and query counts for every route in ``api/urls.py``.
+
+The table is seeded to each ``--sizes`` step in turn (10k, then topped up
+to 100k, then to 1M) on one scratch database. At each size, every route is
+driven in-process through the WSGI handler with JWT-authenticated clients,
+one thread per client, at each ``--concurrency`` level. The /api/async/
+routes run there too, through async_to_sync; bench_async.py compares
+handlers. Reads come first.
+Writes work on their own rows where they need them: fresh emails for
+create, and a separately seeded pool for delete. Before timing, one
+request per route runs on its own, and the SQL it issues on every alias is
+counted.
+
+Results go to ``--save FILE`` as JSON. ``--compare FILE`` checks this
+run against a saved baseline and exits 1 if any route's req/s fell, or its
+p95 rose, by more than ``--threshold``. Use ``--results FILE`` to compare
+a saved run without running again. Baselines are only comparable on the
+same machine, settings and options.
+
+Usage: python benchmarks/bench_endpoints.py [--sizes 10000 100000 1000000]
+       [--concurrency 1 8] [--requests 200] [--routes 'account/count*']
+       [--settings accountService.settings_production]
+       [--save baseline.json] [--compare baseline.json] [--threshold 0.15]
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import random
+import sys
+import threading
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+
+from common import seed_accounts, setup_django
+
+# Heavier routes get requests // weight requests, at least one.
+HEAVY = {"account/export/": 20}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class Context:
+    """Tokens, emails and request bodies shared by the route drivers."""
+
+    def __init__(self, size, requests, settings):
+        from rest_framework_simplejwt.backends import TokenBackend
+
+        self.size = size
+        self.requests = requests
+        self.rng = random.Random(size)
+        backend = TokenBackend(algorithm=settings.SIMPLE_JWT["ALGORITHM"], signing_key=settings.SIMPLE_JWT["SIGNING_KEY"])
+        self.encode = backend.encode
+        self.admin = self.token("ADMIN", 1, "bench-admin@example.com")
+        self.created_after = None
+        self.lock = threading.Lock()
+        self.counters = {}
+
+    def token(self, role, user_id, email):
+        return self.encode({"user_id": user_id, "email": email, "username": email.split("@")[0], "role": role})
+
+    def email(self):
+        return f"user{self.rng.randrange(self.size)}@example.com"
+
+    def next(self, name):
+        # Unique sequence per route, safe across client threads.
+        with self.lock:
+            value = self.counters.get(name, 0)
+            self.counters[name] = value + 1
+        return value
+
+
+def _read(path):
+    return lambda ctx: ("get", path(ctx) if callable(path) else path, None, ctx.admin)
+
+
+def _create(ctx):
+    n = ctx.next("create")
+    email = f"bench-create-{ctx.size}-{n}@example.com"
+    return "post", "/api/account/create/", {"email": email, "fullname": f"Created {n}"}, ctx.token("STUDENT", 10_000_000 + n, email)
+
+
+def _batch_emails(ctx, kind, count=10):
+    n = ctx.next(kind)
+    return [f"bench-{kind}-{ctx.size}-{n}-{k}@example.com" for k in range(count)]
+
+
+# route pattern -> driver(ctx) returning (method, path, json body, token)
+ROUTES = {
+    "account/": _read("/api/account/"),
+    "account/get/<str:email>/": _read(lambda ctx: f"/api/account/get/{ctx.email()}/"),
+    "account/list/": _read("/api/account/list/?role=STUDENT&active=true&fields=email,role"),
+    "account/export/": _read(lambda ctx: f"/api/account/export/?created_after={ctx.created_after}"),
+    "account/changes/": _read("/api/account/changes/?since=0"),
+    "account/stats/": _read(lambda ctx: "/api/account/stats/?bucket=" + ctx.rng.choice(["day", "week", "month"])),
+    # Selective and table-wide type-ahead queries alike.
+    "account/search/": _read(lambda ctx: "/api/account/search/?q=" + ctx.rng.choice(
+        [f"user{ctx.rng.randrange(ctx.size)}", "example", f"Bench+User+{ctx.rng.randrange(ctx.size)}"]
+    )),
+    "account/count/": _read("/api/account/count/"),
+    "account/count_by_role/<str:role>/": _read("/api/account/count_by_role/STUDENT/"),
+    "account/created_after/<str:date_str>/": _read(lambda ctx: f"/api/account/created_after/{ctx.created_after}/"),
+    "account/role/<str:role>/": _read("/api/account/role/STUDENT/"),
+    "account/updated_before/<str:date_str>/": _read("/api/account/updated_before/2100-01-01T00:00:00Z/"),
+    "account/active/": _read("/api/account/active/"),
+    "account/inactive/": _read("/api/account/inactive/"),
+    "health/": _read("/api/health/"),
+    "welcome/": _read("/api/welcome/"),
+    "metrics/": _read("/api/metrics/"),
+    "": _read("/api/"),
+    "account/create/": _create,
+    "account/update/": lambda ctx: ("put", "/api/account/update/", {"email": ctx.email(), "fullname": f"Renamed {ctx.rng.random()}"}, ctx.admin),
+    "account/activate/": lambda ctx: ("put", "/api/account/activate/", {"email": ctx.email()}, ctx.admin),
+    "account/deactivate/": lambda ctx: ("put", "/api/account/deactivate/", {"email": ctx.email()}, ctx.admin),
+    "account/bulk/activate/": lambda ctx: ("put", "/api/account/bulk/activate/", {"emails": [ctx.email() for _ in range(100)]}, ctx.admin),
+    "account/bulk/deactivate/": lambda ctx: ("put", "/api/account/bulk/deactivate/", {"emails": [ctx.email() for _ in range(100)]}, ctx.admin),
+    "account/batch/create/": lambda ctx: (
+        "post", "/api/account/batch/create/",
+        [{"email": email, "fullname": "Batch", "role": "STUDENT"} for email in _batch_emails(ctx, "batch")], ctx.admin,
+    ),
+    "account/batch/update/": lambda ctx: (
+        "put", "/api/account/batch/update/", [{"email": ctx.email(), "fullname": "Batch renamed"} for _ in range(10)], ctx.admin,
+    ),
+    "account/delete/": lambda ctx: ("delete", "/api/account/delete/", {"email": _pool_email(ctx)}, ctx.admin),
+    "account/batch/delete/": lambda ctx: ("delete", "/api/account/batch/delete/", [_pool_email(ctx) for _ in range(10)], ctx.admin),
+}
+
+
+def _driver(route):
+    # The async variants take the same requests under /api/async/.
+    if route.startswith("async/") and route[len("async/"):] in ROUTES:
+        sync = ROUTES[route[len("async/"):]]
+
+        def driver(ctx):
+            method, path, body, token = sync(ctx)
+            return method, path.replace("/api/", "/api/async/", 1), body, token
+        return driver
+    return ROUTES.get(route)
+
+
+def _pool_email(ctx):
+    return f"bench-delete-{ctx.size}-{ctx.next('delete')}@example.com"
+
+
+def _seed_delete_pool(ctx, count):
+    from base.models import Account
+    from base.sharding import group_by_shard
+
+    emails = [f"bench-delete-{ctx.size}-{n}@example.com" for n in range(count)]
+    for alias, group in group_by_shard(emails).items():
+        Account.objects.using(alias).bulk_create(
+            Account(email=email, fullname="To delete", role="STUDENT", creator_id=1) for email in group
+        )
+
+
+def _api_routes():
+    from api.urls import urlpatterns
+
+    return [str(pattern.pattern) for pattern in urlpatterns]
+
+
+def _send(client, method, path, body, token):
+    kwargs = {"HTTP_AUTHORIZATION": f"bearer {token}"}
+    if body is not None:
+        kwargs.update(data=json.dumps(body), content_type="application/json")
+    return getattr(client, method)(path, **kwargs)
+
+
+class QueryCounter:
+    """
+    execute_wrapper on every connection in every thread, so the count
+    includes the queries sharded views run on their pool threads.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        with self._lock:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+    def install(self):
+        from django.db import connections
+        from django.db.backends.signals import connection_created
+
+        def attach(connection, **kwargs):
+            if self not in connection.execute_wrappers:
+                connection.execute_wrappers.append(self)
+
+        connection_created.connect(attach, weak=False)
+        for alias in connections:
+            attach(connections[alias])
+        return self
+
+
+def _count_queries(route, ctx, counter):
+    from django.test import Client
+
+    before = counter.count
+    response = _send(Client(raise_request_exception=False), *_driver(route)(ctx))
+    # Streaming responses query as they are consumed.
+    if getattr(response, "streaming", False):
+        b"".join(response.streaming_content)
+    return counter.count - before, response.status_code
+
+
+def _drive(route, ctx, concurrency, requests):
+    from django.db import connections
+    from django.test import Client
+
+    latencies, errors = [], []
+    budget = iter(range(requests))
+    budget_lock = threading.Lock()
+
+    def worker():
+        client = Client(raise_request_exception=False)
+        while True:
+            with budget_lock:
+                if next(budget, None) is None:
+                    break
+            method, path, body, token = _driver(route)(ctx)
+            start = time.perf_counter()
+            response = _send(client, method, path, body, token)
+            if getattr(response, "streaming", False):
+                b"".join(response.streaming_content)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+        connections.close_all()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "error_statuses": sorted(set(errors)),
+    }
+
+
+def run(args):
+    setup_django(settings_module=args.settings)
+    from django.conf import settings
+    from django.db import connection
+
+    counter = QueryCounter().install()
+    routes = _api_routes()
+    missing = [route for route in routes if _driver(route) is None]
+    if missing:
+        sys.exit(f"No driver for routes: {', '.join(missing)}")
+    if args.routes:
+        routes = [route for route in routes if any(fnmatch.fnmatchcase(route, glob) for glob in args.routes)]
+    # Reads first, then writes, deletes last.
+    order = {"get": 0, "put": 1, "post": 1, "delete": 2}
+
+    report = {
+        "meta": {
+            "settings": args.settings,
+            "sizes": args.sizes,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "python": platform.python_version(),
+            "sqlite": connection.Database.sqlite_version if connection.vendor == "sqlite" else None,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "started": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "results": [],
+    }
+    seeded = 0
+    print(f"{'size':>8} {'route':<52} {'clients':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>7} {'errors':>6}")
+    for size in sorted(args.sizes):
+        ctx = Context(size, args.requests, settings)
+        tail = min(1000, size - seeded)
+        seed_accounts(size - seeded - tail, start=seeded)
+        # Enough for the query-count request plus every timed delete.
+        _seed_delete_pool(ctx, (1 + 10 + 1) * (1 + args.requests) * len(args.concurrency))
+        # Export and created_after see only the last 1000 seeded rows, so
+        # their cost does not grow with the table.
+        ctx.created_after = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+        seed_accounts(tail, start=size - tail)
+        seeded = size
+
+        ctx_method = {route: _driver(route)(ctx)[0] for route in routes}
+        ctx.counters.clear()
+        for route in sorted(routes, key=lambda route: order[ctx_method[route]]):
+            requests = max(1, args.requests // HEAVY.get(route, 1))
+            # Keep the views' debug prints out of the report.
+            with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                queries, status = _count_queries(route, ctx, counter)
+            for concurrency in args.concurrency:
+                with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                    row = _drive(route, ctx, concurrency, requests)
+                row.update(size=size, route=route, method=ctx_method[route].upper(), concurrency=concurrency, queries=queries, status=status)
+                report["results"].append(row)
+                print(
+                    f"{size:>8} {row['method'] + ' ' + (route or '/'):<52} {concurrency:>7} {row['rps']:>9,.0f}"
+                    f" {row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f} {queries:>7} {row['errors']:>6}",
+                    flush=True,
+                )
+    return report
+
+
+def _key(row):
+    return row["size"], row["method"], row["route"], row["concurrency"]
+
+
+def compare(current, baseline, threshold):
+    """Print the changes against ``baseline``; return the regressed rows."""
+    base = {_key(row): row for row in baseline["results"]}
+    regressions = []
+    print(f"\n{'size':>8} {'route':<52} {'clients':>7} {'req/s':>15} {'p95 ms':>17} {'queries':>9}")
+    for row in current["results"]:
+        old = base.get(_key(row))
+        if old is None:
+            continue
+        rps_change = row["rps"] / old["rps"] - 1 if old["rps"] else 0.0
+        p95_change = row["p95_ms"] / old["p95_ms"] - 1 if old["p95_ms"] else 0.0
+        regressed = rps_change < -threshold or p95_change > threshold or row["queries"] > old["queries"]
+        if regressed:
+            regressions.append(row)
+        print(
+            f"{row['size']:>8} {row['method'] + ' ' + (row['route'] or '/'):<52} {row['concurrency']:>7}"
+            f" {row['rps']:>8,.0f} {rps_change:>+6.0%} {row['p95_ms']:>9.2f} {p95_change:>+6.0%}"
+            f" {old['queries']:>3}->{row['queries']:<3}{'  REGRESSION' if regressed else ''}"
+        )
+    missing = set(base) - {_key(row) for row in current["results"]}
+    if missing:
+        print(f"{len(missing)} baseline rows were not measured in this run.")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--requests", type=int, default=200, help="Requests per route, size and level.")
+    parser.add_argument("--routes", nargs="+", help="Only routes matching one of these globs, e.g. 'account/count*'.")
+    parser.add_argument("--settings", default="accountService.settings", help="Settings module to benchmark.")
+    parser.add_argument("--save", help="Write the results to this JSON file.")
+    parser.add_argument("--compare", help="Baseline JSON to compare against.")
+    parser.add_argument("--results", help="Compare this saved run instead of running.")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed relative slowdown (0.15 = 15%%).")
+    args = parser.parse_args()
+
+    if args.results:
+        with open(args.results, encoding="utf-8") as handle:
+            current = json.load(handle)
+    else:
+        current = run(args)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as handle:
+            json.dump(current, handle, indent=2)
+            handle.write("\n")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regressions beyond {args.threshold:.0%}.")
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Per-request cost of each settings profile's middleware stack.
+
+For every profile a fresh interpreter times ``--requests`` WSGI requests
+through each prefix of ``MIDDLEWARE`` (none, the first, the first two,
+...) wrapped around a view that returns a prebuilt JSON response, so the
+difference between consecutive rows is what that middleware adds to every
+request, free of view and database noise. A last row times the real
+``GET /api/account/get/<email>/`` (authenticated, account cached) through
+the whole stack for scale. Each figure is the best of five rounds.
+
+Usage: python benchmarks/bench_middleware.py [--settings accountService.settings ...] [--requests 5000]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from common import seed_accounts, setup_django
+
+PROFILES = ["accountService.settings", "accountService.settings_production", "accountService.settings_api"]
+EMAIL = "user0@example.com"
+
+
+def _best_of(rounds, requests, call):
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(requests):
+            call()
+        best = min(best, (time.perf_counter() - started) / requests * 1e6)
+    return best
+
+
+def _environ(token):
+    from wsgiref.util import setup_testing_defaults
+
+    environ = {"PATH_INFO": f"/api/account/get/{EMAIL}/", "HTTP_AUTHORIZATION": f"bearer {token}"}
+    setup_testing_defaults(environ)
+    return environ
+
+
+def _chain(middleware):
+    # The same nesting BaseHandler.load_middleware builds, around a view
+    # that does no work.
+    from django.http import HttpResponse
+    from django.utils.module_loading import import_string
+
+    def view(request):
+        return HttpResponse(b"{}", content_type="application/json")
+
+    handler = view
+    for path in reversed(middleware):
+        handler = import_string(path)(handler)
+    return handler
+
+
+def child(profile, db_path, requests):
+    setup_django(db_path, profile, migrate=False)
+    from django.conf import settings
+    from django.core.handlers.wsgi import WSGIHandler, WSGIRequest
+    from rest_framework_simplejwt.backends import TokenBackend
+
+    requests = int(requests)
+    backend = TokenBackend(settings.SIMPLE_JWT["ALGORITHM"], settings.SIMPLE_JWT["SIGNING_KEY"])
+    environ = _environ(backend.encode({"user_id": 1, "email": EMAIL, "username": "bench", "role": "ADMIN"}))
+    stack = list(settings.MIDDLEWARE)
+
+    rows = []
+    for k in range(len(stack) + 1):
+        handler = _chain(stack[:k])
+        rows.append({
+            "middleware": stack[k - 1] if k else "(none)",
+            "us": _best_of(5, requests // 5, lambda: handler(WSGIRequest(dict(environ)))),
+        })
+
+    application, statuses = WSGIHandler(), []
+
+    def request():
+        b"".join(application(dict(environ), lambda status, headers, exc_info=None: statuses.append(status)))
+
+    request()  # warm the URL resolver and the account cache
+    if not statuses[0].startswith("200"):
+        sys.exit(f"{profile}: answered {statuses[0]}")
+    rows.append({"middleware": "full request", "us": _best_of(5, requests // 5, request)})
+    print(json.dumps(rows))
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        return child(*sys.argv[2:5])
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--settings", nargs="+", default=PROFILES)
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per measurement.")
+    args = parser.parse_args()
+
+    db_path = setup_django()
+    seed_accounts(1)
+
+    totals = {}
+    for profile in args.settings:
+        command = [sys.executable, __file__, "--child", profile, db_path, str(args.requests)]
+        result = subprocess.run(command, capture_output=True, text=True, cwd=os.path.dirname(__file__))
+        if result.returncode:
+            sys.exit(result.stderr or result.stdout)
+        rows = json.loads(result.stdout.strip().splitlines()[-1])
+        print(f"\n{profile}")
+        print(f"  {'middleware':<58} {'us/req':>8} {'added':>8}")
+        chain, full = rows[:-1], rows[-1]
+        for previous, row in zip([None, *chain], chain):
+            added = "" if previous is None else f"{row['us'] - previous['us']:>+8.1f}"
+            print(f"  {row['middleware']:<58} {row['us']:>8.1f} {added:>8}")
+        print(f"  {full['middleware']:<58} {full['us']:>8.1f}")
+        totals[profile] = (chain[-1]["us"] - chain[0]["us"], full["us"])
+
+    print(f"\n{'profile':<38} {'middleware us':>14} {'request us':>11}")
+    for profile, (middleware, full) in totals.items():
+        print(f"{profile:<38} {middleware:>14.1f} {full:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Rows/sec of the list-endpoint serialization paths.
+
+Compares ``AccountSerializer(many=True)`` over model instances with the
+``AccountRowEncoder`` fast path over ``values_list`` rows, including the
+query and the JSON render, and checks the rendered bytes are identical.
+
+Usage: python benchmarks/bench_serialization.py [--sizes 10000 100000]
+"""
+import argparse
+
+from common import Timer, seed_accounts, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from rest_framework.renderers import JSONRenderer
+
+    from api.serializers import AccountRowEncoder, AccountSerializer
+    from base.models import Account
+
+    renderer = JSONRenderer()
+    encoder = AccountRowEncoder()
+
+    def model_serializer():
+        return renderer.render(AccountSerializer(Account.objects.order_by("accountID"), many=True).data)
+
+    def fast_path():
+        return renderer.render(encoder.encode_many(encoder.queryset(Account.objects.order_by("accountID"))))
+
+    print(f"{'rows':>8}  {'path':<16} {'best s':>8} {'rows/s':>10}")
+    seeded = 0
+    for size in sorted(args.sizes):
+        seed_accounts(size - seeded, start=seeded)
+        seeded = size
+
+        results = {}
+        for name, func in (("ModelSerializer", model_serializer), ("RowEncoder", fast_path)):
+            best = None
+            for _ in range(args.repeat):
+                with Timer() as timer:
+                    body = func()
+                best = timer.elapsed if best is None else min(best, timer.elapsed)
+            results[name] = body
+            print(f"{size:>8}  {name:<16} {best:>8.3f} {size / best:>10,.0f}")
+        assert results["ModelSerializer"] == results["RowEncoder"], "rendered output differs"
+    print("rendered JSON is byte-identical for both paths")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Mixed reader/writer load against SQLite under two settings profiles.
+
+- ``default``     ``accountService.settings`` (rollback journal, a new
+  connection per request, all queries on ``default``)
+- ``production``  ``accountService.settings_production`` (WAL, pragmas,
+  persistent connections, GET reads on the ``query_only`` reader)
+
+Each profile runs against a fresh scratch database. Every client is its
+own process, as with a pre-forked WSGI server, so SQLite locking rather
+than the GIL decides the outcome. Readers GET single accounts and list
+pages; writers PUT ``/api/account/update/``. The getAccount cache is disabled so every read
+reaches SQLite. Reports completed requests per second, p50/p99 latency
+and failed requests (HTTP 5xx, e.g. "database is locked") for each side.
+
+Usage: python benchmarks/bench_sqlite_concurrency.py [--accounts 20000] [--readers 16] [--writers 4] [--seconds 10]
+"""
+import argparse
+import json
+import multiprocessing
+import random
+import subprocess
+import sys
+import time
+
+from common import seed_accounts, setup_django
+
+PROFILES = {
+    "default": "accountService.settings",
+    "production": "accountService.settings_production",
+}
+
+
+def percentile(samples, pct):
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run_profile(args):
+    setup_django(settings_module=PROFILES[args.profile])
+    from django.conf import settings
+    from django.db import connections
+
+    settings.ACCOUNT_CACHE_SIZE = 0
+    seed_accounts(args.accounts)
+
+    from django.test import Client
+    from rest_framework_simplejwt.backends import TokenBackend
+
+    backend = TokenBackend(algorithm=settings.SIMPLE_JWT["ALGORITHM"], signing_key=settings.SIMPLE_JWT["SIGNING_KEY"])
+    token = backend.encode({"user_id": 1, "email": "bench@example.com", "username": "bench", "role": "ADMIN"})
+    connections.close_all()  # children open their own connections
+    stop = time.time() + args.seconds
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+
+    def worker(kind, seed):
+        rng = random.Random(seed)
+        client = Client(HTTP_AUTHORIZATION=f"bearer {token}", raise_request_exception=False)
+        latencies, failures = [], 0
+        while time.time() < stop:
+            email = f"user{rng.randrange(args.accounts)}@example.com"
+            start = time.perf_counter()
+            if kind == "write":
+                response = client.put(
+                    "/api/account/update/",
+                    {"email": email, "fullname": f"Renamed {rng.random()}"},
+                    content_type="application/json",
+                )
+            elif rng.random() < 0.8:
+                response = client.get(f"/api/account/get/{email}/")
+            else:
+                response = client.get("/api/account/role/STUDENT/?page_size=50")
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 500:
+                failures += 1
+        queue.put((kind, latencies, failures))
+
+    processes = [context.Process(target=worker, args=("read", i)) for i in range(args.readers)]
+    processes += [context.Process(target=worker, args=("write", 1000 + i)) for i in range(args.writers)]
+    for process in processes:
+        process.start()
+    results = {"read": ([], [0]), "write": ([], [0])}
+    for _ in processes:
+        kind, latencies, failures = queue.get()
+        results[kind][0].extend(latencies)
+        results[kind][1][0] += failures
+    for process in processes:
+        process.join()
+
+    report = {}
+    for kind, (latencies, failures) in results.items():
+        report[kind] = {
+            "rps": len(latencies) / args.seconds,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "failed": failures[0],
+        }
+    print(json.dumps(report))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=20_000)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--profile", choices=sorted(PROFILES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.profile:
+        run_profile(args)
+        return
+
+    print(f"{args.readers} readers, {args.writers} writers, {args.seconds:g}s, {args.accounts} accounts")
+    print(f"{'profile':<11} {'side':<6} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>9} {'failed':>7}")
+    for profile in PROFILES:
+        command = [sys.executable, __file__, "--profile", profile] + [
+            f"--{name}={getattr(args, name)}" for name in ("accounts", "readers", "writers", "seconds")
+        ]
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        report = json.loads(output.strip().splitlines()[-1])
+        for side in ("read", "write"):
+            row = report[side]
+            print(
+                f"{profile:<11} {side:<6} {row['rps']:>8.0f} {row['p50_ms']:>8.2f} {row['p99_ms']:>9.2f} {row['failed']:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Worker cold start per settings profile.
+
+Every run is a fresh interpreter that configures Django, builds the WSGI
+application and serves one authenticated ``GET /api/account/get/<email>/``,
+the way a newly scaled-up worker meets its first request. Reported per
+profile (medians over ``--runs``):
+
+- ``boot ms``   process start until the WSGI application exists
+- ``first ms``  the first request (URLconf, views and DRF load lazily here)
+- ``wall ms``   the whole process, interpreter start-up and exit included
+- ``modules``   entries in ``sys.modules`` after the first request
+
+``--importtime N`` adds one run per profile under ``python -X importtime``
+and lists the N slowest top-level imports (cumulative).
+
+Usage: python benchmarks/bench_startup.py [--settings accountService.settings ...] [--runs 7] [--importtime 15]
+"""
+import argparse
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from common import PROJECT_DIR, seed_accounts, setup_django
+
+PROFILES = ["accountService.settings", "accountService.settings_production", "accountService.settings_api"]
+EMAIL = "user0@example.com"
+
+
+def child(profile, db_path, token):
+    started = time.perf_counter()
+    setup_django(db_path, profile, migrate=False)
+    from django.core.wsgi import get_wsgi_application
+
+    application = get_wsgi_application()
+    booted = time.perf_counter()
+
+    from wsgiref.util import setup_testing_defaults
+
+    environ = {"PATH_INFO": f"/api/account/get/{EMAIL}/", "HTTP_AUTHORIZATION": f"bearer {token}"}
+    setup_testing_defaults(environ)
+    statuses = []
+    body = b"".join(application(environ, lambda status, headers, exc_info=None: statuses.append(status)))
+    finished = time.perf_counter()
+    if not statuses[0].startswith("200"):
+        sys.exit(f"{profile}: first request answered {statuses[0]}: {body[:200]!r}")
+    print(json.dumps({
+        "boot": (booted - started) * 1000,
+        "first": (finished - booted) * 1000,
+        "modules": len(sys.modules),
+    }))
+
+
+def _token(profile):
+    import jwt
+
+    if str(PROJECT_DIR) not in sys.path:
+        sys.path.insert(0, str(PROJECT_DIR))
+    settings = importlib.import_module(profile)
+    payload = {"user_id": 1, "email": EMAIL, "username": "bench", "role": "ADMIN"}
+    return jwt.encode(payload, settings.SIMPLE_JWT["SIGNING_KEY"], algorithm=settings.SIMPLE_JWT["ALGORITHM"])
+
+
+def _run(profile, db_path, flags=()):
+    command = [sys.executable, *flags, __file__, "--child", profile, db_path, _token(profile)]
+    started = time.perf_counter()
+    result = subprocess.run(command, capture_output=True, text=True, cwd=os.path.dirname(__file__))
+    wall = (time.perf_counter() - started) * 1000
+    if result.returncode:
+        sys.exit(result.stderr or result.stdout)
+    lines = result.stdout.strip().splitlines()
+    return dict(json.loads(lines[-1]), wall=wall), result.stderr
+
+
+def _slowest_imports(stderr, count):
+    # "import time: self [us] | cumulative | imported package", nested
+    # imports indented two spaces per level under their importer.
+    top = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if (len(name) - len(name.lstrip(" ")) - 1) // 2 > 0:
+            continue
+        top.append((int(cumulative), name.strip()))
+    total = sum(us for us, _ in top)
+    return total, sorted(top, reverse=True)[:count]
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        return child(*sys.argv[2:5])
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--settings", nargs="+", default=PROFILES)
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--importtime", type=int, default=0, metavar="N", help="List the N slowest imports per profile.")
+    args = parser.parse_args()
+
+    db_path = setup_django()
+    seed_accounts(1)
+
+    print(f"{'profile':<38} {'boot ms':>9} {'first ms':>9} {'wall ms':>9} {'modules':>8}")
+    for profile in args.settings:
+        runs = [_run(profile, db_path)[0] for _ in range(args.runs)]
+        median = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+        print(f"{profile:<38} {median['boot']:>9.1f} {median['first']:>9.1f} {median['wall']:>9.1f} {median['modules']:>8.0f}")
+
+    for profile in args.settings if args.importtime else ():
+        total, slowest = _slowest_imports(_run(profile, db_path, ["-X", "importtime"])[1], args.importtime)
+        print(f"\n{profile}: {total / 1000:.1f} ms in top-level imports")
+        for microseconds, name in slowest:
+            print(f"  {microseconds / 1000:>8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
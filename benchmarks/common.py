@@ -0,0 +1,82 @@
+"""
+Shared setup for the standalone benchmark scripts.
+
+Benchmarks never touch ``accountService/db.sqlite3``: ``setup_django`` points
+the default database at a scratch file and migrates it.
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PROJECT_DIR = ROOT / "accountService"
+
+
+def setup_django(db_path=None, settings_module="accountService.settings", migrate=True):
+    """
+    Configure Django against a scratch SQLite file and return its path.
+    Pass ``migrate=False`` to reuse a file an earlier call migrated.
+    """
+    if str(PROJECT_DIR) not in sys.path:
+        sys.path.insert(0, str(PROJECT_DIR))
+    os.environ["DJANGO_SETTINGS_MODULE"] = settings_module
+
+    import django
+    from django.conf import settings
+
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix="account-bench-"), "bench.sqlite3")
+    original = settings.DATABASES["default"]["NAME"]
+    for database in settings.DATABASES.values():
+        # Aliases on the same file (e.g. the production reader) follow it.
+        if database.get("NAME") == original:
+            database["NAME"] = db_path
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ["*"]
+    django.setup()
+
+    for alias in getattr(settings, "ACCOUNT_SHARDS", None) or ():
+        # Shards get their own scratch file beside the default one.
+        settings.DATABASES[alias]["NAME"] = os.path.join(os.path.dirname(db_path), f"{alias}.sqlite3")
+    if migrate:
+        from django.core.management import call_command
+
+        call_command("migrate", verbosity=0)
+        for alias in getattr(settings, "ACCOUNT_SHARDS", None) or ():
+            call_command("migrate", database=alias, verbosity=0)
+    return db_path
+
+
+def seed_accounts(count, batch_size=5000, start=0):
+    """
+    Insert ``count`` synthetic accounts (timestamps come from auto_now),
+    each on its shard when ``ACCOUNT_SHARDS`` is set.
+    """
+    from base.models import Account
+    from base.sharding import shard_for_email
+
+    roles = ("STUDENT", "STUDENT", "STUDENT", "STAFF", "ADMIN")
+    for offset in range(start, start + count, batch_size):
+        shards = {}
+        for i in range(offset, min(offset + batch_size, start + count)):
+            email = f"user{i}@example.com"
+            shards.setdefault(shard_for_email(email), []).append(Account(
+                creator_id=i,
+                email=email,
+                fullname=f"Bench User {i}",
+                role=roles[i % len(roles)],
+                is_active=i % 7 != 0,
+            ))
+        for alias, accounts in shards.items():
+            Account.objects.using(alias).bulk_create(accounts)
+
+
+class Timer:
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
@@ -0,0 +1,50 @@
+import pytest
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.backends import TokenBackend
+
+from base import account_cache
+
+
+@pytest.fixture(autouse=True)
+def _clear_account_cache():
+    # Test transactions are rolled back; cached accounts would outlive them.
+    account_cache.get_local_cache().clear()
+    yield
+    account_cache.get_local_cache().clear()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def token_backend(settings):
+    algorithm = settings.SIMPLE_JWT.get("ALGORITHM", "HS256")
+    signing_key = settings.SIMPLE_JWT.get("SIGNING_KEY", settings.SECRET_KEY)
+    return TokenBackend(algorithm=algorithm, signing_key=signing_key)
+
+
+@pytest.fixture
+def make_auth_headers(token_backend):
+    def _make(role="STUDENT", user_id=1, email="user@example.com", username="user"):
+        payload = {
+            "user_id": user_id,
+            "email": email,
+            "username": username,
+            "role": role,
+        }
+        token = token_backend.encode(payload)
+        return {"HTTP_AUTHORIZATION": f"bearer {token}"}
+
+    return _make
+
+
+@pytest.fixture
+def admin_headers(make_auth_headers):
+    return make_auth_headers(role="ADMIN", user_id=999, email="admin@example.com", username="admin")
+
+
+@pytest.fixture
+def student_headers(make_auth_headers):
+    return make_auth_headers(role="STUDENT", user_id=111, email="student@example.com", username="student")
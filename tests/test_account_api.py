@@ -1,49 +1,11 @@
+import json
 import pytest
 from datetime import timedelta
 from django.utils import timezone
-from rest_framework.test import APIClient
-from rest_framework_simplejwt.backends import TokenBackend
 
 from base.models import Account
 
 
-@pytest.fixture
-def api_client():
-    return APIClient()
-
-
-@pytest.fixture
-def token_backend(settings):
-    algorithm = settings.SIMPLE_JWT.get("ALGORITHM", "HS256")
-    signing_key = settings.SIMPLE_JWT.get("SIGNING_KEY", settings.SECRET_KEY)
-    return TokenBackend(algorithm=algorithm, signing_key=signing_key)
-
-
-@pytest.fixture
-def make_auth_headers(token_backend):
-    def _make(role="STUDENT", user_id=1, email="user@example.com", username="user"):
-        payload = {
-            "user_id": user_id,
-            "email": email,
-            "username": username,
-            "role": role,
-        }
-        token = token_backend.encode(payload)
-        return {"HTTP_AUTHORIZATION": f"bearer {token}"}
-
-    return _make
-
-
-@pytest.fixture
-def admin_headers(make_auth_headers):
-    return make_auth_headers(role="ADMIN", user_id=999, email="admin@example.com", username="admin")
-
-
-@pytest.fixture
-def student_headers(make_auth_headers):
-    return make_auth_headers(role="STUDENT", user_id=111, email="student@example.com", username="student")
-
-
 # @pytest.mark.django_db
 # def test_requires_authentication(api_client):
 #     response = api_client.get("/api/account/")
@@ -215,3 +177,98 @@ def test_filter_by_updated_before(api_client, admin_headers):
     assert response.status_code == 200
     emails = {acct["email"] for acct in response.json()}
     assert emails == {"stale@example.com"}
+
+
+def _link_urls(response):
+    links = {}
+    for part in response.headers.get("Link", "").split(","):
+        if not part.strip():
+            continue
+        url, rel = part.split(";")
+        links[rel.strip().split("=")[1].strip('"')] = url.strip()[1:-1]
+    return links
+
+
+@pytest.mark.django_db
+def test_list_endpoints_use_keyset_pagination(api_client, admin_headers):
+    for i in range(5):
+        Account.objects.create(email=f"page{i}@example.com", fullname=f"Page {i}", role="STUDENT", creator_id=1)
+
+    first = api_client.get("/api/account/?page_size=2", **admin_headers)
+    assert first.status_code == 200
+    assert [acct["email"] for acct in first.json()] == ["page0@example.com", "page1@example.com"]
+    links = _link_urls(first)
+    assert "prev" not in links
+
+    second = api_client.get(links["next"], **admin_headers)
+    assert [acct["email"] for acct in second.json()] == ["page2@example.com", "page3@example.com"]
+    links = _link_urls(second)
+
+    last = api_client.get(links["next"], **admin_headers)
+    assert [acct["email"] for acct in last.json()] == ["page4@example.com"]
+    assert "next" not in _link_urls(last)
+
+    back = api_client.get(links["prev"], **admin_headers)
+    assert [acct["email"] for acct in back.json()] == ["page0@example.com", "page1@example.com"]
+
+
+@pytest.mark.django_db
+def test_page_size_is_capped(api_client, admin_headers, settings):
+    settings.ACCOUNT_MAX_PAGE_SIZE = 2
+    for i in range(3):
+        Account.objects.create(email=f"cap{i}@example.com", fullname="Cap", role="STUDENT", creator_id=1, is_active=True)
+
+    response = api_client.get("/api/account/active/?page_size=50", **admin_headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert "next" in _link_urls(response)
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_is_rejected(api_client, admin_headers):
+    response = api_client.get("/api/account/?cursor=not-a-cursor", **admin_headers)
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_export_streams_ndjson(api_client, admin_headers):
+    Account.objects.create(email="a@example.com", fullname="A", role="STUDENT", creator_id=1)
+    Account.objects.create(email="b@example.com", fullname="B", role="ADMIN", creator_id=1, is_active=False)
+
+    response = api_client.get("/api/account/export/", **admin_headers)
+    assert response.status_code == 200
+    assert response.streaming
+    assert response["Content-Type"].startswith("application/x-ndjson")
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert [json.loads(line)["email"] for line in lines] == ["a@example.com", "b@example.com"]
+
+    filtered = api_client.get("/api/account/export/?active=false", **admin_headers)
+    lines = b"".join(filtered.streaming_content).decode().splitlines()
+    assert [json.loads(line)["email"] for line in lines] == ["b@example.com"]
+
+
+@pytest.mark.django_db
+def test_export_streams_json_array(api_client, admin_headers):
+    Account.objects.create(email="a@example.com", fullname="A", role="STUDENT", creator_id=1)
+
+    response = api_client.get("/api/account/export/?format=json", **admin_headers)
+    assert response.status_code == 200
+    body = json.loads(b"".join(response.streaming_content))
+    assert [acct["email"] for acct in body] == ["a@example.com"]
+    assert body == api_client.get("/api/account/", **admin_headers).json()
+
+
+@pytest.mark.django_db
+def test_fast_read_path_matches_model_serializer_bytes(api_client, admin_headers):
+    from rest_framework.renderers import JSONRenderer
+    from api.serializers import AccountSerializer
+
+    Account.objects.create(email="fast@example.com", fullname="Fäst Ünicode", role="STUDENT", creator_id=None)
+    Account.objects.create(email="slow@example.com", fullname="Slow", role="ADMIN", creator_id=3, is_active=False)
+    expected = JSONRenderer().render(AccountSerializer(Account.objects.order_by("created_at", "accountID"), many=True).data)
+
+    response = api_client.get("/api/account/", **admin_headers)
+    assert response.content == expected
+
+    single = api_client.get("/api/account/get/fast@example.com/", **admin_headers)
+    assert single.content == JSONRenderer().render(AccountSerializer(Account.objects.get(email="fast@example.com")).data)
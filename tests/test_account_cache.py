@@ -0,0 +1,180 @@
+import pytest
+from django.db import transaction
+
+from base import account_cache
+from base.models import Account
+
+
+def _get(api_client, headers, email):
+    return api_client.get(f"/api/account/get/{email}/", **headers)
+
+
+@pytest.mark.django_db
+def test_repeat_lookups_skip_the_database(api_client, student_headers, django_assert_num_queries):
+    Account.objects.create(email="cached@example.com", fullname="Cached", role="STUDENT", creator_id=1)
+
+    before = account_cache.account_cache_stats()
+    first = _get(api_client, student_headers, "cached@example.com")
+    with django_assert_num_queries(0):
+        second = _get(api_client, student_headers, "cached@example.com")
+
+    assert first.json() == second.json()
+    after = account_cache.account_cache_stats()
+    assert (after["hits"] - before["hits"], after["misses"] - before["misses"]) == (1, 1)
+
+
+@pytest.mark.django_db
+def test_missing_accounts_are_not_cached(api_client, student_headers):
+    assert _get(api_client, student_headers, "late@example.com").status_code == 404
+    Account.objects.create(email="late@example.com", fullname="Late", role="STUDENT", creator_id=1)
+    assert _get(api_client, student_headers, "late@example.com").status_code == 200
+
+
+@pytest.mark.django_db
+def test_update_invalidates_old_and_new_email(api_client, make_auth_headers, student_headers):
+    Account.objects.create(email="old@example.com", fullname="Before", role="STUDENT", creator_id=5)
+    owner = make_auth_headers(user_id=5, email="old@example.com")
+    _get(api_client, student_headers, "old@example.com")
+
+    api_client.put("/api/account/update/", {"email": "old@example.com", "fullname": "After"}, format="json", **owner)
+    assert _get(api_client, student_headers, "old@example.com").json()["fullname"] == "After"
+
+    # The update view looks the row up by ``email`` and so cannot rename;
+    # a rename saved elsewhere is still caught by the post_save receiver.
+    account = Account.objects.get(email="old@example.com")
+    account.email = "new@example.com"
+    account.save()
+    account_cache.invalidate_accounts(["old@example.com"])
+    assert _get(api_client, student_headers, "old@example.com").status_code == 404
+    assert _get(api_client, student_headers, "new@example.com").json()["fullname"] == "After"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("path, expected", [("/api/account/activate/", True), ("/api/account/deactivate/", False)])
+def test_status_changes_invalidate(api_client, admin_headers, path, expected):
+    Account.objects.create(
+        email="flip@example.com", fullname="Flip", role="STUDENT", creator_id=1, is_active=not expected
+    )
+    assert _get(api_client, admin_headers, "flip@example.com").json()["is_active"] is not expected
+
+    api_client.put(path, {"email": "flip@example.com"}, format="json", **admin_headers)
+
+    assert _get(api_client, admin_headers, "flip@example.com").json()["is_active"] is expected
+
+
+@pytest.mark.django_db
+def test_deletes_invalidate(api_client, admin_headers):
+    for name in ("one", "two"):
+        Account.objects.create(email=f"{name}@example.com", fullname=name, role="STUDENT", creator_id=1)
+        _get(api_client, admin_headers, f"{name}@example.com")
+
+    api_client.delete("/api/account/delete/", {"email": "one@example.com"}, format="json", **admin_headers)
+    assert _get(api_client, admin_headers, "one@example.com").status_code == 404
+
+    api_client.delete("/api/account/batch/delete/", ["two@example.com"], format="json", **admin_headers)
+    assert _get(api_client, admin_headers, "two@example.com").status_code == 404
+
+
+@pytest.mark.django_db
+def test_batch_update_invalidates(api_client, admin_headers):
+    Account.objects.create(email="bulk@example.com", fullname="Before", role="STUDENT", creator_id=1)
+    _get(api_client, admin_headers, "bulk@example.com")
+
+    api_client.put(
+        "/api/account/batch/update/", [{"email": "bulk@example.com", "fullname": "After"}], format="json", **admin_headers
+    )
+
+    assert _get(api_client, admin_headers, "bulk@example.com").json()["fullname"] == "After"
+
+
+@pytest.mark.django_db
+def test_read_racing_a_write_is_not_stored(api_client, student_headers):
+    Account.objects.create(email="race@example.com", fullname="Before", role="STUDENT", creator_id=1)
+
+    def load(email):
+        row = {"email": email, "fullname": "Before"}
+        # A write lands between the SELECT and the cache store.
+        Account.objects.filter(email=email).update(fullname="After")
+        account_cache.invalidate_accounts([email])
+        return row
+
+    account_cache.get_account("race@example.com", load)
+    assert account_cache.get_local_cache().get("race@example.com") is None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_invalidation_repeats_on_commit(api_client, student_headers):
+    Account.objects.create(email="commit@example.com", fullname="Before", role="STUDENT", creator_id=1)
+    with transaction.atomic():
+        account = Account.objects.get(email="commit@example.com")
+        account.fullname = "After"
+        account.save()
+        # A concurrent reader repopulates the entry before the commit.
+        account_cache.get_local_cache().set("commit@example.com", {"fullname": "Before"})
+
+    assert account_cache.get_local_cache().get("commit@example.com") is None
+
+
+@pytest.mark.django_db
+def test_size_setting_bounds_the_local_tier(api_client, student_headers, settings):
+    settings.ACCOUNT_CACHE_SIZE = 2
+    for i in range(3):
+        Account.objects.create(email=f"e{i}@example.com", fullname="E", role="STUDENT", creator_id=1)
+        _get(api_client, student_headers, f"e{i}@example.com")
+
+    stats = account_cache.account_cache_stats()
+    assert (stats["size"], stats["evictions"]) == (2, 1)
+
+
+@pytest.mark.django_db
+def test_shared_tier_is_read_through_and_generation_invalidated(api_client, student_headers, settings):
+    settings.CACHES = dict(
+        settings.CACHES,
+        accounts={"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "account-cache-test"},
+    )
+    settings.ACCOUNT_CACHE_BACKEND = "accounts"
+    Account.objects.create(email="shared@example.com", fullname="Shared", role="STUDENT", creator_id=1)
+
+    _get(api_client, student_headers, "shared@example.com")
+    account_cache.get_local_cache().clear()  # as seen from another worker
+    shared_hits = account_cache.account_cache_stats()["shared_hits"]
+    assert _get(api_client, student_headers, "shared@example.com").status_code == 200
+    assert account_cache.account_cache_stats()["shared_hits"] == shared_hits + 1
+
+    Account.objects.all().delete()
+    account_cache.invalidate_all()
+    assert _get(api_client, student_headers, "shared@example.com").status_code == 404
+
+
+@pytest.mark.django_db
+def test_shared_tier_ignores_a_read_that_raced_another_workers_write(settings):
+    settings.CACHES = dict(
+        settings.CACHES,
+        accounts={"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "account-cache-race"},
+    )
+    settings.ACCOUNT_CACHE_BACKEND = "accounts"
+
+    def stale_load(email):
+        # Worker A has read the old row; worker B now commits a write and
+        # invalidates. B is another process, so A's local generation stays.
+        generation = account_cache._generation
+        account_cache.invalidate_accounts([email])
+        account_cache._generation = generation
+        return {"email": email, "fullname": "Before"}
+
+    assert account_cache.get_account("race@example.com", stale_load) == {"email": "race@example.com", "fullname": "Before"}
+
+    # Worker C, with an empty local tier, must not be served A's stale row.
+    account_cache.get_local_cache().clear()
+    fresh = account_cache.get_account("race@example.com", lambda email: {"email": email, "fullname": "After"})
+    assert fresh["fullname"] == "After"
+    account_cache.get_local_cache().clear()
+    assert account_cache.get_account("race@example.com", lambda email: None)["fullname"] == "After"
+
+
+@pytest.mark.django_db
+def test_cache_stats_are_exported(api_client, student_headers):
+    api_client.get("/api/account/get/nobody@example.com/", **student_headers)
+    body = api_client.get("/api/metrics/").content.decode()
+    assert "# TYPE account_cache_misses_total counter" in body
+    assert 'account_cache_hits_total{tier="local"}' in body
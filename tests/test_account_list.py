@@ -0,0 +1,74 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from base.models import Account
+
+pytestmark = pytest.mark.django_db
+
+URL = "/api/account/list/"
+
+
+@pytest.fixture
+def accounts():
+    created = []
+    for i in range(8):
+        created.append(Account.objects.create(
+            email=f"list{i}@example.com",
+            fullname=f"List {i}" * 100,
+            role="STAFF" if i % 4 == 0 else "STUDENT",
+            is_active=i % 2 == 0,
+            creator_id=i,
+        ))
+    return created
+
+
+def _emails(response):
+    assert response.status_code == 200, response.content
+    return [row["email"] for row in response.json()]
+
+
+def test_filters_combine(api_client, admin_headers, accounts):
+    after = accounts[1].created_at.isoformat()
+    response = api_client.get(URL, {"role": "STUDENT", "active": "true", "created_after": after}, **admin_headers)
+    assert _emails(response) == ["list2@example.com", "list6@example.com"]
+
+    response = api_client.get(URL, {"email": "list3@example.com,list4@example.com,nobody@example.com", "active": "false"}, **admin_headers)
+    assert _emails(response) == ["list3@example.com"]
+
+
+def test_fields_are_projected_in_sql(api_client, admin_headers, accounts):
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(URL, {"fields": "email,role", "role": "STAFF"}, **admin_headers)
+
+    assert response.json() == [
+        {"email": "list0@example.com", "role": "STAFF"},
+        {"email": "list4@example.com", "role": "STAFF"},
+    ]
+    page_query = [query["sql"] for query in queries.captured_queries if "LIMIT" in query["sql"]]
+    assert page_query and '"fullname"' not in page_query[0]
+
+
+def test_projected_pages_still_follow_the_cursor(api_client, admin_headers, accounts):
+    seen, url = [], f"{URL}?fields=email&page_size=3"
+    while url:
+        response = api_client.get(url, **admin_headers)
+        assert all(list(row) == ["email"] for row in response.json())
+        seen += _emails(response)
+        link = response.get("Link", "")
+        url = link.split(";")[0].strip("<>") if 'rel="next"' in link else None
+    assert seen == [account.email for account in accounts]
+
+
+@pytest.mark.parametrize("params", [
+    {"fields": "email,password"},
+    {"fields": ","},
+    {"active": "sometimes"},
+    {"updated_before": "tomorrow"},
+])
+def test_bad_parameters_are_rejected(api_client, admin_headers, params):
+    assert api_client.get(URL, params, **admin_headers).status_code == 400
+
+
+def test_list_is_admin_only(api_client, student_headers):
+    assert api_client.get(URL, **student_headers).status_code == 403
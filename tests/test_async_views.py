@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+from django.test import AsyncClient
+
+from base.models import Account
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def _headers(sync_headers):
+    # AsyncClient takes headers without the HTTP_ prefix.
+    return {"headers": {"Authorization": sync_headers["HTTP_AUTHORIZATION"]}}
+
+
+def test_async_reads_match_sync_endpoints(api_client, admin_headers):
+    for i in range(3):
+        Account.objects.create(email=f"async{i}@example.com", fullname=f"Async {i}", role="STUDENT", creator_id=i)
+
+    async def fetch():
+        client = AsyncClient()
+        return (
+            await client.get("/api/async/account/?page_size=2", **_headers(admin_headers)),
+            await client.get("/api/async/account/get/async1@example.com/", **_headers(admin_headers)),
+            await client.get("/api/async/account/count_by_role/STUDENT/", **_headers(admin_headers)),
+        )
+
+    listing, single, count = asyncio.run(fetch())
+    sync_listing = api_client.get("/api/account/?page_size=2", **admin_headers)
+    assert listing.status_code == 200
+    assert listing.content == sync_listing.content
+    assert listing["Link"] == sync_listing["Link"].replace("/api/account/", "/api/async/account/")
+    assert single.content == api_client.get("/api/account/get/async1@example.com/", **admin_headers).content
+    assert count.json() == {"role": "STUDENT", "count": 3}
+
+
+def test_async_mutations_apply_permissions(student_headers, admin_headers):
+    Account.objects.create(email="other@example.com", fullname="Other", role="STUDENT", creator_id=222)
+
+    async def run():
+        client = AsyncClient()
+        created = await client.post(
+            "/api/async/account/create/", {"email": "x@example.com", "fullname": "Me"}, content_type="application/json", **_headers(student_headers)
+        )
+        denied = await client.put(
+            "/api/async/account/update/", {"email": "other@example.com", "fullname": "Hijack"}, content_type="application/json", **_headers(student_headers)
+        )
+        not_admin = await client.put(
+            "/api/async/account/deactivate/", {"email": "other@example.com"}, content_type="application/json", **_headers(student_headers)
+        )
+        deactivated = await client.put(
+            "/api/async/account/deactivate/", {"email": "other@example.com"}, content_type="application/json", **_headers(admin_headers)
+        )
+        anonymous = await client.get("/api/async/account/")
+        return created, denied, not_admin, deactivated, anonymous
+
+    created, denied, not_admin, deactivated, anonymous = asyncio.run(run())
+    assert created.status_code == 201
+    assert created.json()["email"] == "student@example.com"
+    assert denied.status_code == 404
+    assert not_admin.status_code == 403
+    assert deactivated.json()["is_active"] is False
+    assert anonymous.status_code == 403
+    assert Account.objects.get(email="other@example.com").fullname == "Other"
+
+
+def test_async_views_shed_load_when_saturated(settings, admin_headers):
+    settings.ACCOUNT_ASYNC_MAX_CONCURRENCY = 1
+    settings.ACCOUNT_ASYNC_QUEUE_TIMEOUT = 0.01
+
+    async def run():
+        from api import async_views
+
+        semaphore = async_views._semaphore()
+        await semaphore.acquire()
+        try:
+            return await AsyncClient().get("/api/async/account/count/", **_headers(admin_headers))
+        finally:
+            semaphore.release()
+
+    response = asyncio.run(run())
+    assert response.status_code == 503
+    assert response["Retry-After"] == "1"
+
+
+def test_async_list_answers_304_for_matching_etag(admin_headers):
+    Account.objects.create(email="etag@example.com", fullname="Etag", role="STUDENT", creator_id=1)
+
+    async def fetch():
+        client = AsyncClient()
+        first = await client.get("/api/async/account/", **_headers(admin_headers))
+        headers = {"Authorization": admin_headers["HTTP_AUTHORIZATION"], "If-None-Match": first["ETag"]}
+        return await client.get("/api/async/account/", headers=headers)
+
+    response = asyncio.run(fetch())
+    assert response.status_code == 304
+
+
+def test_async_update_honours_if_match(api_client, make_auth_headers):
+    owner_headers = make_auth_headers(user_id=1)
+    Account.objects.create(email="user@example.com", fullname="Before", role="STUDENT", creator_id=1)
+    etag = api_client.get("/api/account/get/user@example.com/", **owner_headers).headers["ETag"]
+
+    async def write(fullname):
+        headers = _headers(owner_headers)
+        headers["headers"]["If-Match"] = etag
+        return await AsyncClient().put(
+            "/api/async/account/update/", {"email": "user@example.com", "fullname": fullname},
+            content_type="application/json", **headers,
+        )
+
+    assert asyncio.run(write("First")).status_code == 200
+    assert asyncio.run(write("Second")).status_code == 412
+    assert Account.objects.get(email="user@example.com").fullname == "First"
@@ -0,0 +1,58 @@
+import time
+
+import pytest
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+
+from accountService import authentication
+from accountService.caching import LRUCache
+
+
+@pytest.fixture
+def fresh_cache(settings):
+    # Changing a setting drops the process-wide cache via setting_changed.
+    settings.ACCOUNT_TOKEN_CACHE_SIZE = 2
+    yield authentication.get_token_cache()
+
+
+def _authenticate(token):
+    request = APIRequestFactory().get("/api/account/", HTTP_AUTHORIZATION=f"bearer {token}")
+    return authentication.ExternalJWTAuthentication().authenticate(request)
+
+
+def test_repeat_tokens_are_served_from_cache(token_backend, fresh_cache):
+    token = token_backend.encode({"user_id": 5, "email": "a@example.com", "role": "ADMIN"})
+
+    user, _ = _authenticate(token)
+    again, _ = _authenticate(token)
+
+    assert user.id == again.id == 5
+    assert authentication.token_cache_stats()["misses"] == 1
+    assert authentication.token_cache_stats()["hits"] == 1
+
+
+def test_cache_entry_never_outlives_token_exp(token_backend, fresh_cache):
+    token = token_backend.encode({"user_id": 5, "exp": int(time.time()) + 1})
+    _authenticate(token)
+    time.sleep(1.1)
+
+    with pytest.raises(AuthenticationFailed):
+        _authenticate(token)
+
+
+def test_invalid_tokens_are_not_cached(fresh_cache):
+    with pytest.raises(AuthenticationFailed):
+        _authenticate("not.a.jwt")
+    assert len(fresh_cache) == 0
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
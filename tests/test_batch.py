@@ -0,0 +1,174 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from base.models import Account
+
+
+@pytest.mark.django_db
+def test_batch_create_validates_in_one_pass(api_client, admin_headers):
+    Account.objects.create(email="taken@example.com", fullname="Taken", role="STUDENT", creator_id=1)
+    body = [
+        {"email": "new1@example.com", "fullname": "New One", "role": "STUDENT"},
+        {"email": "taken@example.com", "fullname": "Dup", "role": "STUDENT"},
+        {"email": "not-an-email", "fullname": "Bad"},
+        {"email": "new1@example.com", "fullname": "Again"},
+        {"email": "new2@example.com", "fullname": "New Two", "role": "STAFF"},
+    ]
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = api_client.post("/api/account/batch/create/", body, format="json", **admin_headers)
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["created"] == 2
+    assert [r["status"] for r in payload["results"]] == [201, 400, 400, 400, 201]
+    assert payload["results"][0]["account"]["creator_id"] == 999
+    assert payload["results"][4]["account"]["accountID"] is not None
+    assert Account.objects.filter(email__in=["new1@example.com", "new2@example.com"]).count() == 2
+    # one uniqueness SELECT plus the bulk INSERT (and savepoint bookkeeping)
+    assert sum("INSERT" in q["sql"] for q in ctx.captured_queries) == 1
+    assert sum(q["sql"].startswith("SELECT") for q in ctx.captured_queries) == 1
+
+
+@pytest.mark.django_db
+def test_batch_create_requires_admin(api_client, student_headers):
+    response = api_client.post("/api/account/batch/create/", [{"email": "x@example.com", "fullname": "X"}], format="json", **student_headers)
+    assert response.status_code == 403
+
+
+@pytest.mark.django_db
+def test_batch_rejects_oversized_payload(api_client, admin_headers, settings):
+    settings.ACCOUNT_BATCH_MAX_ITEMS = 1
+    body = [{"email": "a@example.com", "fullname": "A"}, {"email": "b@example.com", "fullname": "B"}]
+    response = api_client.post("/api/account/batch/create/", body, format="json", **admin_headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_batch_update_applies_owner_or_admin(api_client, student_headers):
+    mine = Account.objects.create(email="mine@example.com", fullname="Mine", role="STUDENT", creator_id=111)
+    theirs = Account.objects.create(email="theirs@example.com", fullname="Theirs", role="STUDENT", creator_id=222)
+    body = [
+        {"email": mine.email, "fullname": "Mine Updated"},
+        {"email": theirs.email, "fullname": "Hijacked"},
+        {"email": "ghost@example.com", "fullname": "Ghost"},
+    ]
+
+    response = api_client.put("/api/account/batch/update/", body, format="json", **student_headers)
+    assert response.status_code == 200
+    assert [r["status"] for r in response.json()["results"]] == [200, 404, 404]
+    mine.refresh_from_db()
+    theirs.refresh_from_db()
+    assert mine.fullname == "Mine Updated"
+    assert mine.updated_at > mine.created_at
+    assert theirs.fullname == "Theirs"
+
+
+@pytest.mark.django_db
+def test_batch_delete_applies_owner_or_admin(api_client, student_headers, admin_headers):
+    Account.objects.create(email="mine@example.com", fullname="Mine", role="STUDENT", creator_id=111)
+    Account.objects.create(email="theirs@example.com", fullname="Theirs", role="STUDENT", creator_id=222)
+
+    response = api_client.delete(
+        "/api/account/batch/delete/", ["mine@example.com", {"email": "theirs@example.com"}], format="json", **student_headers
+    )
+    assert response.json()["deleted"] == 1
+    assert [r["status"] for r in response.json()["results"]] == [200, 404]
+    assert list(Account.objects.values_list("email", flat=True)) == ["theirs@example.com"]
+
+    response = api_client.delete("/api/account/batch/delete/", ["theirs@example.com"], format="json", **admin_headers)
+    assert response.json()["deleted"] == 1
+    assert not Account.objects.exists()
+
+
+class _AfterFirst:
+    """execute_wrapper that runs ``action`` once, right before or after the first query starting with ``prefix``."""
+
+    def __init__(self, prefix, action, before=False):
+        self.prefix, self.action, self.before, self.done = prefix, action, before, False
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.done or not sql.lstrip().startswith(self.prefix):
+            return execute(sql, params, many, context)
+        self.done = True
+        if self.before:
+            self.action()
+            return execute(sql, params, many, context)
+        result = execute(sql, params, many, context)
+        self.action()
+        return result
+
+
+@pytest.mark.django_db
+def test_batch_update_writes_only_each_items_fields(api_client, admin_headers):
+    Account.objects.create(email="a@example.com", fullname="A", role="STUDENT", creator_id=1)
+    Account.objects.create(email="b@example.com", fullname="B", role="STUDENT", creator_id=2)
+    body = [{"email": "a@example.com", "fullname": "A Renamed"}, {"email": "b@example.com", "role": "ADMIN"}]
+    # Another request changes A's role while the batch is in flight.
+    concurrent = _AfterFirst("UPDATE", lambda: Account.objects.filter(email="a@example.com").update(role="STAFF"), before=True)
+
+    with connection.execute_wrapper(concurrent):
+        response = api_client.put("/api/account/batch/update/", body, format="json", **admin_headers)
+    assert [r["status"] for r in response.json()["results"]] == [200, 200]
+    a, b = Account.objects.get(email="a@example.com"), Account.objects.get(email="b@example.com")
+    assert (a.fullname, a.role, a.creator_id) == ("A Renamed", "STAFF", 1)
+    assert (b.fullname, b.role, b.creator_id) == ("B", "ADMIN", 2)
+
+
+@pytest.mark.django_db
+def test_batch_delete_checks_ownership_in_the_delete(api_client, student_headers):
+    Account.objects.create(email="mine@example.com", fullname="Mine", role="STUDENT", creator_id=111)
+    Account.objects.create(email="theirs@example.com", fullname="Theirs", role="STUDENT", creator_id=222)
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = api_client.delete("/api/account/batch/delete/", ["mine@example.com", "theirs@example.com"], format="json", **student_headers)
+    assert [r["status"] for r in response.json()["results"]] == [200, 404]
+    deletes = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("DELETE")]
+    assert len(deletes) == 1 and "creator_id" in deletes[0]
+    assert list(Account.objects.values_list("email", flat=True)) == ["theirs@example.com"]
+
+
+@pytest.mark.django_db
+def test_batch_delete_reports_the_rows_it_deleted(api_client, admin_headers):
+    # race@ is created by someone else just before the batch's DELETE runs.
+    concurrent = _AfterFirst(
+        "DELETE",
+        lambda: Account.objects.create(email="race@example.com", fullname="Late", role="STUDENT", creator_id=7),
+        before=True,
+    )
+
+    with connection.execute_wrapper(concurrent):
+        response = api_client.delete("/api/account/batch/delete/", ["race@example.com"], format="json", **admin_headers)
+    assert response.json()["deleted"] == 1
+    assert [r["status"] for r in response.json()["results"]] == [200]
+    assert not Account.objects.filter(email="race@example.com").exists()
+
+
+@pytest.mark.django_db
+def test_batch_create_reports_emails_created_concurrently(api_client, admin_headers):
+    body = [{"email": "race@example.com", "fullname": "Race"}, {"email": "calm@example.com", "fullname": "Calm"}]
+    # race@ is created by someone else just after the batch's uniqueness check.
+    concurrent = _AfterFirst(
+        "SELECT", lambda: Account.objects.create(email="race@example.com", fullname="Winner", role="STUDENT", creator_id=7)
+    )
+
+    with connection.execute_wrapper(concurrent):
+        response = api_client.post("/api/account/batch/create/", body, format="json", **admin_headers)
+    assert response.status_code == 200
+    assert [r["status"] for r in response.json()["results"]] == [400, 201]
+    assert Account.objects.get(email="race@example.com").fullname == "Winner"
+    assert Account.objects.filter(email="calm@example.com").exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_batch_writes_take_the_sqlite_write_lock_up_front(api_client, admin_headers):
+    # A deferred BEGIN fails at once with "database is locked" when another
+    # connection commits between the transaction's read and its first write.
+    Account.objects.create(email="a@example.com", fullname="A", role="STUDENT", creator_id=1)
+    with CaptureQueriesContext(connection) as ctx:
+        response = api_client.put(
+            "/api/account/batch/update/", [{"email": "a@example.com", "fullname": "B"}], format="json", **admin_headers
+        )
+    assert response.status_code == 200
+    assert [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("BEGIN")] == ["BEGIN IMMEDIATE"]
+    assert connection.transaction_mode is None
@@ -0,0 +1,110 @@
+import pytest
+from django.db import connection
+
+from base.models import Account
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(connection.vendor != "sqlite", reason="the change triggers are SQLite-only"),
+]
+
+
+def _feed(api_client, headers, since=0, **params):
+    query = "&".join(f"{key}={value}" for key, value in params.items())
+    response = api_client.get(f"/api/account/changes/?since={since}&{query}", **headers)
+    assert response.status_code == 200, response.content
+    return response.json()
+
+
+def _create(email, **fields):
+    return Account.objects.create(email=email, fullname=fields.pop("fullname", email), role="STUDENT", creator_id=1, **fields)
+
+
+def test_feed_replays_upserts_in_commit_order(api_client, admin_headers):
+    _create("a@example.com")
+    _create("b@example.com")
+
+    page = _feed(api_client, admin_headers)
+
+    assert [change["account"]["email"] for change in page["results"]] == ["a@example.com", "b@example.com"]
+    assert {change["op"] for change in page["results"]} == {"upsert"}
+    assert page["results"][0]["account"] == api_client.get("/api/account/get/a@example.com/", **admin_headers).json()
+    assert page["cursor"] == page["results"][-1]["seq"]
+    assert page["has_more"] is False
+
+
+def test_updates_move_an_account_past_the_cursor_once(api_client, admin_headers):
+    account = _create("a@example.com")
+    _create("b@example.com")
+    cursor = _feed(api_client, admin_headers)["cursor"]
+
+    account.fullname = "Renamed"
+    account.save()
+    account.is_active = False
+    account.save()
+
+    page = _feed(api_client, admin_headers, since=cursor)
+    assert len(page["results"]) == 1
+    assert page["results"][0]["account"]["fullname"] == "Renamed"
+    assert page["results"][0]["account"]["is_active"] is False
+    assert page["results"][0]["seq"] > cursor
+
+
+def test_deletes_leave_tombstones(api_client, admin_headers):
+    doomed = _create("one@example.com")
+    _create("two@example.com")
+    _create("three@example.com")
+    cursor = _feed(api_client, admin_headers)["cursor"]
+
+    api_client.delete("/api/account/delete/", {"email": "one@example.com"}, format="json", **admin_headers)
+    api_client.delete("/api/account/batch/delete/", ["two@example.com"], format="json", **admin_headers)
+    Account.objects.filter(email="three@example.com").delete()
+
+    page = _feed(api_client, admin_headers, since=cursor)
+    assert [(change["op"], change["email"]) for change in page["results"]] == [
+        ("delete", "one@example.com"),
+        ("delete", "two@example.com"),
+        ("delete", "three@example.com"),
+    ]
+    assert page["results"][0]["accountID"] == doomed.accountID
+    assert page["results"][0]["deleted_at"].endswith("Z")
+
+
+def test_pages_are_bounded_and_resume_from_the_cursor(api_client, admin_headers):
+    for i in range(5):
+        _create(f"user{i}@example.com")
+
+    seen, cursor, has_more = [], 0, True
+    while has_more:
+        page = _feed(api_client, admin_headers, since=cursor, page_size=2)
+        assert len(page["results"]) <= 2
+        seen += [change["account"]["email"] for change in page["results"]]
+        cursor, has_more = page["cursor"], page["has_more"]
+
+    assert seen == [f"user{i}@example.com" for i in range(5)]
+    assert _feed(api_client, admin_headers, since=cursor) == {"results": [], "cursor": cursor, "has_more": False}
+
+
+def test_bulk_upserts_are_recorded(api_client, admin_headers):
+    _create("bulk@example.com")
+    cursor = _feed(api_client, admin_headers)["cursor"]
+
+    Account.objects.bulk_create(
+        [Account(email="bulk@example.com", fullname="Upserted", role="STUDENT")],
+        update_conflicts=True,
+        unique_fields=["email"],
+        update_fields=["fullname"],
+    )
+
+    page = _feed(api_client, admin_headers, since=cursor)
+    assert [change["account"]["fullname"] for change in page["results"]] == ["Upserted"]
+
+
+@pytest.mark.parametrize("since", ["abc", "-1"])
+def test_invalid_cursor_is_rejected(api_client, admin_headers, since):
+    response = api_client.get(f"/api/account/changes/?since={since}", **admin_headers)
+    assert response.status_code == 400
+
+
+def test_feed_is_admin_only(api_client, student_headers):
+    assert api_client.get("/api/account/changes/", **student_headers).status_code == 403
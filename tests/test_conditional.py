@@ -0,0 +1,139 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from base.models import Account
+
+
+@pytest.fixture
+def account():
+    return Account.objects.create(email="etag@example.com", fullname="Etag", role="STUDENT", creator_id=1)
+
+
+@pytest.fixture
+def owner_headers(make_auth_headers):
+    return make_auth_headers(user_id=1)
+
+
+@pytest.mark.django_db
+def test_account_304_on_matching_etag_without_queries(api_client, student_headers, account, django_assert_num_queries):
+    first = api_client.get("/api/account/get/etag@example.com/", **student_headers)
+    etag = first.headers["ETag"]
+    assert etag.startswith('"') and "Last-Modified" in first.headers
+
+    with django_assert_num_queries(0):
+        again = api_client.get("/api/account/get/etag@example.com/", HTTP_IF_NONE_MATCH=etag, **student_headers)
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["ETag"] == etag
+
+
+@pytest.mark.django_db
+def test_account_if_modified_since(api_client, student_headers, account):
+    first = api_client.get("/api/account/get/etag@example.com/", **student_headers)
+    again = api_client.get(
+        "/api/account/get/etag@example.com/", HTTP_IF_MODIFIED_SINCE=first.headers["Last-Modified"], **student_headers
+    )
+    assert again.status_code == 304
+
+
+@pytest.mark.django_db
+def test_account_etag_changes_on_update(api_client, admin_headers, account):
+    etag = api_client.get("/api/account/get/etag@example.com/", **admin_headers).headers["ETag"]
+    api_client.put("/api/account/deactivate/", {"email": "etag@example.com"}, format="json", **admin_headers)
+
+    response = api_client.get("/api/account/get/etag@example.com/", HTTP_IF_NONE_MATCH=etag, **admin_headers)
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_list_304_is_decided_without_fetching_rows(api_client, admin_headers, account):
+    etag = api_client.get("/api/account/", **admin_headers).headers["ETag"]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get("/api/account/", HTTP_IF_NONE_MATCH=etag, **admin_headers)
+    assert response.status_code == 304
+    assert "Last-Modified" not in response.headers
+    assert not any('"base_account"."email"' in query["sql"] for query in queries.captured_queries)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("change", ["create", "delete"])
+def test_list_etag_changes_on_insert_and_delete(api_client, admin_headers, account, change):
+    Account.objects.create(email="other@example.com", fullname="Other", role="STUDENT", creator_id=1)
+    etag = api_client.get("/api/account/role/STUDENT/", **admin_headers).headers["ETag"]
+
+    if change == "create":
+        Account.objects.create(email="new@example.com", fullname="New", role="STUDENT", creator_id=1)
+    else:
+        Account.objects.filter(email="etag@example.com").delete()
+
+    response = api_client.get("/api/account/role/STUDENT/", HTTP_IF_NONE_MATCH=etag, **admin_headers)
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_list_etag_depends_on_query_string(api_client, admin_headers, account):
+    full = api_client.get("/api/account/", **admin_headers).headers["ETag"]
+    page = api_client.get("/api/account/?page_size=1", **admin_headers).headers["ETag"]
+    assert full != page
+
+
+@pytest.mark.django_db
+def test_update_is_one_statement_writing_only_sent_fields(api_client, owner_headers, account):
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.put(
+            "/api/account/update/", {"email": "etag@example.com", "fullname": "Renamed"}, format="json", **owner_headers
+        )
+
+    assert response.status_code == 200
+    assert [query["sql"].split()[0] for query in queries.captured_queries] == ["UPDATE"]
+    assigned = queries.captured_queries[0]["sql"].split(" WHERE ")[0]
+    assert '"fullname"' in assigned and '"role"' not in assigned and '"is_active"' not in assigned
+    fetched = api_client.get("/api/account/get/etag@example.com/", **owner_headers)
+    assert response.headers["ETag"] == fetched.headers["ETag"]
+    assert response.json() == fetched.json()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("method, url, body", [
+    ("put", "/api/account/update/", {"email": "etag@example.com", "fullname": "Second"}),
+    ("delete", "/api/account/delete/", {"email": "etag@example.com"}),
+])
+def test_stale_if_match_is_rejected_without_writing(api_client, owner_headers, account, method, url, body):
+    etag = api_client.get("/api/account/get/etag@example.com/", **owner_headers).headers["ETag"]
+    first = api_client.put(
+        "/api/account/update/", {"email": "etag@example.com", "fullname": "First"}, format="json",
+        HTTP_IF_MATCH=etag, **owner_headers,
+    )
+    assert first.status_code == 200
+
+    stale = getattr(api_client, method)(url, body, format="json", HTTP_IF_MATCH=etag, **owner_headers)
+    assert stale.status_code == 412
+    assert Account.objects.get(email="etag@example.com").fullname == "First"
+
+    fresh = getattr(api_client, method)(url, body, format="json", HTTP_IF_MATCH=first.headers["ETag"], **owner_headers)
+    assert fresh.status_code == 200
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("if_match", ['"garbage"', 'W/"1.0.x"', "*"])
+def test_if_match_that_names_no_version(api_client, owner_headers, account, if_match):
+    response = api_client.put(
+        "/api/account/update/", {"email": "etag@example.com", "fullname": "X"}, format="json",
+        HTTP_IF_MATCH=if_match, **owner_headers,
+    )
+    assert response.status_code == (200 if if_match == "*" else 412)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("method, url", [("put", "/api/account/update/"), ("delete", "/api/account/delete/")])
+def test_ownership_is_checked_in_the_write(api_client, make_auth_headers, account, method, url):
+    other = make_auth_headers(user_id=2, email="other@example.com")
+    response = getattr(api_client, method)(url, {"email": "etag@example.com", "fullname": "Nope"}, format="json", **other)
+    assert response.status_code == 404
+    assert Account.objects.get(email="etag@example.com").fullname == "Etag"
+
+    missing = getattr(api_client, method)(url, {"email": "ghost@example.com"}, format="json", **other)
+    assert missing.json() == {"error": "Account not found"}
@@ -0,0 +1,68 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+
+from base.counters import count_accounts, counter_drift
+from base.models import Account, AccountCounter
+from base.triggers import ACCOUNT_TRIGGERS, missing_triggers
+
+
+@pytest.mark.django_db
+def test_counters_follow_every_kind_of_write(api_client, admin_headers):
+    Account.objects.create(email="a@example.com", fullname="A", role="STUDENT", creator_id=1)
+    Account.objects.bulk_create(
+        [Account(email=f"b{i}@example.com", fullname="B", role="STAFF", creator_id=1) for i in range(3)]
+    )
+    assert count_accounts() == 4
+    assert count_accounts(role="STAFF") == 3
+
+    api_client.put("/api/account/deactivate/", {"email": "a@example.com"}, format="json", **admin_headers)
+    assert count_accounts(role="STUDENT", is_active=True) == 0
+    assert count_accounts(role="STUDENT", is_active=False) == 1
+
+    Account.objects.filter(role="STAFF").update(role="ADMIN")
+    assert count_accounts(role="ADMIN") == 3
+    assert count_accounts(role="STAFF") == 0
+
+    api_client.delete("/api/account/delete/", {"email": "a@example.com"}, format="json", **admin_headers)
+    count = api_client.get("/api/account/count/", **admin_headers).json()["count"]
+    assert count == Account.objects.count() == 3
+    assert counter_drift() == {}
+
+
+@pytest.mark.django_db
+def test_rebuild_command_detects_and_fixes_drift(capsys):
+    Account.objects.create(email="a@example.com", fullname="A", role="STUDENT", creator_id=1)
+    AccountCounter.objects.filter(role="STUDENT").update(count=42)
+
+    with pytest.raises(CommandError):
+        call_command("rebuild_account_counters", "--check")
+    assert "stored=42 actual=1" in capsys.readouterr().out
+
+    call_command("rebuild_account_counters")
+    call_command("rebuild_account_counters", "--check")
+    assert count_accounts(role="STUDENT") == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != "sqlite", reason="the triggers are SQLite only")
+def test_every_account_trigger_is_installed():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'base_account'")
+        installed = {name for (name,) in cursor.fetchall()}
+    expected = {name for names in ACCOUNT_TRIGGERS.values() for name in names}
+    assert len(expected) == 9
+    assert expected <= installed
+    assert missing_triggers() == []
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != "sqlite", reason="the triggers are SQLite only")
+def test_check_command_fails_when_a_trigger_is_missing(capsys):
+    with connection.cursor() as cursor:
+        cursor.execute("DROP TRIGGER account_change_update")
+
+    with pytest.raises(CommandError, match="1 trigger"):
+        call_command("rebuild_account_counters", "--check")
+    assert "missing trigger: account_change_update" in capsys.readouterr().err
@@ -0,0 +1,197 @@
+import pytest
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.utils import ConnectionHandler, OperationalError
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from accountService import db_routing, settings_production
+from accountService.db_routing import ReadRouter, ReadRoutingMiddleware
+from api import async_views, views
+from base import counters
+from base.models import Account
+
+
+class _User:
+    def __init__(self, id):
+        self.id = id
+
+
+def _request(method, user_id=None, status=200):
+    """Run a fake view behind ReadRoutingMiddleware; returns where it routed."""
+    seen = {}
+
+    def view(request):
+        if user_id is not None:
+            # What DRF does once the JWT is authenticated.
+            request.user, request.auth = _User(user_id), {"user_id": user_id}
+        seen["read"] = ReadRouter().db_for_read(Account)
+        seen["write"] = ReadRouter().db_for_write(Account)
+        return HttpResponse(status=status)
+
+    ReadRoutingMiddleware(view)(getattr(RequestFactory(), method.lower())("/api/account/"))
+    return seen
+
+
+@pytest.fixture
+def routing(settings):
+    settings.ACCOUNT_READ_DATABASE = "reader"
+    settings.ACCOUNT_READ_PIN_SECONDS = 5
+    cache.clear()
+    yield settings
+    cache.clear()
+
+
+@pytest.mark.parametrize("method", ["GET", "HEAD"])
+def test_safe_requests_read_from_the_reader(method, routing):
+    assert _request(method, user_id=1) == {"read": "reader", "write": DEFAULT_DB_ALIAS}
+
+
+@pytest.mark.parametrize("method", ["POST", "PUT", "DELETE"])
+def test_write_requests_stay_on_default(method, routing):
+    assert _request(method, user_id=1) == {"read": None, "write": DEFAULT_DB_ALIAS}
+
+
+def test_reads_outside_requests_and_without_reader_use_default(routing):
+    assert ReadRouter().db_for_read(Account) is None
+    routing.ACCOUNT_READ_DATABASE = None
+    assert _request("GET", user_id=1)["read"] is None
+
+
+def test_writer_reads_are_pinned_to_primary(routing):
+    _request("PUT", user_id=7)
+
+    assert _request("GET", user_id=7)["read"] == DEFAULT_DB_ALIAS
+    assert _request("GET", user_id=8)["read"] == "reader"
+
+
+@pytest.mark.parametrize("status", [400, 403, 404])
+def test_failed_writes_do_not_pin(routing, status):
+    _request("PUT", user_id=7, status=status)
+    assert _request("GET", user_id=7)["read"] == "reader"
+
+
+def test_pin_expires(routing):
+    routing.ACCOUNT_READ_PIN_SECONDS = 0
+    _request("PUT", user_id=7)
+    assert _request("GET", user_id=7)["read"] == "reader"
+
+
+def test_pin_cache_must_be_shared_between_workers(routing, tmp_path):
+    routing.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "pins": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": str(tmp_path)},
+    }
+    assert [warning.id for warning in db_routing.check_pin_cache()] == ["accountService.W001"]
+    routing.ACCOUNT_READ_PIN_CACHE = "pins"
+    assert db_routing.check_pin_cache() == []
+
+
+def test_reader_is_never_migrated(routing):
+    assert ReadRouter().allow_migrate("reader", "base") is False
+    assert ReadRouter().allow_migrate("default", "base") is None
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", [
+    "/api/account/count/",
+    "/api/account/count_by_role/STUDENT/",
+    "/api/async/account/count/",
+    "/api/async/account/count_by_role/STUDENT/",
+])
+def test_count_endpoints_read_from_the_reader(url, routing, api_client, admin_headers, monkeypatch):
+    routing.MIDDLEWARE = [*routing.MIDDLEWARE, "accountService.db_routing.ReadRoutingMiddleware"]
+    routing.DATABASE_ROUTERS = [*routing.DATABASE_ROUTERS, "accountService.db_routing.ReadRouter"]
+    seen = []
+    count_queryset = counters._count_queryset
+
+    def spy(role, is_active, using):
+        # There is no reader connection under test; record it, read default.
+        seen.append(using)
+        return count_queryset(role, is_active, DEFAULT_DB_ALIAS)
+
+    monkeypatch.setattr(counters, "_count_queryset", spy)
+    assert api_client.get(url, **admin_headers).status_code == 200
+    assert seen == ["reader"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", ["/api/account/get/a@example.com/", "/api/async/account/get/a@example.com/"])
+def test_writer_does_not_read_a_stale_cached_row(url, routing, api_client, make_auth_headers, monkeypatch):
+    routing.MIDDLEWARE = [*routing.MIDDLEWARE, "accountService.db_routing.ReadRoutingMiddleware"]
+    routing.DATABASE_ROUTERS = [*routing.DATABASE_ROUTERS, "accountService.db_routing.ReadRouter"]
+    Account.objects.create(email="a@example.com", fullname="Old", role="STUDENT", creator_id=5)
+    # The reader lags behind the primary: it still has the row as it was.
+    stale, load, aload = views._load_account("a@example.com"), views._load_account, async_views._load_account
+
+    def lagging():
+        return ReadRouter().db_for_read(Account) == "reader"
+
+    async def alagging_load(email):
+        return stale if lagging() else await aload(email)
+
+    monkeypatch.setattr(views, "_load_account", lambda email: stale if lagging() else load(email))
+    monkeypatch.setattr(async_views, "_load_account", alagging_load)
+    writer, other = make_auth_headers(user_id=5), make_auth_headers(user_id=7)
+
+    body = {"email": "a@example.com", "fullname": "New"}
+    assert api_client.put("/api/account/update/", body, format="json", **writer).status_code == 200
+    assert api_client.get(url, **other).json()["fullname"] == "Old"
+    assert api_client.get(url, **writer).json()["fullname"] == "New"
+
+
+def test_sync_replica_copies_the_primary(tmp_path, django_db_blocker, monkeypatch):
+    handler = ConnectionHandler({
+        "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": str(tmp_path / "primary.sqlite3")},
+        "replica": {"ENGINE": "django.db.backends.sqlite3", "NAME": str(tmp_path / "replica.sqlite3")},
+    })
+    monkeypatch.setattr(db_routing, "connections", handler)
+    with django_db_blocker.unblock():
+        with handler["default"].cursor() as cursor:
+            cursor.execute("CREATE TABLE t (x integer)")
+            cursor.execute("INSERT INTO t VALUES (42)")
+
+        db_routing.sync_replica("default", "replica")
+
+        with handler["replica"].cursor() as cursor:
+            cursor.execute("SELECT x FROM t")
+            assert cursor.fetchall() == [(42,)]
+        handler.close_all()
+
+
+@pytest.fixture
+def production_connections(tmp_path, django_db_blocker):
+    # Standalone connections to a scratch file, outside the test database.
+    databases = {
+        alias: {**config, "NAME": str(tmp_path / "prod.sqlite3")}
+        for alias, config in settings_production.DATABASES.items()
+    }
+    handler = ConnectionHandler(databases)
+    with django_db_blocker.unblock():
+        yield handler
+        handler.close_all()
+
+
+def _pragma(connection, name):
+    with connection.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+def test_production_connections_apply_pragmas(production_connections):
+    default = production_connections["default"]
+    assert _pragma(default, "journal_mode") == "wal"
+    assert _pragma(default, "synchronous") == 1  # NORMAL
+    assert _pragma(default, "busy_timeout") == settings_production.SQLITE_BUSY_TIMEOUT * 1000
+    assert default.transaction_mode == "IMMEDIATE"
+
+
+def test_production_reader_is_query_only(production_connections):
+    with production_connections["default"].cursor() as cursor:
+        cursor.execute("CREATE TABLE t (x integer)")
+
+    reader = production_connections["reader"]
+    assert _pragma(reader, "query_only") == 1
+    with pytest.raises(OperationalError, match="readonly"):
+        with reader.cursor() as cursor:
+            cursor.execute("INSERT INTO t VALUES (1)")
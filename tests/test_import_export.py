@@ -0,0 +1,110 @@
+import gzip
+import json
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from base.counters import counter_drift
+from base.models import Account
+
+
+@pytest.mark.django_db
+def test_import_csv_upserts_on_email(tmp_path, capsys):
+    Account.objects.create(email="old@example.com", fullname="Old Name", role="STUDENT", creator_id=1)
+    source = tmp_path / "accounts.csv"
+    source.write_text(
+        "email,fullname,role,is_active,creator_id\n"
+        "old@example.com,New Name,STAFF,false,7\n"
+        "fresh@example.com,Fresh,,,\n"
+        "broken,Nobody,STUDENT,true,\n"
+    )
+
+    call_command("import_accounts", str(source), "--chunk-size", "2")
+
+    captured = capsys.readouterr()
+    assert "Imported 2 accounts (1 invalid rows skipped)" in captured.out
+    assert "invalid email 'broken'" in captured.err
+    old = Account.objects.get(email="old@example.com")
+    assert (old.fullname, old.role, old.is_active, old.creator_id) == ("New Name", "STAFF", False, 7)
+    assert Account.objects.get(email="fresh@example.com").role == "STUDENT"
+    assert counter_drift() == {}
+    assert not (tmp_path / "accounts.csv.checkpoint").exists()
+
+
+@pytest.mark.django_db
+def test_import_without_creator_id_keeps_existing_owner(tmp_path):
+    Account.objects.create(email="owned@example.com", fullname="Owned", role="STUDENT", creator_id=5)
+    source = tmp_path / "registrar.csv"
+    source.write_text(
+        "email,fullname,role\n"
+        "owned@example.com,Owned Renamed,STAFF\n"
+        "new@example.com,New,STUDENT\n"
+    )
+
+    call_command("import_accounts", str(source))
+
+    owned = Account.objects.get(email="owned@example.com")
+    assert (owned.fullname, owned.role, owned.creator_id) == ("Owned Renamed", "STAFF", 5)
+    assert Account.objects.get(email="new@example.com").creator_id is None
+
+
+@pytest.mark.django_db
+def test_import_gzipped_ndjson_resumes_from_checkpoint(tmp_path):
+    source = tmp_path / "accounts.ndjson.gz"
+    with gzip.open(source, "wt") as handle:
+        for i in range(5):
+            handle.write(json.dumps({"email": f"u{i}@example.com", "fullname": f"User {i}"}) + "\n")
+    checkpoint = tmp_path / "accounts.ndjson.gz.checkpoint"
+    checkpoint.write_text(json.dumps({"source": {"path": str(source), "size": source.stat().st_size}, "rows": 3}))
+
+    call_command("import_accounts", str(source), "--resume", "--chunk-size", "10")
+
+    assert sorted(Account.objects.values_list("email", flat=True)) == ["u3@example.com", "u4@example.com"]
+
+
+@pytest.mark.django_db
+def test_import_rejects_checkpoint_for_other_file(tmp_path):
+    source = tmp_path / "accounts.ndjson"
+    source.write_text(json.dumps({"email": "a@example.com", "fullname": "A"}) + "\n")
+    (tmp_path / "accounts.ndjson.checkpoint").write_text(json.dumps({"source": {"path": "elsewhere", "size": 1}, "rows": 1}))
+
+    with pytest.raises(CommandError):
+        call_command("import_accounts", str(source), "--resume")
+
+
+@pytest.mark.django_db
+def test_export_ndjson_pages_through_table(tmp_path):
+    for i in range(5):
+        Account.objects.create(email=f"e{i}@example.com", fullname=f"E {i}", role="STAFF" if i % 2 else "STUDENT", creator_id=i)
+    target = tmp_path / "accounts.ndjson.gz"
+
+    call_command("export_accounts", str(target), "--chunk-size", "2")
+
+    with gzip.open(target, "rt") as handle:
+        rows = [json.loads(line) for line in handle]
+    assert [row["email"] for row in rows] == [f"e{i}@example.com" for i in range(5)]
+
+
+@pytest.mark.django_db
+def test_export_csv_applies_filters_and_round_trips(tmp_path):
+    Account.objects.create(email="keep@example.com", fullname="Keep, Me", role="STAFF", creator_id=1, is_active=False)
+    Account.objects.create(email="skip@example.com", fullname="Skip", role="STUDENT", creator_id=2)
+    target = tmp_path / "staff.csv"
+
+    call_command("export_accounts", str(target), "--format", "csv", "--role", "STAFF", "--active", "false")
+
+    lines = target.read_text().splitlines()
+    assert lines[0].startswith("accountID,creator_id,email,fullname")
+    assert len(lines) == 2 and "keep@example.com" in lines[1]
+
+    Account.objects.all().delete()
+    call_command("import_accounts", str(target))
+    account = Account.objects.get()
+    assert (account.email, account.fullname, account.is_active) == ("keep@example.com", "Keep, Me", False)
+
+
+@pytest.mark.django_db
+def test_export_rejects_bad_dates(tmp_path):
+    with pytest.raises(CommandError):
+        call_command("export_accounts", str(tmp_path / "x.ndjson"), "--created-after", "yesterday")
@@ -0,0 +1,47 @@
+import pytest
+from django.test import Client
+
+from accountService.metrics import registry
+from base.models import Account
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    registry.reset()
+    yield
+    registry.reset()
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_reports_routes_and_phases(api_client, admin_headers):
+    Account.objects.create(email="m@example.com", fullname="M", role="STUDENT", creator_id=1)
+    api_client.get("/api/account/", **admin_headers)
+    api_client.get("/api/account/get/missing@example.com/", **admin_headers)
+
+    response = Client().get("/api/metrics/")
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain")
+    body = response.content.decode()
+
+    assert 'account_http_requests_total{route="api/account/",method="GET",status="200"} 1' in body
+    assert 'account_http_requests_total{route="api/account/get/<str:email>/",method="GET",status="404"} 1' in body
+    assert 'account_http_request_duration_seconds_count{route="api/account/",method="GET"} 1' in body
+    for phase in ("auth", "db", "serialize"):
+        assert f'account_request_phase_seconds_count{{route="api/account/",phase="{phase}"}} 1' in body
+    assert "account_token_cache_hits_total" in body
+
+
+def test_registry_aggregates_across_threads():
+    import threading
+
+    def work():
+        for _ in range(100):
+            registry.inc("account_http_requests_total", (("route", "x"),))
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert 'account_http_requests_total{route="x"} 400' in registry.render()
@@ -0,0 +1,118 @@
+"""
+EXPLAIN QUERY PLAN checks for the filter/list endpoints.
+
+Each test drives a view, captures the SELECTs it sends to ``base_account``
+and fails if SQLite would answer any of them with a full table scan or by
+sorting the whole result in a temporary B-tree.
+"""
+import pytest
+from django.db import connection
+
+from base.models import Account
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(connection.vendor != "sqlite", reason="plans are checked against SQLite"),
+]
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+
+def account_query_plans(client, url, headers, table="base_account"):
+    recorder = QueryRecorder()
+    with connection.execute_wrapper(recorder):
+        response = client.get(url, **headers)
+    assert response.status_code == 200, response.content
+
+    plans = []
+    with connection.cursor() as cursor:
+        for sql, params in recorder.queries:
+            if not sql.lstrip().upper().startswith("SELECT") or f'"{table}"' not in sql:
+                continue
+            cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+            plans.append((sql, [row[-1] for row in cursor.fetchall()]))
+    assert plans, f"no account query captured for {url}"
+    return response, plans
+
+
+def assert_indexed(plans, require_search=True):
+    for sql, details in plans:
+        for detail in details:
+            assert detail != "SCAN base_account", f"full table scan:\n{sql}\n{details}"
+            assert "TEMP B-TREE" not in detail, f"sort without index:\n{sql}\n{details}"
+        if require_search:
+            assert any(detail.startswith("SEARCH base_account") for detail in details), f"no index search:\n{sql}\n{details}"
+
+
+@pytest.fixture
+def accounts():
+    for i in range(6):
+        Account.objects.create(
+            email=f"plan{i}@example.com",
+            fullname=f"Plan {i}",
+            role="ADMIN" if i % 3 == 0 else "STUDENT",
+            creator_id=i,
+            is_active=i % 2 == 0,
+        )
+
+
+def _next_url(response):
+    link = response.headers["Link"]
+    return link.split(";")[0].strip()[1:-1]
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/api/account/role/STUDENT/",
+        "/api/account/role/student/",
+        "/api/account/active/",
+        "/api/account/inactive/",
+        "/api/account/created_after/2000-01-01T00:00:00Z/",
+        "/api/account/updated_before/2999-01-01T00:00:00Z/",
+        "/api/account/get/plan1@example.com/",
+        "/api/account/list/?role=STUDENT&active=true&created_after=2000-01-01T00:00:00Z",
+        "/api/account/list/?active=false&updated_before=2999-01-01T00:00:00Z",
+    ],
+)
+def test_filter_endpoints_use_an_index(api_client, admin_headers, accounts, url):
+    _, plans = account_query_plans(api_client, url, admin_headers)
+    assert_indexed(plans)
+
+
+@pytest.mark.parametrize(
+    "url, filtered",
+    [
+        ("/api/account/?page_size=2", False),
+        ("/api/account/role/STUDENT/?page_size=1", True),
+        ("/api/account/active/?page_size=1", True),
+        ("/api/account/updated_before/2999-01-01T00:00:00Z/?page_size=1", True),
+        ("/api/account/list/?role=STUDENT&active=true&fields=email&page_size=1", True),
+    ],
+)
+def test_keyset_pages_use_an_index(api_client, admin_headers, accounts, url, filtered):
+    first, plans = account_query_plans(api_client, url, admin_headers)
+    # The first unfiltered page walks the ordering index and stops at LIMIT.
+    assert_indexed(plans, require_search=filtered)
+
+    _, plans = account_query_plans(api_client, _next_url(first), admin_headers)
+    assert_indexed(plans)
+
+
+def test_count_by_role_reads_counter_rows(api_client, admin_headers, accounts):
+    recorder = QueryRecorder()
+    with connection.execute_wrapper(recorder):
+        response = api_client.get("/api/account/count_by_role/STUDENT/", **admin_headers)
+    assert response.json()["count"] == 4
+    assert not any('"base_account"' in sql for sql, _ in recorder.queries)
+
+    _, plans = account_query_plans(api_client, "/api/account/count_by_role/STUDENT/", admin_headers, table="base_accountcounter")
+    for sql, details in plans:
+        assert any(detail.startswith("SEARCH base_accountcounter") for detail in details), details
@@ -0,0 +1,98 @@
+import importlib
+from types import SimpleNamespace
+
+import pytest
+from django.apps import apps
+from django.db import connection
+
+from api.permissions import token_role
+from base.counters import count_accounts, counter_drift
+from base.models import Account, AccountCounter, Role
+
+pytestmark = pytest.mark.django_db
+
+
+def test_role_is_stored_canonically_on_every_write():
+    account = Account.objects.create(email="a@example.com", fullname="A", role=" student", creator_id=1)
+    assert account.role == Role.STUDENT
+    Account.objects.bulk_create([Account(email="b@example.com", fullname="B", role="Staff", creator_id=1)])
+    Account.objects.filter(email="a@example.com").update(role="admin")
+
+    assert sorted(Account.objects.values_list("role", flat=True)) == ["ADMIN", "STAFF"]
+    assert counter_drift() == {}
+
+
+def test_role_lookups_are_exact_matches_in_any_case():
+    Account.objects.create(email="a@example.com", fullname="A", role="STUDENT", creator_id=1)
+
+    assert Account.objects.filter(role="student").count() == 1
+    assert Account.objects.filter(role__in=["Student", "admin"]).count() == 1
+    assert count_accounts(role="sTuDeNt") == 1
+    query = str(Account.objects.filter(role="student").query)
+    assert "role\" = STUDENT" in query and "UPPER" not in query
+
+
+def test_role_endpoints_ignore_case(api_client, admin_headers):
+    Account.objects.create(email="a@example.com", fullname="A", role="STUDENT", creator_id=1)
+
+    assert len(api_client.get("/api/account/role/student/", **admin_headers).json()) == 1
+    assert api_client.get("/api/account/list/?role=Student", **admin_headers).json()[0]["role"] == "STUDENT"
+    assert api_client.get("/api/account/count_by_role/student/", **admin_headers).json() == {"role": "STUDENT", "count": 1}
+    response = api_client.get("/api/async/account/count_by_role/student/", **admin_headers)
+    assert response.json() == {"role": "STUDENT", "count": 1}
+
+
+def test_api_writes_normalize_and_validate_roles(api_client, admin_headers, make_auth_headers):
+    # The role of a created account comes from the token.
+    headers = make_auth_headers(role="student", user_id=5, email="new@example.com")
+    response = api_client.post("/api/account/create/", {"email": "new@example.com", "fullname": "New"}, format="json", **headers)
+    assert response.status_code == 201
+    assert response.json()["role"] == "STUDENT"
+
+    response = api_client.put("/api/account/update/", {"email": "new@example.com", "role": "staff"}, format="json", **admin_headers)
+    assert response.status_code == 200
+    assert response.json()["role"] == "STAFF"
+
+    response = api_client.put("/api/account/update/", {"email": "new@example.com", "role": "teacher"}, format="json", **admin_headers)
+    assert response.status_code == 400
+    assert "role" in response.json()
+
+
+@pytest.mark.parametrize("url", ["/api/account/create/", "/api/async/account/create/"])
+def test_create_stores_only_known_token_roles(url, api_client, make_auth_headers):
+    headers = make_auth_headers(role="TEACHER", user_id=5, email="t@example.com")
+    response = api_client.post(url, {"email": "t@example.com", "fullname": "T"}, format="json", **headers)
+    assert response.status_code == 403
+    assert not Account.objects.exists()
+
+    headers = make_auth_headers(role=" staff ", user_id=5, email="s@example.com")
+    response = api_client.post(url, {"email": "s@example.com", "fullname": "S"}, format="json", **headers)
+    assert response.status_code == 201
+    assert Account.objects.get(email="s@example.com").role == Role.STAFF
+
+
+def test_token_role_uses_the_role_choices():
+    def request(role):
+        return SimpleNamespace(user=SimpleNamespace(role=role))
+
+    assert token_role(request("Admin ")) == Role.ADMIN
+    assert token_role(request("TEACHER")) is None
+    assert token_role(request(None)) is None
+
+
+def test_backfill_migration_normalizes_existing_rows():
+    with connection.cursor() as cursor:
+        for i, role in enumerate(["admin", "student", "Student ", "STAFF"]):
+            cursor.execute(
+                "INSERT INTO base_account (creator_id, email, fullname, role, is_active, created_at, updated_at) "
+                "VALUES (1, %s, 'Legacy', %s, 1, '2020-01-01 00:00:00', '2020-01-01 00:00:00')",
+                [f"legacy{i}@example.com", role],
+            )
+    migration = importlib.import_module("base.migrations.0014_normalize_account_roles")
+
+    migration.normalize_roles(apps, SimpleNamespace(connection=connection))
+
+    assert sorted(Account.objects.values_list("role", flat=True)) == ["ADMIN", "STAFF", "STUDENT", "STUDENT"]
+    assert Account.objects.get(email="legacy3@example.com").updated_at.year == 2020
+    assert sorted(AccountCounter.objects.values_list("role", "count")) == [("ADMIN", 1), ("STAFF", 1), ("STUDENT", 2)]
+    assert counter_drift() == {}
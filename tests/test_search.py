@@ -0,0 +1,72 @@
+import pytest
+
+from api.serializers import AccountSerializer
+from base import search
+from base.models import Account
+
+pytestmark = pytest.mark.django_db
+
+URL = "/api/account/search/"
+
+
+def _create(email, fullname):
+    return Account.objects.create(email=email, fullname=fullname, role="STUDENT", creator_id=1)
+
+
+def _emails(response):
+    assert response.status_code == 200, response.content
+    return [row["email"] for row in response.json()]
+
+
+@pytest.fixture
+def people():
+    return [
+        _create("ada@example.com", "Ada Lovelace"),
+        _create("grace@navy.mil", "Grace Hopper"),
+        _create("alan@example.com", "Alan Turing"),
+        _create("lovelace.fan@example.com", "Someone Else"),
+    ]
+
+
+def test_search_matches_substrings_of_name_and_email(api_client, admin_headers, people):
+    assert set(_emails(api_client.get(URL, {"q": "LOVEL"}, **admin_headers))) == {"ada@example.com", "lovelace.fan@example.com"}
+    assert _emails(api_client.get(URL, {"q": "navy"}, **admin_headers)) == ["grace@navy.mil"]
+    assert _emails(api_client.get(URL, {"q": "ring"}, **admin_headers)) == ["alan@example.com"]
+
+
+def test_search_requires_every_word_and_returns_full_rows(api_client, admin_headers, people):
+    response = api_client.get(URL, {"q": "ada lovelace"}, **admin_headers)
+    assert response.json() == [AccountSerializer(people[0]).data]
+
+
+def test_search_ranks_and_limits(api_client, admin_headers):
+    for i in range(5):
+        _create(f"filler{i}@example.com", f"Filler {i} with a much longer name that mentions turing once")
+    _create("turing@example.com", "Turing")
+
+    emails = _emails(api_client.get(URL, {"q": "turing", "limit": 3}, **admin_headers))
+    assert len(emails) == 3
+    assert emails[0] == "turing@example.com"
+
+
+def test_index_follows_writes(api_client, admin_headers, people):
+    Account.objects.filter(email="alan@example.com").update(fullname="Alonzo Church")
+    assert _emails(api_client.get(URL, {"q": "turing"}, **admin_headers)) == []
+    assert _emails(api_client.get(URL, {"q": "church"}, **admin_headers)) == ["alan@example.com"]
+
+    Account.objects.filter(email="ada@example.com").delete()
+    assert _emails(api_client.get(URL, {"q": "lovelace"}, **admin_headers)) == ["lovelace.fan@example.com"]
+
+
+def test_icontains_fallback_for_other_backends(api_client, admin_headers, people, monkeypatch):
+    monkeypatch.setattr(search, "_SEARCHES", {})
+    assert _emails(api_client.get(URL, {"q": "hopper"}, **admin_headers)) == ["grace@navy.mil"]
+
+
+@pytest.mark.parametrize("params", [{}, {"q": "ab"}, {"q": "ada", "limit": "0"}, {"q": "ada", "limit": "x"}])
+def test_search_rejects_unusable_queries(api_client, admin_headers, params):
+    assert api_client.get(URL, params, **admin_headers).status_code == 400
+
+
+def test_search_is_admin_only(api_client, student_headers):
+    assert api_client.get(URL, {"q": "ada"}, **student_headers).status_code == 403
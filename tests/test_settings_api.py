@@ -0,0 +1,46 @@
+import pytest
+
+from accountService import settings_api, settings_production
+from base.models import Account
+
+
+@pytest.fixture
+def api_profile(settings):
+    # The request-path settings of the API-only profile, on the test database.
+    settings.MIDDLEWARE = settings_api.MIDDLEWARE
+    settings.ROOT_URLCONF = settings_api.ROOT_URLCONF
+    settings.REST_FRAMEWORK = settings_api.REST_FRAMEWORK
+    return settings
+
+
+def test_api_profile_drops_site_apps_and_middleware():
+    assert "django.contrib.admin" not in settings_api.INSTALLED_APPS
+    assert "django.contrib.sessions" not in settings_api.INSTALLED_APPS
+    assert not any("csrf" in name or "sessions" in name or "messages" in name for name in settings_api.MIDDLEWARE)
+    # Everything else the production profile adds is kept, in order.
+    assert settings_api.MIDDLEWARE == [name for name in settings_production.MIDDLEWARE if name in settings_api.MIDDLEWARE]
+    assert "accountService.db_routing.ReadRoutingMiddleware" in settings_api.MIDDLEWARE
+
+
+@pytest.mark.django_db
+def test_api_profile_serves_authenticated_requests(api_profile, api_client, admin_headers, make_auth_headers):
+    Account.objects.create(creator_id=1, email="lean@example.com", fullname="Lean", role="STUDENT")
+
+    response = api_client.get("/api/account/get/lean@example.com/", **admin_headers)
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/json"
+    assert response.json()["fullname"] == "Lean"
+
+    # Writes work without CSRF or session middleware.
+    response = api_client.post(
+        "/api/account/create/", {"email": "writer@example.com", "fullname": "Writer"}, format="json",
+        **make_auth_headers(role="STUDENT", user_id=5, email="writer@example.com"),
+    )
+    assert response.status_code == 201
+
+
+@pytest.mark.django_db
+def test_api_profile_rejects_anonymous_requests(api_profile, api_client):
+    # request.user is None rather than AnonymousUser; permissions still deny.
+    assert api_client.get("/api/account/").status_code in (401, 403)
+    assert api_client.get("/admin/").status_code == 404
@@ -0,0 +1,206 @@
+import asyncio
+import json
+import shutil
+
+import pytest
+from django.core.management import call_command
+from django.db import connections
+from django.test import AsyncClient
+
+from base import sharding
+from base.models import Account
+from base.sharding import SHARD_ID_SPAN, shard_for_email, use_shard
+
+ALIASES = ["shard0", "shard1", "shard2"]
+
+
+def _add_alias(alias, path):
+    config = {"ENGINE": "django.db.backends.sqlite3", "NAME": str(path)}
+    connections.settings[alias] = connections.configure_settings({"default": {}, alias: config})[alias]
+
+
+def _remove_alias(alias):
+    connections[alias].close()
+    del connections[alias]
+    del connections.settings[alias]
+
+
+@pytest.fixture(scope="session")
+def shard_template(tmp_path_factory, django_db_setup, django_db_blocker):
+    # Migrate once; every test copies the file per shard.
+    path = tmp_path_factory.mktemp("shards") / "template.sqlite3"
+    with django_db_blocker.unblock():
+        _add_alias("shard_template", path)
+        try:
+            call_command("migrate", database="shard_template", verbosity=0)
+        finally:
+            _remove_alias("shard_template")
+    return path
+
+
+@pytest.fixture
+def shards(shard_template, tmp_path, settings, django_db_blocker):
+    # Scratch files outside the test database, each test starting empty.
+    for alias in ALIASES:
+        shutil.copy(shard_template, tmp_path / f"{alias}.sqlite3")
+        _add_alias(alias, tmp_path / f"{alias}.sqlite3")
+    settings.ACCOUNT_SHARDS = ALIASES
+    with django_db_blocker.unblock():
+        for alias in ALIASES:
+            sharding.reserve_id_range(alias)
+        yield ALIASES
+        settings.ACCOUNT_SHARDS = []
+        for alias in ALIASES:
+            _remove_alias(alias)
+
+
+def _emails(count):
+    return [f"user{i}@example.com" for i in range(count)]
+
+
+def _create(email, role="STUDENT", **fields):
+    with use_shard(shard_for_email(email)):
+        return Account.objects.create(email=email, fullname=email, role=role, creator_id=1, **fields)
+
+
+def _stored(alias):
+    return set(Account.objects.using(alias).values_list("email", flat=True))
+
+
+def test_placement_is_stable_and_spread(settings):
+    settings.ACCOUNT_SHARDS = ALIASES
+    placement = {email: shard_for_email(email) for email in _emails(300)}
+
+    assert placement == {email: shard_for_email(email) for email in _emails(300)}
+    counts = [list(placement.values()).count(alias) for alias in ALIASES]
+    assert min(counts) > 60
+
+    settings.ACCOUNT_SHARDS = []
+    assert shard_for_email("user0@example.com") is None
+
+
+def test_single_key_views_touch_only_the_owning_shard(shards, api_client, make_auth_headers, admin_headers):
+    email = "owner@example.com"
+    home = shard_for_email(email)
+    owner = make_auth_headers(user_id=5, email=email)
+
+    created = api_client.post("/api/account/create/", {"email": email, "fullname": "Owner"}, format="json", **owner)
+    assert created.status_code == 201, created.content
+    assert {alias: _stored(alias) for alias in shards} == {alias: {email} if alias == home else set() for alias in shards}
+    assert created.json()["accountID"] > ALIASES.index(home) * SHARD_ID_SPAN
+
+    updated = api_client.put("/api/account/update/", {"email": email, "fullname": "Renamed"}, format="json", **owner)
+    assert updated.status_code == 200
+    deactivated = api_client.put("/api/account/deactivate/", {"email": email}, format="json", **admin_headers)
+    assert deactivated.json()["is_active"] is False
+    fetched = api_client.get(f"/api/account/get/{email}/", **owner).json()
+    assert (fetched["fullname"], fetched["is_active"]) == ("Renamed", False)
+
+    assert api_client.delete("/api/account/delete/", {"email": email}, format="json", **owner).status_code == 200
+    assert not any(_stored(alias) for alias in shards)
+
+
+def test_account_ids_are_unique_across_shards(shards):
+    accounts = [_create(email) for email in _emails(12)]
+    assert len({account.accountID for account in accounts}) == 12
+    for account in accounts:
+        index = ALIASES.index(shard_for_email(account.email))
+        assert index * SHARD_ID_SPAN < account.accountID < (index + 1) * SHARD_ID_SPAN
+
+
+def test_new_accounts_saved_outside_use_shard_land_on_their_shard(shards):
+    Account(email="stray@example.com", fullname="Stray", role="STUDENT").save()
+    assert _stored(shard_for_email("stray@example.com")) == {"stray@example.com"}
+
+
+def test_lists_merge_shards_in_keyset_order(shards, api_client, admin_headers):
+    for email in _emails(8):
+        _create(email)
+    expected = sorted(
+        (account for alias in shards for account in Account.objects.using(alias).all()),
+        key=lambda account: (account.created_at, account.accountID),
+    )
+
+    seen, url = [], "/api/account/?page_size=3"
+    while url:
+        response = api_client.get(url, **admin_headers)
+        assert response.status_code == 200
+        seen += [row["email"] for row in response.json()]
+        link = response.get("Link", "")
+        url = link.split(";")[0].strip("<>") if 'rel="next"' in link else None
+    assert seen == [account.email for account in expected]
+
+    first = api_client.get("/api/account/?page_size=3", **admin_headers)
+    second = api_client.get(first["Link"].split(";")[0].strip("<>"), **admin_headers)
+    previous = [part for part in second["Link"].split(", ") if 'rel="prev"' in part][0]
+    assert api_client.get(previous.split(";")[0].strip("<>"), **admin_headers).json() == first.json()
+
+
+def test_counts_and_list_etags_span_shards(shards, api_client, admin_headers):
+    for i, email in enumerate(_emails(7)):
+        _create(email, role="STAFF" if i % 2 else "STUDENT")
+
+    assert api_client.get("/api/account/count/", **admin_headers).json() == {"count": 7}
+    assert api_client.get("/api/account/count_by_role/STAFF/", **admin_headers).json() == {"role": "STAFF", "count": 3}
+
+    etag = api_client.get("/api/account/", **admin_headers)["ETag"]
+    assert api_client.get("/api/account/", HTTP_IF_NONE_MATCH=etag, **admin_headers).status_code == 304
+    _create("late@example.com")
+    assert api_client.get("/api/account/", HTTP_IF_NONE_MATCH=etag, **admin_headers).status_code == 200
+
+
+@pytest.mark.parametrize("method, url, body", [
+    ("post", "/api/account/batch/create/", [{"email": "a@example.com"}]),
+    ("delete", "/api/account/batch/delete/", ["a@example.com"]),
+    ("get", "/api/account/changes/", None),
+])
+def test_cross_shard_writes_and_change_feed_are_unavailable(shards, api_client, admin_headers, method, url, body):
+    response = getattr(api_client, method)(url, body, format="json", **admin_headers)
+    assert response.status_code == 501
+
+
+def test_async_views_fan_out(shards, admin_headers):
+    for email in _emails(5):
+        _create(email)
+
+    async def fetch():
+        client = AsyncClient()
+        headers = {"headers": {"Authorization": admin_headers["HTTP_AUTHORIZATION"]}}
+        return (
+            await client.get("/api/async/account/?page_size=10", **headers),
+            await client.get("/api/async/account/count/", **headers),
+            await client.get("/api/async/account/get/user3@example.com/", **headers),
+        )
+
+    listing, count, single = asyncio.run(fetch())
+    assert sorted(row["email"] for row in listing.json()) == _emails(5)
+    assert count.json() == {"count": 5}
+    assert single.json()["email"] == "user3@example.com"
+
+
+def test_import_and_export_follow_placement(shards, tmp_path):
+    source = tmp_path / "accounts.ndjson"
+    source.write_text("".join(json.dumps({"email": email, "fullname": email}) + "\n" for email in _emails(9)))
+
+    call_command("import_accounts", str(source), "--chunk-size", "4")
+    for alias in shards:
+        assert _stored(alias) == {email for email in _emails(9) if shard_for_email(email) == alias}
+
+    target = tmp_path / "export.ndjson"
+    call_command("export_accounts", str(target))
+    assert sorted(json.loads(line)["email"] for line in target.read_text().splitlines()) == _emails(9)
+
+
+def test_search_merges_shards(shards, api_client, admin_headers):
+    for email in _emails(9):
+        _create(email)
+    response = api_client.get("/api/account/search/", {"q": "user", "limit": 100}, **admin_headers)
+    assert sorted(row["email"] for row in response.json()) == _emails(9)
+
+
+def test_stats_sum_shards(shards, api_client, admin_headers, settings):
+    settings.ACCOUNT_STATS_CACHE_TTL = 0
+    for i, email in enumerate(_emails(6)):
+        _create(email, is_active=i % 3 != 0)
+    stats = api_client.get("/api/account/stats/", **admin_headers).json()
+    assert (stats["total"], stats["by_role"]) == (6, {"STUDENT": {"active": 4, "inactive": 2}})
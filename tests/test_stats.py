@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from base.models import Account
+
+pytestmark = pytest.mark.django_db
+
+URL = "/api/account/stats/"
+
+
+@pytest.fixture(autouse=True)
+def no_stats_cache(settings):
+    settings.ACCOUNT_STATS_CACHE_TTL = 0
+
+
+@pytest.fixture
+def accounts():
+    created = [
+        ("a@example.com", "STUDENT", True, datetime(2026, 3, 2, 23, 59, tzinfo=timezone.utc)),  # Monday
+        ("b@example.com", "STUDENT", False, datetime(2026, 3, 8, 12, 0, tzinfo=timezone.utc)),  # Sunday
+        ("c@example.com", "STAFF", True, datetime(2026, 3, 9, 0, 0, tzinfo=timezone.utc)),
+        ("d@example.com", "ADMIN", True, datetime(2026, 4, 1, 8, 30, tzinfo=timezone.utc)),
+    ]
+    for email, role, is_active, created_at in created:
+        account = Account.objects.create(email=email, fullname=email, role=role, is_active=is_active, creator_id=1)
+        Account.objects.filter(pk=account.pk).update(created_at=created_at)
+
+
+def test_stats_come_from_one_grouped_query(api_client, admin_headers, accounts, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        response = api_client.get(URL, **admin_headers)
+
+    assert response.json() == {
+        "total": 4,
+        "active": 3,
+        "inactive": 1,
+        "by_role": {
+            "ADMIN": {"active": 1, "inactive": 0},
+            "STAFF": {"active": 1, "inactive": 0},
+            "STUDENT": {"active": 1, "inactive": 1},
+        },
+        "bucket": "month",
+        "created": [{"start": "2026-03-01", "count": 3}, {"start": "2026-04-01", "count": 1}],
+    }
+
+
+@pytest.mark.parametrize("bucket, expected", [
+    ("day", [("2026-03-02", 1), ("2026-03-08", 1), ("2026-03-09", 1), ("2026-04-01", 1)]),
+    ("week", [("2026-03-02", 2), ("2026-03-09", 1), ("2026-03-30", 1)]),
+])
+def test_stats_histogram_buckets(api_client, admin_headers, accounts, bucket, expected):
+    created = api_client.get(URL, {"bucket": bucket}, **admin_headers).json()["created"]
+    assert [(row["start"], row["count"]) for row in created] == expected
+
+
+def test_stats_take_list_filters(api_client, admin_headers, accounts):
+    stats = api_client.get(URL, {"role": "STUDENT", "created_before": "2026-03-05T00:00:00Z"}, **admin_headers).json()
+    assert (stats["total"], stats["by_role"]) == (1, {"STUDENT": {"active": 1, "inactive": 0}})
+
+
+def test_stats_are_cached_for_the_ttl(api_client, admin_headers, accounts, settings, django_assert_num_queries):
+    settings.ACCOUNT_STATS_CACHE_TTL = 60
+    first = api_client.get(URL, **admin_headers).json()
+    Account.objects.create(email="late@example.com", fullname="Late", role="STUDENT", creator_id=1)
+
+    with django_assert_num_queries(0):
+        assert api_client.get(URL, **admin_headers).json() == first
+    assert api_client.get(URL, {"bucket": "day"}, **admin_headers).json()["total"] == 5
+
+
+@pytest.mark.parametrize("params", [{"bucket": "year"}, {"created_after": "last week"}])
+def test_stats_reject_bad_parameters(api_client, admin_headers, params):
+    assert api_client.get(URL, params, **admin_headers).status_code == 400
+
+
+def test_stats_are_admin_only(api_client, student_headers):
+    assert api_client.get(URL, **student_headers).status_code == 403
@@ -0,0 +1,111 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api.serializers import AccountSerializer
+from base import updates
+from base.counters import count_accounts
+from base.models import Account
+
+pytestmark = pytest.mark.django_db
+
+
+def _create(email, **fields):
+    fields.setdefault("role", "STUDENT")
+    return Account.objects.create(email=email, fullname=email, creator_id=1, **fields)
+
+
+@pytest.mark.parametrize("returning", [True, False])
+@pytest.mark.parametrize("path, expected", [("/api/account/activate/", True), ("/api/account/deactivate/", False)])
+def test_status_change_is_one_update(api_client, admin_headers, monkeypatch, returning, path, expected):
+    account = _create("flip@example.com", is_active=not expected)
+    monkeypatch.setattr(updates, "supports_update_returning", lambda connection: returning)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.put(path, {"email": account.email}, format="json", **admin_headers)
+
+    account.refresh_from_db()
+    assert response.status_code == 200
+    assert response.json() == AccountSerializer(account).data
+    assert account.is_active is expected
+    if returning:
+        assert len(queries) == 1
+        assert queries[0]["sql"].startswith("UPDATE")
+        assert "fullname" not in queries[0]["sql"].split(" WHERE ")[0]
+
+
+def test_status_change_keeps_concurrent_edits(api_client, admin_headers):
+    account = _create("race@example.com")
+    before = account.updated_at
+    # Another writer renames the account after this request's view started.
+    Account.objects.filter(pk=account.pk).update(fullname="Renamed elsewhere")
+
+    response = api_client.put("/api/account/deactivate/", {"email": account.email}, format="json", **admin_headers)
+
+    assert response.json()["fullname"] == "Renamed elsewhere"
+    account.refresh_from_db()
+    assert (account.fullname, account.is_active) == ("Renamed elsewhere", False)
+    assert account.updated_at > before
+
+
+def test_status_change_of_unknown_account_is_404(api_client, admin_headers):
+    response = api_client.put("/api/account/activate/", {"email": "ghost@example.com"}, format="json", **admin_headers)
+    assert response.status_code == 404
+
+
+def test_bulk_deactivate_by_role_and_created_range(api_client, admin_headers):
+    old = [_create(f"old{i}@example.com") for i in range(3)]
+    Account.objects.filter(pk__in=[a.pk for a in old]).update(created_at=timezone.now() - timedelta(days=200))
+    _create("new@example.com")
+    _create("staff@example.com", role="STAFF")
+    _create("already@example.com", is_active=False)
+    cutoff = (timezone.now() - timedelta(days=100)).isoformat()
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.put(
+            "/api/account/bulk/deactivate/", {"role": "STUDENT", "created_before": cutoff}, format="json", **admin_headers
+        )
+
+    assert response.json() == {"updated": 3}
+    assert [query["sql"].split()[0] for query in queries] == ["UPDATE"]
+    assert set(Account.objects.filter(is_active=False).values_list("email", flat=True)) == {
+        "old0@example.com", "old1@example.com", "old2@example.com", "already@example.com",
+    }
+    assert count_accounts(role="STUDENT", is_active=False) == 4
+
+
+def test_bulk_activate_by_email_list_skips_unchanged_rows(api_client, admin_headers):
+    _create("a@example.com", is_active=False)
+    _create("b@example.com", is_active=False)
+    active = _create("c@example.com")
+
+    response = api_client.put(
+        "/api/account/bulk/activate/", {"emails": ["a@example.com", "b@example.com", "c@example.com"]}, format="json", **admin_headers
+    )
+
+    assert response.json() == {"updated": 2}
+    assert Account.objects.get(pk=active.pk).updated_at == active.updated_at
+    assert api_client.get("/api/account/get/a@example.com/", **admin_headers).json()["is_active"] is True
+
+
+@pytest.mark.parametrize("body", [
+    {},
+    {"emails": "a@example.com"},
+    {"created_after": "yesterday"},
+    {"created_after": 123},
+    {"created_before": True},
+    {"role": ["STUDENT"]},
+])
+def test_bulk_requires_valid_filters(api_client, admin_headers, body):
+    _create("a@example.com")
+    response = api_client.put("/api/account/bulk/deactivate/", body, format="json", **admin_headers)
+    assert response.status_code == 400
+    assert Account.objects.get(email="a@example.com").is_active is True
+
+
+def test_bulk_is_admin_only(api_client, student_headers):
+    response = api_client.put("/api/account/bulk/deactivate/", {"role": "STUDENT"}, format="json", **student_headers)
+    assert response.status_code == 403